@@ -0,0 +1,129 @@
+# embedding_service.py
+import os
+import time
+import queue
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class EmbeddingService:
+    """
+    Dynamic micro-batching in front of a batched embedding function.
+
+    Callers from any thread submit clips and get futures back. A single
+    worker thread collects queued clips and hands them to embed_fn once
+    max_batch_size clips are waiting or the oldest one has waited
+    max_wait_ms, so concurrent requests can share forward passes. embed_fn
+    must embed each clip as it would alone (as embed_batch does), or
+    results would depend on the rest of the flush; it is called as
+    embed_fn(clips, on_forward=...) and reports the clip count of every
+    forward pass it runs, which is what the batch size stats count.
+    """
+
+    def __init__(self, embed_fn, max_batch_size=16, max_wait_ms=10.0):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self.batch_sizes = Counter()
+        self.queue_waits = deque(maxlen=1000)
+        self.flushes = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.items = 0
+        self.errors = 0
+
+    def _ensure_worker(self):
+        # Started lazily (and again after a fork) so the service is safe to
+        # create at import time in a process that later forks workers
+        if self._worker is not None and self._worker_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._worker is None or self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+                self._worker = threading.Thread(target=self._run, name="hubert-batcher", daemon=True)
+                self._worker_pid = os.getpid()
+                self._worker.start()
+
+    def submit(self, clip) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((clip, future, time.perf_counter()))
+        return future
+
+    def embed(self, clips):
+        """Blocking helper: embeddings for clips, in order"""
+        futures = [self.submit(c) for c in clips]
+        return [f.result() for f in futures]
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = batch[0][2] + self.max_wait
+
+            # Under backlog the deadline has usually passed already; still
+            # take everything that is waiting, up to max_batch_size
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._flush(batch)
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        try:
+            embs = self.embed_fn([clip for clip, _, _ in batch], on_forward=self._record_forward)
+        except Exception as e:
+            with self._stats_lock:
+                self.errors += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), emb in zip(batch, embs):
+            future.set_result(emb)
+
+        with self._stats_lock:
+            self.flushes += 1
+            self.items += len(batch)
+            self.queue_waits.extend(started - enqueued for _, _, enqueued in batch)
+
+    def _record_forward(self, size):
+        with self._stats_lock:
+            self.batches += 1
+            self.batched_items += size
+            self.batch_sizes[size] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            waits = np.array(self.queue_waits) * 1000
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "flushes": self.flushes,
+                "batches": self.batches,
+                "items": self.items,
+                "errors": self.errors,
+                "mean_batch_size": round(self.batched_items / self.batches, 2) if self.batches else 0,
+                "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+                "queue_wait_ms": {
+                    "mean": round(float(waits.mean()), 3) if len(waits) else 0,
+                    "p95": round(float(np.percentile(waits, 95)), 3) if len(waits) else 0,
+                    "max": round(float(waits.max()), 3) if len(waits) else 0
+                }
+            }
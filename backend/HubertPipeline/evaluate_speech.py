@@ -1,37 +1,96 @@
 # evaluate_speech.py
 import os
-from pydub import AudioSegment
+import threading
+import librosa
 from .syllables import WORD_MAP
-from .features_hubert import extract_embedding
+from .features_hubert import SAMPLE_RATE, extract_syllable_embeddings, embed_batch
+from .embedding_service import EmbeddingService
 from .scorer_hubert import score_syllable
-import json
+from template_store import load_templates
 
 # Load templates
 TEMPLATE_PATH = os.path.join(
     os.path.dirname(__file__), 
     "syllable_templates.json"
 )
+STORE_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "syllable_templates"
+)
 
-with open(TEMPLATE_PATH) as f:
-    templates = json.load(f)
+# Memory-mapped binary store (falls back to importing the JSON), opened
+# on first use
+_templates = None
+_templates_lock = threading.Lock()
 
-def evaluate(audio_path, word_id):
-    syllables = WORD_MAP[word_id]["syllables"]
-    audio = AudioSegment.from_wav(audio_path)
+def get_templates():
+    global _templates
+    if _templates is None:
+        with _templates_lock:
+            if _templates is None:
+                _templates = load_templates(STORE_PATH, TEMPLATE_PATH)
+    return _templates
 
-    dur = audio.duration_seconds
-    syl_dur = dur / len(syllables)
+# clip | batch | utterance (see features_hubert.EMBEDDING_MODES)
+EMBEDDING_MODE = os.environ.get("NUDIGURU_HUBERT_MODE", "clip")
 
-    results = []
+# Cross-request micro-batching of syllable clips (clip/batch modes). Each
+# clip is normalised and pooled over its own frames (see embed_batch), so a
+# fp32 score doesn't depend on which other requests were queued alongside
+# it; int8 backends quantize activations per forward pass, which moves
+# embeddings by about 1e-3
+embedding_service = None
+if os.environ.get("NUDIGURU_HUBERT_BATCHING", "0") == "1":
+    embedding_service = EmbeddingService(
+        embed_batch,
+        max_batch_size=int(os.environ.get("NUDIGURU_HUBERT_MAX_BATCH", "16")),
+        max_wait_ms=float(os.environ.get("NUDIGURU_HUBERT_MAX_WAIT_MS", "10"))
+    )
 
-    for i, syl in enumerate(syllables):
+def syllable_bounds(n_samples, sr, count):
+    """
+    (start, end) sample offsets splitting a waveform evenly into `count`
+    clips, using the same millisecond boundaries the pydub slicing used.
+    """
+    syl_dur = n_samples / sr / count
+    bounds = []
+
+    for i in range(count):
         start = int(i * syl_dur * 1000)
-        end = int((i+1) * syl_dur * 1000)
+        end = int((i + 1) * syl_dur * 1000)
+        bounds.append((int(start * sr / 1000), int(end * sr / 1000)))
+
+    return bounds
 
-        temp = f"temp_{syl}.wav"
-        audio[start:end].export(temp, format="wav")
+def syllable_slices(y, sr, count):
+    """Zero-copy views of the evenly split syllable clips"""
+    return [y[s:e] for s, e in syllable_bounds(len(y), sr, count)]
+
+def evaluate(audio_path, word_id):
+    """Path-based wrapper kept for the CLI scripts"""
+    y, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
+    return evaluate_waveform(y, sr, word_id)
 
-        emb = extract_embedding(temp)
+def evaluate_waveform(y, sr, word_id, mode=None, frames=None):
+    """
+    Score every syllable of a decoded waveform. `frames` may carry the
+    utterance's HuBERT frames when the caller already has them.
+    """
+    syllables = WORD_MAP[word_id]["syllables"]
+
+    if sr != SAMPLE_RATE:
+        y = librosa.resample(y, orig_sr=sr, target_sr=SAMPLE_RATE)
+        sr = SAMPLE_RATE
+
+    bounds = syllable_bounds(len(y), sr, len(syllables))
+    embs = extract_syllable_embeddings(
+        y, bounds, mode or EMBEDDING_MODE, frames, service=embedding_service
+    )
+
+    templates = get_templates()
+    results = []
+
+    for syl, emb in zip(syllables, embs):
         sim, ok = score_syllable(word_id, syl, emb, templates)
 
         results.append({
@@ -40,6 +99,4 @@ def evaluate(audio_path, word_id):
             "correct": ok
         })
 
-        os.remove(temp)
-
     return results
\ No newline at end of file
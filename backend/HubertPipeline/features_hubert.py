@@ -1,28 +1,195 @@
 # features_hubert.py
 
+import os
+import threading
+import importlib.util
 import torch
 import numpy as np
 import librosa
-from transformers import HubertModel, Wav2Vec2FeatureExtractor
 
-# Load PyTorch-only HuBERT components
-extractor = Wav2Vec2FeatureExtractor.from_pretrained("facebook/hubert-base-ls960")
-model = HubertModel.from_pretrained("facebook/hubert-base-ls960")
-model.eval()
+# Fail at import, as before, when transformers isn't installed at all
+if importlib.util.find_spec("transformers") is None:
+    raise ImportError("No module named 'transformers'")
+
+# Also imported as a top-level module by preprocess_references.py
+if __package__:
+    from .hubert_backends import build, hidden_states
+else:
+    from hubert_backends import build, hidden_states
+
+MODEL_NAME = "facebook/hubert-base-ls960"
+
+# CPU inference backend and quantization (see hubert_backends), and the
+# torch (or onnxruntime) intra-op / inter-op thread counts; unset threads
+# keep the library defaults
+BACKEND = os.environ.get("NUDIGURU_HUBERT_BACKEND", "eager")
+QUANTIZE = os.environ.get("NUDIGURU_HUBERT_QUANTIZE", "none")
+INTRA_OP_THREADS = int(os.environ.get("NUDIGURU_HUBERT_THREADS", "0")) or None
+INTER_OP_THREADS = int(os.environ.get("NUDIGURU_HUBERT_INTEROP_THREADS", "0")) or None
+
+# PyTorch-only HuBERT components, loaded on first use (or by the API's
+# model registry at startup) rather than at import
+_hubert = None
+_hubert_lock = threading.Lock()
+
+def load_model():
+    """(extractor, model) for MODEL_NAME on BACKEND, loaded once"""
+    global _hubert
+    if _hubert is None:
+        with _hubert_lock:
+            if _hubert is None:
+                from transformers import Wav2Vec2FeatureExtractor
+
+                extractor = Wav2Vec2FeatureExtractor.from_pretrained(MODEL_NAME)
+                model = build(MODEL_NAME, BACKEND, QUANTIZE, INTRA_OP_THREADS, INTER_OP_THREADS)
+                _hubert = (extractor, model)
+    return _hubert
+
+SAMPLE_RATE = 16000
+MIN_SAMPLES = 2000      # shorter (trimmed) clips get a zero embedding
+
+# HuBERT's conv front-end: one frame per 320 samples (20 ms), 400-sample receptive field
+FRAME_HOP = 320
+FRAME_WIN = 400
+
+# How per-syllable embeddings are computed:
+#   "clip":      one forward pass per syllable clip (original behaviour)
+#   "batch":     all syllable clips zero-padded into a single forward pass
+#                (per-clip normalisation and pooling, so embeddings match "clip")
+#   "utterance": one forward pass over the whole recording, frames mean-pooled per syllable
+EMBEDDING_MODES = ("clip", "batch", "utterance")
 
 def extract_embedding(path):
-    audio, sr = librosa.load(path, sr=16000)
+    audio, sr = librosa.load(path, sr=SAMPLE_RATE)
+    return extract_embedding_from_array(audio, sr)
+
+def extract_embedding_from_array(audio, sr=SAMPLE_RATE):
+    """Same embedding as extract_embedding, from an already decoded waveform"""
+    audio = np.asarray(audio, dtype=np.float32)
+    if sr != SAMPLE_RATE:
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=SAMPLE_RATE)
+
     audio, _ = librosa.effects.trim(audio)
 
-    if len(audio) < 2000:
+    if len(audio) < MIN_SAMPLES:
         return np.zeros((768,), dtype=np.float32)
 
+    extractor, model = load_model()
     inputs = extractor(audio, sampling_rate=16000, return_tensors="pt")
 
     with torch.no_grad():
         outputs = model(**inputs).last_hidden_state  # shape: (1, T, 768)
 
     emb = outputs.mean(dim=1).squeeze().numpy()
-    emb /= (np.linalg.norm(emb) + 1e-8)
+    return _l2_normalize(emb)
+
+def _l2_normalize(emb):
+    emb = emb / (np.linalg.norm(emb) + 1e-8)
+    return emb.astype(np.float32)
+
+def extract_frames(audio, sr=SAMPLE_RATE):
+    """(T, 768) last hidden states for a whole waveform (one frame per 20 ms)"""
+    audio = np.asarray(audio, dtype=np.float32)
+    if sr != SAMPLE_RATE:
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=SAMPLE_RATE)
+
+    extractor, model = load_model()
+    inputs = extractor(audio, sampling_rate=16000, return_tensors="pt")
+
+    with torch.no_grad():
+        outputs = model(**inputs).last_hidden_state  # shape: (1, T, 768)
+
+    return outputs[0].numpy()
+
+# ----------------------------------------
+# Batched embeddings for all syllables of one utterance
+# ----------------------------------------
+def embed_batch(clips, on_forward=None):
+    """
+    Embed already trimmed 16 kHz clips with a single zero-padded forward
+    pass. Each clip is normalised and pooled over its own samples and
+    frames only (see hubert_backends.hidden_states), so its embedding
+    matches extract_embedding_from_array on that clip alone whatever it
+    was batched with. on_forward, if given, is called with the number of
+    clips in the forward pass.
+    """
+    embs = [np.zeros((768,), dtype=np.float32) for _ in clips]
+    keep = [i for i, c in enumerate(clips) if len(c) >= MIN_SAMPLES]
+    if not keep:
+        return embs
+
+    extractor, model = load_model()
+    inputs = extractor(
+        [clips[i] for i in keep],
+        sampling_rate=16000,
+        padding=True,
+        return_attention_mask=True,
+        return_tensors="pt"
+    )
+
+    with torch.no_grad():
+        outputs = hidden_states(model, inputs["input_values"], inputs["attention_mask"])  # shape: (B, T, 768)
+    if on_forward is not None:
+        on_forward(len(keep))
+
+    lengths = model._get_feat_extract_output_lengths(inputs["attention_mask"].sum(-1))
+    for row, i in enumerate(keep):
+        n = max(int(lengths[row]), 1)
+        embs[i] = _l2_normalize(outputs[row, :n].mean(dim=0).numpy())
+
+    return embs
+
+def pool_frames(frames, spans):
+    """
+    Mean-pool whole-utterance frames over sample spans [(start, end), ...].
+    A frame belongs to a span if its receptive field is centred inside it.
+    """
+    embs = []
+    for start, end in spans:
+        if end - start < MIN_SAMPLES or len(frames) == 0:
+            embs.append(np.zeros((768,), dtype=np.float32))
+            continue
+
+        centre = FRAME_WIN // 2
+        first = max(0, -(-(start - centre) // FRAME_HOP))
+        last = min(len(frames) - 1, (end - 1 - centre) // FRAME_HOP)
+        last = max(first, last)
+        first = min(first, len(frames) - 1)
+
+        embs.append(_l2_normalize(frames[first:last + 1].mean(axis=0)))
+
+    return embs
+
+def extract_syllable_embeddings(audio, bounds, mode="clip", frames=None, service=None):
+    """
+    One embedding per syllable of a 16 kHz waveform.
+
+    bounds are (start, end) sample offsets of each syllable clip. Every clip
+    is silence-trimmed as in extract_embedding; "utterance" mode pools the
+    frames of the trimmed span, reusing `frames` when already computed.
+    With a micro-batching `service`, clip and batch modes submit the
+    trimmed clips to it so they can share forward passes with other requests.
+    """
+    if mode not in EMBEDDING_MODES:
+        raise ValueError(f"Unknown embedding mode '{mode}', expected one of {EMBEDDING_MODES}")
+
+    if mode == "clip" and service is None:
+        return [extract_embedding_from_array(audio[s:e]) for s, e in bounds]
+
+    trimmed_spans = []
+    for s, e in bounds:
+        if e - s > 0:
+            _, (t0, t1) = librosa.effects.trim(audio[s:e])
+            trimmed_spans.append((s + int(t0), s + int(t1)))
+        else:
+            trimmed_spans.append((s, s))
+
+    if mode == "utterance":
+        if frames is None:
+            frames = extract_frames(audio)
+        return pool_frames(frames, trimmed_spans)
 
-    return emb.astype(np.float32)
\ No newline at end of file
+    clips = [audio[s:e] for s, e in trimmed_spans]
+    if service is not None:
+        return service.embed(clips)
+    return embed_batch(clips)
@@ -0,0 +1,227 @@
+# hubert_backends.py
+
+import os
+import torch
+
+# How the HuBERT forward pass runs on CPU:
+#   "eager":       the transformers module as is (original behaviour)
+#   "torchscript": a traced graph of it
+#   "onnx":        an exported graph run by onnxruntime (optional dependency),
+#                  exported once and kept on disk
+BACKENDS = ("eager", "torchscript", "onnx")
+
+# "int8": dynamic quantization of every Linear layer (int8 weights,
+# activations quantized on the fly per batch); the conv front-end stays fp32
+QUANTIZATIONS = ("none", "int8")
+
+ONNX_DIR = os.path.join(os.path.dirname(__file__), "onnx")
+
+
+def configure_threads(intra_op=None, inter_op=None):
+    """
+    Process-wide torch thread counts. The inter-op count can only be set
+    before torch first runs inter-op work; later attempts are reported and
+    ignored.
+    """
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            print(f"⚠️ Could not set torch inter-op threads: {e}")
+
+
+def quantize_int8(model):
+    # In place, so the fp32 Linear weights are freed rather than kept alongside
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def hidden_states(model, input_values, attention_mask=None):
+    """
+    last_hidden_state of a zero-padded batch, every clip's valid frames as
+    if it ran alone. hubert-base's first conv layer GroupNorms each channel
+    over time, so its statistics are taken over each clip's own frames
+    instead of over the padding as well. The later conv layers have no
+    padding of their own and the encoder masks padded frames before its
+    positional conv and attention, so nothing else mixes padding in.
+    """
+    if isinstance(model, GraphHubert):
+        return model(input_values, attention_mask).last_hidden_state
+    if attention_mask is None or model.config.feat_extract_norm != "group":
+        return model(input_values, attention_mask=attention_mask).last_hidden_state
+
+    first, *rest = model.feature_extractor.conv_layers
+    conv, norm = first.conv, first.layer_norm
+
+    x = conv(input_values[:, None])  # (B, C, T)
+    lengths = torch.div(attention_mask.sum(-1) - conv.kernel_size[0], conv.stride[0], rounding_mode="floor") + 1
+    valid = (torch.arange(x.shape[-1])[None, :] < lengths[:, None]).to(x.dtype)[:, None, :]
+    count = valid.sum(-1, keepdim=True).clamp(min=1)
+    mean = (x * valid).sum(-1, keepdim=True) / count
+    var = (((x - mean) * valid) ** 2).sum(-1, keepdim=True) / count
+    x = (x - mean) / torch.sqrt(var + norm.eps) * norm.weight[:, None] + norm.bias[:, None]
+    x = first.activation(x)
+    for layer in rest:
+        x = layer(x)
+
+    features = x.transpose(1, 2)
+    frame_mask = model._get_feature_vector_attention_mask(features.shape[1], attention_mask)
+    return model.encoder(model.feature_projection(features), attention_mask=frame_mask)[0]
+
+
+class _HiddenStates(torch.nn.Module):
+    """(input_values, attention_mask) -> last_hidden_state, a plain tensor graph to trace or export"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_values, attention_mask):
+        return hidden_states(self.model, input_values, attention_mask)
+
+
+class _Output:
+    def __init__(self, last_hidden_state):
+        self.last_hidden_state = last_hidden_state
+
+
+class GraphHubert:
+    """
+    Drop-in for HubertModel over a traced or exported graph: called with the
+    extractor's inputs, it returns an object with .last_hidden_state. Calls
+    without an attention mask get an all-ones one, which changes nothing.
+    """
+
+    def __init__(self, run, config):
+        self._run = run
+        self.config = config
+
+    def __call__(self, input_values, attention_mask=None):
+        if attention_mask is None:
+            attention_mask = torch.ones(input_values.shape, dtype=torch.long)
+        return _Output(self._run(input_values, attention_mask.long()))
+
+    def _get_feat_extract_output_lengths(self, lengths):
+        # Same arithmetic as HubertModel's: one step per conv layer
+        for kernel, stride in zip(self.config.conv_kernel, self.config.conv_stride):
+            lengths = torch.div(lengths - kernel, stride, rounding_mode="floor") + 1
+        return lengths
+
+
+def _example_inputs():
+    # Two clips of different lengths, so padding and masking are traced too
+    input_values = torch.randn(2, 16000)
+    attention_mask = torch.ones(2, 16000, dtype=torch.long)
+    attention_mask[1, 12000:] = 0
+    return input_values, attention_mask
+
+
+def trace(model):
+    with torch.no_grad():
+        graph = torch.jit.trace(_HiddenStates(model).eval(), _example_inputs(), check_trace=False)
+    graph = torch.jit.freeze(graph.eval()) if not _is_quantized(model) else graph
+    return GraphHubert(graph, model.config)
+
+
+def _is_quantized(model):
+    return any(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in model.modules())
+
+
+def onnx_path(model_name, quantize):
+    # ".clipnorm": exported with hidden_states' per-clip GroupNorm statistics,
+    # so exports from before it are not picked up
+    name = model_name.replace("/", "--") + ".clipnorm" + (".int8" if quantize == "int8" else "") + ".onnx"
+    return os.path.join(os.environ.get("NUDIGURU_HUBERT_ONNX_DIR", ONNX_DIR), name)
+
+
+def export_onnx(model, path):
+    """Export the fp32 model with dynamic batch and length axes"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with torch.no_grad():
+        torch.onnx.export(
+            _HiddenStates(model).eval(), _example_inputs(), tmp,
+            input_names=["input_values", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_values": {0: "batch", 1: "samples"},
+                "attention_mask": {0: "batch", 1: "samples"},
+                "last_hidden_state": {0: "batch", 1: "frames"},
+            },
+            opset_version=17,
+            dynamo=False,
+        )
+    os.replace(tmp, path)
+
+
+def _load_fp32(model_name):
+    from transformers import HubertModel
+
+    model = HubertModel.from_pretrained(model_name)
+    model.eval()
+    return model
+
+
+def onnx_session(model_name, quantize, intra_op=None, inter_op=None):
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        raise ImportError("The onnx HuBERT backend needs onnxruntime (pip install onnxruntime onnx)")
+    from transformers import HubertConfig
+
+    # The torch weights are only loaded to export once; later loads just
+    # open the exported graph
+    fp32_path = onnx_path(model_name, "none")
+    if not os.path.exists(fp32_path):
+        print(f"🔄 Exporting {model_name} to {fp32_path}")
+        export_onnx(_load_fp32(model_name), fp32_path)
+
+    path = fp32_path
+    if quantize == "int8":
+        path = onnx_path(model_name, "int8")
+        if not os.path.exists(path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            tmp = f"{path}.{os.getpid()}.tmp"
+            # MatMuls only, as with torch: quantizing the conv front-end
+            # too costs agreement and, on CPU, speed
+            quantize_dynamic(fp32_path, tmp, op_types_to_quantize=["MatMul"], weight_type=QuantType.QInt8)
+            os.replace(tmp, path)
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if intra_op:
+        options.intra_op_num_threads = intra_op
+    if inter_op:
+        options.inter_op_num_threads = inter_op
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+    def run(input_values, attention_mask):
+        outputs = session.run(None, {
+            "input_values": input_values.numpy(),
+            "attention_mask": attention_mask.numpy(),
+        })
+        return torch.from_numpy(outputs[0])
+
+    return GraphHubert(run, HubertConfig.from_pretrained(model_name))
+
+
+def build(model_name, backend="eager", quantize="none", intra_op=None, inter_op=None):
+    """The HuBERT forward pass for `backend` and `quantize`, loaded from the fp32 `model_name`"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HuBERT backend '{backend}', expected one of {BACKENDS}")
+    if quantize not in QUANTIZATIONS:
+        raise ValueError(f"Unknown HuBERT quantization '{quantize}', expected one of {QUANTIZATIONS}")
+
+    if backend == "onnx":
+        # onnxruntime has its own thread pools and its own int8 quantizer
+        return onnx_session(model_name, quantize, intra_op, inter_op)
+
+    configure_threads(intra_op, inter_op)
+    model = _load_fp32(model_name)
+    if quantize == "int8":
+        model = quantize_int8(model)
+    if backend == "torchscript":
+        return trace(model)
+    return model
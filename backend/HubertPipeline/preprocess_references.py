@@ -1,10 +1,14 @@
 # preprocess_references.py
 
-import os, json
+import os
+import sys
 from pydub import AudioSegment
 from tqdm import tqdm
 from syllables import WORD_MAP
 from features_hubert import extract_embedding
+# template_store.py is shared by both pipelines and lives in backend/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from template_store import TemplateStore, store_paths
 import os
 os.environ["TRANSFORMERS_NO_TF"] = "1"
 os.environ["TRANSFORMERS_NO_FLAX"] = "1"
@@ -36,11 +40,13 @@ for word_id, info in tqdm(WORD_MAP.items(), desc="Words"):
             audio[start:end].export(temp, format="wav")
 
             emb = extract_embedding(temp)
-            templates[word_id][syl].append(emb.tolist())
+            templates[word_id][syl].append((spk, emb))
 
             os.remove(temp)
 
-with open("syllable_templates.json", "w") as f:
-    json.dump(templates, f, indent=2)
+# Binary store is what the server memory-maps; JSON is kept for inspection/import
+store = TemplateStore.from_templates(templates)
+store.save("syllable_templates")
+store.to_json("syllable_templates.json")
 
-print("DONE → syllable_templates.json")
\ No newline at end of file
+print(f"DONE → {' + '.join(store_paths('syllable_templates'))} + syllable_templates.json")
\ No newline at end of file
@@ -12,13 +12,17 @@ def score_syllable(word_id, syl, user_emb, templates):
     """
     Score a syllable by comparing user embedding to reference templates
     """
-    refs = [np.array(r, dtype=np.float32) for r in templates[word_id][syl]]
+    refs = templates.stacked(word_id, syl)
+    if refs is None and templates.refs(word_id, syl):
+        refs = np.stack(templates.refs(word_id, syl))
     
-    if len(refs) == 0:
+    if refs is None or len(refs) == 0:
         return 0.0, False
     
-    sims = [cosine(user_emb, r) for r in refs]
-    best_sim = max(sims)
+    # One matrix-vector product over the zero-copy (n_refs, 768) view
+    norms = np.linalg.norm(refs, axis=1) * np.linalg.norm(user_emb) + 1e-8
+    sims = (refs @ user_emb) / norms
+    best_sim = float(np.max(sims))
     
     threshold = 0.70  # Adjust based on testing
     
@@ -1,32 +1,68 @@
 # backend/TTS.py
 import io
+import os
+import threading
+import importlib.util
 import numpy as np
-from TTS.utils.synthesizer import Synthesizer
-from src.inference import TextToSpeechEngine
 from scipy.io.wavfile import write as scipy_wav_write
 
+# Fail at import, as before, when Coqui TTS isn't installed at all; the
+# package itself (slow to import) is only imported with the model
+if importlib.util.find_spec("TTS") is None:
+    raise ImportError("No module named 'TTS'")
+
 # ---------------------------
-# Load Kannada IndicTTS Model
+# Kannada IndicTTS Model, loaded on first use
 # ---------------------------
+# The synthesizer, the denoiser and the engine around them load lazily, each
+# at most once, so the API can start serving before they are ready (its
+# model registry loads them in the background)
+
+_lock = threading.Lock()
+_engine_lock = threading.Lock()
+_synthesizer = None
+_engine = None
+
+def load_synthesizer():
+    """FastPitch + HiFiGAN Synthesizer for Kannada"""
+    global _synthesizer
+    with _lock:
+        if _synthesizer is None:
+            from TTS.utils.synthesizer import Synthesizer
+
+            _synthesizer = Synthesizer(
+                tts_checkpoint="kn/fastpitch/best_model.pth",
+                tts_config_path="kn/fastpitch/config.json",
+                tts_speakers_file="kn/fastpitch/speakers.pth",
+                tts_languages_file=None,
+                vocoder_checkpoint="kn/hifigan/best_model.pth",
+                vocoder_config="kn/hifigan/config.json",
+                encoder_checkpoint="",
+                encoder_config="",
+                use_cuda=False
+            )
+        return _synthesizer
+
+def load_denoiser():
+    """DCCRNet weights used by the engine's Denoiser"""
+    from src.postprocessor.denoiser import load_model
+    return load_model()
+
+def get_engine():
+    """TextToSpeechEngine over the Kannada synthesizer (its Denoiser shares load_denoiser's model)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            from src.inference import TextToSpeechEngine
 
-kannada_model = Synthesizer(
-    tts_checkpoint="kn/fastpitch/best_model.pth",
-    tts_config_path="kn/fastpitch/config.json",
-    tts_speakers_file="kn/fastpitch/speakers.pth",
-    tts_languages_file=None,
-    vocoder_checkpoint="kn/hifigan/best_model.pth",
-    vocoder_config="kn/hifigan/config.json",
-    encoder_checkpoint="",
-    encoder_config="",
-    use_cuda=False
-)
-
-# Set up engine
-models = {
-    "kn": kannada_model
-}
-
-engine = TextToSpeechEngine(models)
+            models = {
+                "kn": load_synthesizer()
+            }
+            _engine = TextToSpeechEngine(
+                models,
+                batch_size=int(os.getenv("NUDIGURU_TTS_BATCH_SIZE", "1"))
+            )
+        return _engine
 
 DEFAULT_SAMPLING_RATE = 16000
 
@@ -38,7 +74,7 @@ def generate_kannada_audio(text, speaker_name="female"):
     """Generate Kannada TTS audio"""
     print(f"🎤 Generating TTS: '{text}' with {speaker_name} voice")
     
-    kannada_raw_audio = engine.infer_from_text(
+    kannada_raw_audio = get_engine().infer_from_text(
         input_text=text,
         lang="kn",
         speaker_name=speaker_name
@@ -53,4 +89,19 @@ def generate_kannada_audio(text, speaker_name="female"):
     
     print(f"✅ Generated {len(audio_array)} samples at {DEFAULT_SAMPLING_RATE}Hz")
     
-    return audio_array, DEFAULT_SAMPLING_RATE
\ No newline at end of file
+    return audio_array, DEFAULT_SAMPLING_RATE
+
+def stream_kannada_audio(text, speaker_name="female"):
+    """Yield Kannada TTS audio paragraph by paragraph, as soon as each is ready"""
+    print(f"🎤 Streaming TTS: '{text}' with {speaker_name} voice")
+
+    for chunk in get_engine().infer_from_text_stream(
+        input_text=text,
+        lang="kn",
+        speaker_name=speaker_name
+    ):
+        yield np.asarray(chunk, dtype=np.float32)
+
+def join_kannada_audio(chunks):
+    """The streamed paragraphs joined as generate_kannada_audio joins them"""
+    return np.asarray(get_engine().join_chunks(list(chunks)), dtype=np.float32)
@@ -0,0 +1,290 @@
+# dtw_engine.py
+
+import os
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Keep the (rows, m, dims) difference tensor below ~16 MB of float32
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+
+# ----------------------------------------
+# 1. Pairwise Euclidean cost matrix
+# ----------------------------------------
+def cost_matrix(a, b):
+    """Euclidean distance between every frame of a (n, d) and b (m, d)"""
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.ndim == 1:
+        a = a.reshape(-1, 1)
+    if b.ndim == 1:
+        b = b.reshape(-1, 1)
+
+    n, m = len(a), len(b)
+    dtype = np.result_type(a.dtype, b.dtype, np.float32)
+    cost = np.empty((n, m), dtype=dtype)
+
+    rows = max(1, MAX_BLOCK_ELEMENTS // max(1, m * a.shape[1]))
+    for i in range(0, n, rows):
+        diff = a[i:i + rows, None, :] - b[None, :, :]
+        cost[i:i + rows] = np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+
+    return cost
+
+
+# ----------------------------------------
+# 2. Accumulated cost (same recursion as dtw.dtw with warp=1)
+# ----------------------------------------
+def _accumulate(cost):
+    n, m = cost.shape
+    prev = np.empty(m, dtype=np.float64)
+    curr = np.empty(m, dtype=np.float64)
+
+    for i in range(n):
+        for j in range(m):
+            if i == 0 and j == 0:
+                best = 0.0
+            elif i == 0:
+                best = curr[j - 1]
+            elif j == 0:
+                best = prev[j]
+            else:
+                best = min(prev[j - 1], prev[j], curr[j - 1])
+            curr[j] = cost[i, j] + best
+        prev, curr = curr, prev
+
+    return prev[m - 1]
+
+
+if NUMBA_AVAILABLE:
+    # nogil lets thread pools run several alignments in parallel
+    _accumulate_jit = numba.njit(cache=True, nogil=True)(_accumulate)
+
+
+# ----------------------------------------
+# 3. Lower bounds (valid for unconstrained and banded DTW)
+# ----------------------------------------
+def effective_window(n, m, window):
+    """Sakoe-Chiba half-width, widened so the end cell stays reachable"""
+    if window is None:
+        return max(n, m)
+    return max(int(window), abs(n - m))
+
+
+def lb_kim(a, b):
+    """Every warping path starts at (0, 0) and ends at (n-1, m-1)"""
+    first = float(np.linalg.norm(a[0] - b[0]))
+    if len(a) == 1 and len(b) == 1:
+        return first
+    return first + float(np.linalg.norm(a[-1] - b[-1]))
+
+
+def _envelope_bound(a, b):
+    # Each frame of a is matched to at least one frame of b, so its cost is
+    # at least the distance to b's per-dimension [min, max] envelope. The
+    # envelope spans all of b, which keeps the bound valid under any band.
+    n, m = a.shape[0], b.shape[0]
+    dims = a.shape[1]
+    lower = np.full(dims, np.inf)
+    upper = np.full(dims, -np.inf)
+
+    for j in range(m):
+        for k in range(dims):
+            lower[k] = min(lower[k], np.float64(b[j, k]))
+            upper[k] = max(upper[k], np.float64(b[j, k]))
+
+    total = 0.0
+    for i in range(n):
+        sq = 0.0
+        for k in range(dims):
+            x = np.float64(a[i, k])
+            excess = max(lower[k] - x, x - upper[k], 0.0)
+            sq += excess * excess
+        total += np.sqrt(sq)
+
+    return total
+
+
+def _envelope_bound_numpy(a, b):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    excess = a - np.clip(a, b.min(axis=0), b.max(axis=0))
+    return float(np.sqrt(np.einsum("ij,ij->i", excess, excess)).sum())
+
+
+if NUMBA_AVAILABLE:
+    # Only reassociation is relaxed (vectorized sums); inf handling stays exact
+    _envelope_bound_jit = numba.njit(cache=True, nogil=True, fastmath={"reassoc", "contract"})(_envelope_bound)
+
+
+def lb_keogh(a, b):
+    """LB_Keogh in both directions (rows of a and columns of b), whichever is tighter"""
+    a = np.ascontiguousarray(a)
+    b = np.ascontiguousarray(b)
+    bound = _envelope_bound_jit if NUMBA_AVAILABLE else _envelope_bound_numpy
+    return float(max(bound(a, b), bound(b, a)))
+
+
+# ----------------------------------------
+# 4. Banded, early-abandoning DTW
+# ----------------------------------------
+def _dtw_banded(a, b, w, cutoff):
+    # Fused cost + accumulation so an abandoned alignment also skips the
+    # distance computations of the remaining rows. Returns inf on abandon.
+    n, m = a.shape[0], b.shape[0]
+    dims = a.shape[1]
+    prev = np.full(m, np.inf)
+    curr = np.full(m, np.inf)
+
+    for i in range(n):
+        lo = max(0, i - w)
+        hi = min(m, i + w + 1)
+        row_min = np.inf
+
+        for j in range(lo, hi):
+            sq = 0.0
+            for k in range(dims):
+                diff = np.float64(a[i, k]) - np.float64(b[j, k])
+                sq += diff * diff
+
+            if i == 0 and j == 0:
+                best = 0.0
+            else:
+                best = np.inf
+                if i > 0:
+                    best = min(best, prev[j])
+                    if j > 0:
+                        best = min(best, prev[j - 1])
+                if j > 0:
+                    best = min(best, curr[j - 1])
+
+            curr[j] = np.sqrt(sq) + best
+            row_min = min(row_min, curr[j])
+
+        # Every path crosses row i, so nothing can finish below row_min
+        if row_min >= cutoff:
+            return np.inf
+
+        prev, curr = curr, prev
+        curr[:] = np.inf
+
+    return prev[m - 1]
+
+
+def _dtw_banded_numpy(a, b, w, cutoff):
+    # Same recursion without numba: vectorized cost rows, Python accumulation
+    n, m = len(a), len(b)
+    prev = np.full(m, np.inf)
+
+    for i in range(n):
+        lo = max(0, i - w)
+        hi = min(m, i + w + 1)
+        cost = np.linalg.norm(b[lo:hi].astype(np.float64) - a[i], axis=1)
+        curr = np.full(m, np.inf)
+
+        for j in range(lo, hi):
+            if i == 0 and j == 0:
+                best = 0.0
+            else:
+                best = min(prev[j], prev[j - 1] if j > 0 else np.inf, curr[j - 1] if j > 0 else np.inf)
+            curr[j] = cost[j - lo] + best
+
+        if curr[lo:hi].min() >= cutoff:
+            return np.inf
+        prev = curr
+
+    return prev[m - 1]
+
+
+if NUMBA_AVAILABLE:
+    _dtw_banded_jit = numba.njit(cache=True, nogil=True, fastmath={"reassoc", "contract"})(_dtw_banded)
+
+
+def banded_dtw(a, b, window=None, cutoff=np.inf):
+    """DTW within a Sakoe-Chiba band; inf once every partial path reaches cutoff"""
+    a = np.ascontiguousarray(a)
+    b = np.ascontiguousarray(b)
+    w = effective_window(len(a), len(b), window)
+    if NUMBA_AVAILABLE:
+        return float(_dtw_banded_jit(a, b, w, float(cutoff)))
+    return float(_dtw_banded_numpy(a, b, w, float(cutoff)))
+
+
+def best_match(query, refs, threshold, window=None):
+    """
+    Smallest DTW distance from query to any of refs, without aligning
+    references that cannot win.
+
+    References are visited in order of their lower bound; the search stops
+    once the next bound reaches min(best so far, threshold), and every
+    alignment is abandoned as soon as it does. With window=None the result
+    equals min(exact distances) whenever that is below threshold; otherwise
+    threshold itself is returned. Also returns counters for the search.
+    """
+    stats = {"references": len(refs), "aligned": 0, "abandoned": 0, "pruned": 0}
+
+    # Shaved slightly: bounds and alignments round differently (float64 vs float32)
+    bounds = [max(lb_kim(query, r), lb_keogh(query, r)) * (1 - 1e-6) for r in refs]
+    best = np.inf
+
+    for idx in np.argsort(bounds, kind="stable"):
+        cutoff = min(best, threshold)
+        if bounds[idx] >= cutoff:
+            stats["pruned"] = len(refs) - stats["aligned"] - stats["abandoned"]
+            break
+
+        dist = banded_dtw(query, refs[idx], window, cutoff)
+        if np.isinf(dist):
+            stats["abandoned"] += 1
+        else:
+            stats["aligned"] += 1
+            best = min(best, dist)
+
+    return min(best, threshold), stats
+
+
+# ----------------------------------------
+# 5. Engines
+# ----------------------------------------
+def _dtw_reference(a, b):
+    """The original implementation: dtw.dtw with a Python distance lambda"""
+    from dtw import dtw
+    return float(dtw(a, b, dist=lambda x, y: np.linalg.norm(x - y))[0])
+
+
+def _dtw_numpy(a, b):
+    return float(_accumulate(cost_matrix(a, b)))
+
+
+def _dtw_numba(a, b):
+    return float(_accumulate_jit(cost_matrix(a, b)))
+
+
+ENGINES = {
+    "reference": _dtw_reference,
+    "numpy": _dtw_numpy,
+}
+if NUMBA_AVAILABLE:
+    ENGINES["numba"] = _dtw_numba
+
+DEFAULT_ENGINE = os.environ.get(
+    "NUDIGURU_DTW_ENGINE",
+    "numba" if NUMBA_AVAILABLE else "numpy"
+)
+
+
+def get_engine(name=None):
+    name = name or DEFAULT_ENGINE
+    if name not in ENGINES:
+        raise ValueError(f"Unknown DTW engine '{name}', expected one of {sorted(ENGINES)}")
+    return ENGINES[name]
+
+
+def dtw_distance(a, b, engine=None):
+    """DTW distance between two (time, features) sequences"""
+    return get_engine(engine)(a, b)
@@ -1,30 +1,42 @@
 # evaluate_speech.py
 
 import os
-from pydub import AudioSegment
+import librosa
 from .syllables import WORD_MAP
-from .mel_dtw import score_syllable
+from .features import SAMPLE_RATE, extract_features_from_array
+from .mel_dtw import score_features
 import warnings
 warnings.filterwarnings("ignore")
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
-def evaluate(audio_path, word_id):
-    syllables = WORD_MAP[word_id]["syllables"]
-    audio = AudioSegment.from_wav(audio_path)
-
-    duration = audio.duration_seconds
-    syl_dur = duration / len(syllables)
+def syllable_slices(y, sr, count):
+    """
+    Split a waveform evenly into `count` zero-copy views, using the same
+    millisecond boundaries the pydub slicing used.
+    """
+    syl_dur = len(y) / sr / count
+    slices = []
 
-    results = []
-
-    for i, syl in enumerate(syllables):
+    for i in range(count):
         start = int(i * syl_dur * 1000)
         end = int((i + 1) * syl_dur * 1000)
+        slices.append(y[int(start * sr / 1000):int(end * sr / 1000)])
+
+    return slices
 
-        temp = f"temp_{syl}.wav"
-        audio[start:end].export(temp, format="wav")
+def evaluate(audio_path, word_id):
+    """Path-based wrapper kept for the CLI scripts"""
+    y, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
+    return evaluate_waveform(y, sr, word_id)
+
+def evaluate_waveform(y, sr, word_id):
+    syllables = WORD_MAP[word_id]["syllables"]
+    clips = syllable_slices(y, sr, len(syllables))
 
-        res = score_syllable(word_id, syl, temp)
+    results = []
+
+    for syl, clip in zip(syllables, clips):
+        res = score_features(word_id, syl, extract_features_from_array(clip, sr))
 
         results.append({
             "syllable": syl,
@@ -33,6 +45,4 @@ def evaluate(audio_path, word_id):
             "correct": res["correct"]
         })
 
-        os.remove(temp)
-
     return results
\ No newline at end of file
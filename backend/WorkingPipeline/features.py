@@ -8,9 +8,19 @@ import os
 warnings.filterwarnings("ignore")
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
+SAMPLE_RATE = 16000
+
 def extract_features(path):
     # Load audio
-    y, sr = librosa.load(path, sr=16000)
+    y, sr = librosa.load(path, sr=SAMPLE_RATE)
+    return extract_features_from_array(y, sr)
+
+def extract_features_from_array(y, sr=SAMPLE_RATE):
+    """Same features as extract_features, from an already decoded waveform"""
+    y = np.asarray(y, dtype=np.float32)
+    if sr != SAMPLE_RATE:
+        y = librosa.resample(y, orig_sr=sr, target_sr=SAMPLE_RATE)
+        sr = SAMPLE_RATE
 
     # ----------------------------------------
     # 1. Pre-emphasis (boost high frequencies)
@@ -1,39 +1,41 @@
 # mel_dtw.py
 
-import json
-import numpy as np
-from dtw import dtw
 from .features import extract_features
+from .reference_cache import ReferenceCache
+from .dtw_engine import dtw_distance, best_match
 import os
 
 # Path relative to this file's directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 TEMPLATE_PATH = os.path.join(BASE_DIR, "syllable_templates.json")
+STORE_PATH = os.path.join(BASE_DIR, "syllable_templates")
 
-with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
-    templates = json.load(f)
+# "pruned": lower-bound ordered, early-abandoning search over references
+# "exhaustive": full DTW against every reference
+SEARCH_MODE = os.environ.get("NUDIGURU_DTW_SEARCH", "pruned")
+# Optional Sakoe-Chiba half-width in frames (unset = unconstrained, exact)
+SEARCH_WINDOW = int(os.environ["NUDIGURU_DTW_WINDOW"]) if os.environ.get("NUDIGURU_DTW_WINDOW") else None
 
 def normalize(x):
     return (x - x.mean()) / (x.std() + 1e-8)
 
+# Normalized references, built once from the memory-mapped template store
+# (falls back to importing the JSON) on first use and rebuilt when the
+# templates change
+reference_cache = ReferenceCache(STORE_PATH, TEMPLATE_PATH, normalize, lazy=True)
+
 def dtw_dist(a, b):
-    return dtw(a, b, dist=lambda x, y: np.linalg.norm(x - y))[0]
+    return dtw_distance(a, b)
 
 def score_syllable(word_id, syl, clip_path):
-    # User feature
-    user = normalize(extract_features(clip_path))
-
-    # Reference features (all speaker samples)
-    refs = [
-        normalize(np.array(f, dtype=np.float32))
-        for f in templates[word_id][syl]
-    ]
+    return score_features(word_id, syl, extract_features(clip_path))
 
-    # Compare user to EACH reference
-    dists = [dtw_dist(user, r) for r in refs]
+def score_features(word_id, syl, features):
+    # User feature
+    user = normalize(features)
 
-    # Best match
-    best_dist = min(dists)
+    # Reference features (all speaker samples, already normalized)
+    refs = reference_cache.get(word_id, syl)
 
     # --------------------------
     # FIXED THRESHOLD
@@ -41,6 +43,17 @@ def score_syllable(word_id, syl, clip_path):
     # Good range based on your logs: 500–600
     threshold = 700        # <-- TUNE HERE
 
+    if SEARCH_MODE == "pruned":
+        # Same best distance whenever it is under the threshold;
+        # anything at or above it is reported as the threshold
+        best_dist, _ = best_match(user, refs, threshold, window=SEARCH_WINDOW)
+    else:
+        # Compare user to EACH reference
+        dists = [dtw_dist(user, r) for r in refs]
+
+        # Best match
+        best_dist = min(dists)
+
     similarity = 1.0 - min(best_dist / threshold, 1.0)
 
     correct = best_dist < threshold
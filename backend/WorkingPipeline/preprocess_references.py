@@ -1,11 +1,14 @@
 # preprocess_references.py
 
 import os
-import json
+import sys
 from pydub import AudioSegment
 from tqdm import tqdm
 from syllables import WORD_MAP
 from features import extract_features
+# template_store.py is shared by both pipelines and lives in backend/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from template_store import TemplateStore, store_paths
 
 import warnings
 warnings.filterwarnings("ignore")
@@ -46,14 +49,16 @@ for word_id, info in tqdm(WORD_MAP.items(), desc="Words"):
             audio[start:end].export(temp, format="wav")
 
             feat = extract_features(temp)
-            templates[word_id][syl].append(feat.tolist())
+            templates[word_id][syl].append((speaker, feat))
 
             os.remove(temp)
 
 # ----------------------------
 # Save templates
 # ----------------------------
-with open("syllable_templates.json", "w") as f:
-    json.dump(templates, f, indent=2)
+# Binary store is what the server memory-maps; JSON is kept for inspection/import
+store = TemplateStore.from_templates(templates)
+store.save("syllable_templates")
+store.to_json("syllable_templates.json")
 
-print("DONE → syllable_templates.json")
\ No newline at end of file
+print(f"DONE → {' + '.join(store_paths('syllable_templates'))} + syllable_templates.json")
\ No newline at end of file
@@ -0,0 +1,154 @@
+# reference_cache.py
+
+import os
+import time
+import threading
+import numpy as np
+from template_store import load_templates, store_paths, store_exists
+
+# Reads of a template store that changes mid-read before giving up until the next check
+REBUILD_ATTEMPTS = 3
+
+
+class ReferenceCache:
+    """
+    Pre-normalized reference features per (word_id, syllable).
+
+    Built once from the template store (at construction, or on first get()
+    when lazy); each entry keeps all speaker references stacked in one
+    contiguous array, handing out views into it. The cache rebuilds itself
+    when the template file on disk changes.
+    """
+
+    def __init__(self, base_path, json_path, transform, check_interval=2.0, lazy=False):
+        self.base_path = base_path
+        self.json_path = json_path
+        self.transform = transform
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._entries = {}
+        self._signature = None
+        self._last_check = 0.0
+
+        self.store = None
+        self.build_time = 0.0
+        self.builds = 0
+        self.hits = 0
+        self.misses = 0
+
+        if not lazy:
+            self.build()
+
+    def _source_signature(self):
+        if store_exists(self.base_path):
+            paths = store_paths(self.base_path)
+        else:
+            paths = (self.json_path,)
+        return tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+
+    def _load(self):
+        """(store, entries, signature) read from disk, without installing them"""
+        signature = self._source_signature()
+        store = load_templates(self.base_path, self.json_path)
+
+        entries = {}
+        for key in store.keys():
+            refs = [self.transform(r) for r in store.refs(*key)]
+            stacked = np.ascontiguousarray(np.concatenate(refs, axis=0), dtype=np.float32)
+
+            views, offset = [], 0
+            for r in refs:
+                views.append(stacked[offset:offset + len(r)])
+                offset += len(r)
+            entries[key] = (stacked, views)
+
+        return store, entries, signature
+
+    def _install(self, store, entries, signature, start):
+        with self._lock:
+            self.store = store
+            self._entries = entries
+            self._signature = signature
+            self._last_check = time.monotonic()
+            self.build_time = time.perf_counter() - start
+            self.builds += 1
+
+    def build(self):
+        start = time.perf_counter()
+        self._install(*self._load(), start)
+
+    def ensure_built(self):
+        """Build now unless already built; returns the cache"""
+        if self.builds == 0:
+            with self._build_lock:
+                if self.builds == 0:
+                    self.build()
+        return self
+
+    def refresh_if_changed(self):
+        """
+        Rebuild if the template file changed; stat()s at most once per
+        check_interval. One caller rebuilds while the others keep using the
+        current entries, and a failed rebuild keeps them too (it is retried
+        at the next check).
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        try:
+            changed = self._source_signature() != self._signature
+        except OSError:
+            return False
+
+        if not changed or not self._build_lock.acquire(blocking=False):
+            return False
+        try:
+            print("🔄 Syllable templates changed on disk, rebuilding reference cache")
+            # TemplateStore.save() replaces the data file before the index,
+            # so a build overlapping it can read a mismatched pair: only
+            # install one whose files held still while it was read
+            for _ in range(REBUILD_ATTEMPTS):
+                start = time.perf_counter()
+                store, entries, signature = self._load()
+                if self._source_signature() == signature:
+                    self._install(store, entries, signature, start)
+                    return True
+            print("⚠️ Syllable templates kept changing during the rebuild, keeping the previous reference cache")
+        except Exception as e:
+            print(f"⚠️ Could not rebuild reference cache, keeping the previous one: {e}")
+        finally:
+            self._build_lock.release()
+        return False
+
+    def get(self, word_id, syl):
+        """List of normalized (time, melbins) references, one per speaker"""
+        if self.builds == 0:
+            self.ensure_built()
+        self.refresh_if_changed()
+
+        entry = self._entries.get((word_id, syl))
+        if entry is None:
+            self.misses += 1
+            return []
+
+        self.hits += 1
+        return entry[1]
+
+    @property
+    def nbytes(self):
+        return sum(stacked.nbytes for stacked, _ in self._entries.values())
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "references": sum(len(views) for _, views in self._entries.values()),
+            "bytes": self.nbytes,
+            "build_time_s": round(self.build_time, 4),
+            "builds": self.builds,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,62 @@
+# bench_dtw.py
+#
+# Parity check + micro-benchmark for WorkingPipeline.dtw_engine.
+#   cd backend && python -m benchmarks.bench_dtw
+
+import time
+import numpy as np
+from WorkingPipeline.dtw_engine import ENGINES, dtw_distance
+
+# (label, user frames, reference frames, feature dims)
+#   40-mel: one syllable clip at 10 ms hop
+#   13-MFCC: whole utterance at librosa's default 512-sample hop
+CASES = [
+    ("40-mel syllable", 35, 48, 40),
+    ("40-mel long syllable", 80, 95, 40),
+    ("13-MFCC utterance", 90, 110, 13),
+    ("13-MFCC long utterance", 190, 160, 13),
+]
+
+
+def make_pair(rng, n, m, d):
+    # Random walks look more like speech features than white noise
+    a = np.cumsum(rng.standard_normal((n, d)), axis=0).astype(np.float32)
+    b = np.cumsum(rng.standard_normal((m, d)), axis=0).astype(np.float32)
+    return a, b
+
+
+def check_parity(rng, trials=20):
+    print("Parity vs dtw.dtw")
+    for label, n, m, d in CASES:
+        worst = 0.0
+        for _ in range(trials):
+            a, b = make_pair(rng, rng.integers(1, n + 1), rng.integers(1, m + 1), d)
+            expected = dtw_distance(a, b, engine="reference")
+            for name in ENGINES:
+                got = dtw_distance(a, b, engine=name)
+                rel = abs(got - expected) / max(abs(expected), 1e-12)
+                assert rel < 1e-5, f"{name} mismatch on {label}: {got} vs {expected}"
+                worst = max(worst, rel)
+        print(f"  {label:<24} max relative error {worst:.2e}")
+
+
+def bench(rng, repeats=5):
+    print("\nLatency per alignment (ms)")
+    print(f"  {'case':<24}" + "".join(f"{name:>12}" for name in ENGINES))
+    for label, n, m, d in CASES:
+        a, b = make_pair(rng, n, m, d)
+        row = []
+        for name in ENGINES:
+            dtw_distance(a, b, engine=name)  # warm-up / JIT compile
+            runs = 1 if name == "reference" else repeats
+            start = time.perf_counter()
+            for _ in range(runs):
+                dtw_distance(a, b, engine=name)
+            row.append((time.perf_counter() - start) / runs * 1000)
+        print(f"  {label:<24}" + "".join(f"{t:>12.3f}" for t in row))
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    check_parity(rng)
+    bench(rng)
@@ -0,0 +1,61 @@
+# bench_dtw_search.py
+#
+# Exhaustive vs pruned (LB_Kim/LB_Keogh + early abandoning) reference search
+# as the speaker pool grows.
+#   cd backend && python -m benchmarks.bench_dtw_search
+
+import time
+import numpy as np
+from WorkingPipeline.dtw_engine import best_match, dtw_distance, effective_window
+
+THRESHOLD = 700
+POOL_SIZES = [2, 4, 8, 16, 32, 64]
+
+
+def normalize(x):
+    return (x - x.mean()) / (x.std() + 1e-8)
+
+
+def make_speaker(rng, base, noise):
+    # A time-warped, noisy rendition of the same syllable
+    n = int(len(base) * rng.uniform(0.7, 1.4))
+    idx = np.clip(np.round(np.linspace(0, len(base) - 1, n)).astype(int), 0, len(base) - 1)
+    return normalize(base[idx] + noise * rng.standard_normal((n, base.shape[1]))).astype(np.float32)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    base = np.cumsum(rng.standard_normal((45, 40)), axis=0)
+    user = make_speaker(rng, base, 2.0)
+    pool = [make_speaker(rng, base, rng.uniform(1.0, 12.0)) for _ in range(max(POOL_SIZES))]
+
+    best_match(user, pool[:2], THRESHOLD)  # JIT warm-up
+    dtw_distance(user, pool[0])
+
+    print(f"{'refs':>5} {'exhaustive ms':>14} {'pruned ms':>10} {'band=10 ms':>11} "
+          f"{'aligned':>8} {'abandoned':>10} {'pruned':>7} {'same':>5}")
+    for size in POOL_SIZES:
+        refs = pool[:size]
+
+        start = time.perf_counter()
+        exact = min(dtw_distance(user, r) for r in refs)
+        t_exh = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        best, stats = best_match(user, refs, THRESHOLD)
+        t_pruned = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        best_match(user, refs, THRESHOLD, window=10)
+        t_band = (time.perf_counter() - start) * 1000
+
+        same = abs(best - min(exact, THRESHOLD)) < 1e-6 * THRESHOLD
+        print(f"{size:>5} {t_exh:>14.2f} {t_pruned:>10.2f} {t_band:>11.2f} "
+              f"{stats['aligned']:>8} {stats['abandoned']:>10} {stats['pruned']:>7} {str(same):>5}")
+
+    print(f"\nBand half-width 10 frames (widened to |n - m| when needed), "
+          f"e.g. {effective_window(len(user), len(pool[0]), 10)} for the first reference")
+
+
+if __name__ == "__main__":
+    main()
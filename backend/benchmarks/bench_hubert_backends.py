@@ -0,0 +1,203 @@
+# bench_hubert_backends.py
+#
+# HuBERT CPU backends (eager / torchscript / onnx, each fp32 and int8) against
+# the eager fp32 baseline. Each configuration runs in a fresh interpreter
+# (NUDIGURU_HUBERT_BACKEND / _QUANTIZE set), which reports model load time,
+# RSS growth over the load, peak RSS and per-utterance latency in every
+# embedding mode. Agreement is measured per syllable: embedding cosine to the fp32 embedding, the shift in
+# the template similarity score_syllable returns, and how many "correct"
+# decisions flip. Uses the reference recordings in Voices/ (synthetic tones
+# when there are none); scores need the HuBERT syllable templates.
+#   cd backend && python -m benchmarks.bench_hubert_backends [--voices Voices/] [--threads T] [--interop-threads T]
+
+import gc
+import os
+import sys
+import time
+import resource
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+CONFIGS = [
+    ("eager", "none"),
+    ("eager", "int8"),
+    ("torchscript", "none"),
+    ("torchscript", "int8"),
+    ("onnx", "none"),
+    ("onnx", "int8"),
+]
+
+
+def load_utterances(reference_dir):
+    import librosa
+    from HubertPipeline.syllables import WORD_MAP
+    from HubertPipeline.features_hubert import SAMPLE_RATE
+
+    utterances = []
+    if os.path.isdir(reference_dir):
+        for speaker in sorted(os.listdir(reference_dir)):
+            for word_id, info in WORD_MAP.items():
+                wav = os.path.join(reference_dir, speaker, f"{int(word_id[1:])}.wav")
+                if os.path.exists(wav):
+                    y, _ = librosa.load(wav, sr=SAMPLE_RATE)
+                    utterances.append((word_id, y))
+    if utterances:
+        return utterances
+
+    # One voiced-sounding tone burst per syllable of every word
+    rng = np.random.default_rng(0)
+    for word_id, info in WORD_MAP.items():
+        parts = []
+        for _ in info["syllables"]:
+            n = int(rng.uniform(0.2, 0.35) * SAMPLE_RATE)
+            t = np.arange(n) / SAMPLE_RATE
+            f0 = rng.uniform(110, 260)
+            tone = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+            parts.append(0.2 * tone * np.hanning(n) + 0.005 * rng.standard_normal(n))
+        utterances.append((word_id, np.concatenate(parts).astype(np.float32)))
+    return utterances
+
+
+def child(reference_dir, out_path):
+    """One configuration, from the environment; writes its results to out_path (.npz)"""
+    from model_registry import rss_bytes
+    from HubertPipeline.syllables import WORD_MAP
+    from HubertPipeline.features_hubert import SAMPLE_RATE, EMBEDDING_MODES, extract_syllable_embeddings, load_model
+    from HubertPipeline.evaluate_speech import syllable_bounds, get_templates
+    from HubertPipeline.scorer_hubert import score_syllable
+
+    utterances = load_utterances(reference_dir)
+
+    rss = rss_bytes()
+    start = time.perf_counter()
+    load_model()
+    load_s = time.perf_counter() - start
+    gc.collect()
+    rss_mb = (rss_bytes() - rss) / 2 ** 20 if rss is not None else float("nan")
+
+    try:
+        templates = get_templates()
+    except Exception as e:
+        print(f"⚠️ No HuBERT templates ({e}); reporting embedding agreement only", file=sys.stderr)
+        templates = None
+
+    # Warm-up, so lazy initialisation isn't timed
+    word_id, y = utterances[0]
+    for mode in EMBEDDING_MODES:
+        extract_syllable_embeddings(y, syllable_bounds(len(y), SAMPLE_RATE, len(WORD_MAP[word_id]["syllables"])), mode)
+
+    results = {}
+    for mode in EMBEDDING_MODES:
+        times, embs, sims, correct = [], [], [], []
+        for word_id, y in utterances:
+            syllables = WORD_MAP[word_id]["syllables"]
+            bounds = syllable_bounds(len(y), SAMPLE_RATE, len(syllables))
+            t0 = time.perf_counter()
+            mode_embs = extract_syllable_embeddings(y, bounds, mode)
+            times.append(time.perf_counter() - t0)
+            for syl, emb in zip(syllables, mode_embs):
+                embs.append(emb)
+                if templates is not None:
+                    sim, ok = score_syllable(word_id, syl, emb, templates)
+                    sims.append(sim)
+                    correct.append(ok)
+        results[f"{mode}_times"] = np.array(times)
+        results[f"{mode}_embs"] = np.stack(embs)
+        results[f"{mode}_sims"] = np.array(sims, dtype=np.float64)
+        results[f"{mode}_correct"] = np.array(correct, dtype=bool)
+
+    # Whole process, activations and any one-off export/quantization included
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    np.savez(out_path, load_s=load_s, rss_mb=rss_mb, peak_mb=peak_mb, **results)
+
+
+def run(backend, quantize, args, out_path):
+    env = dict(os.environ, NUDIGURU_HUBERT_BACKEND=backend, NUDIGURU_HUBERT_QUANTIZE=quantize)
+    if args.threads:
+        env["NUDIGURU_HUBERT_THREADS"] = str(args.threads)
+    if args.interop_threads:
+        env["NUDIGURU_HUBERT_INTEROP_THREADS"] = str(args.interop_threads)
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_hubert_backends",
+         "--voices", args.voices, "--child", out_path],
+        env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "no output")
+    return dict(np.load(out_path))
+
+
+def agreement(base, result, mode):
+    """Embedding cosine (mean / min), |Δ similarity| (mean / max) and flipped decisions"""
+    a, b = base[f"{mode}_embs"], result[f"{mode}_embs"]
+    nonzero = (np.linalg.norm(a, axis=1) > 0) & (np.linalg.norm(b, axis=1) > 0)
+    cos = np.sum(a[nonzero] * b[nonzero], axis=1)
+    row = {"cos_mean": cos.mean() if len(cos) else np.nan, "cos_min": cos.min() if len(cos) else np.nan}
+    if len(base[f"{mode}_sims"]):
+        shift = np.abs(result[f"{mode}_sims"] - base[f"{mode}_sims"])
+        row.update(shift_mean=shift.mean(), shift_max=shift.max(),
+                   flips=int(np.sum(result[f"{mode}_correct"] != base[f"{mode}_correct"])))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voices", default="Voices/")
+    parser.add_argument("--threads", type=int, default=None, help="intra-op threads (NUDIGURU_HUBERT_THREADS)")
+    parser.add_argument("--interop-threads", type=int, default=None, help="inter-op threads (NUDIGURU_HUBERT_INTEROP_THREADS)")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.voices, args.child)
+        return
+
+    from HubertPipeline.features_hubert import EMBEDDING_MODES
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend, quantize in CONFIGS:
+            name = f"{backend}/{quantize}"
+            try:
+                results[name] = run(backend, quantize, args, os.path.join(tmp, f"{backend}-{quantize}.npz"))
+            except RuntimeError as e:
+                print(f"⚠️ {name} failed: {e}")
+
+    base = results.get("eager/none")
+    if base is None:
+        print("The eager fp32 baseline failed; nothing to compare against")
+        return
+
+    n_utts = len(base["clip_times"])
+    n_syls = len(base["clip_embs"])
+    scored = len(base["clip_sims"]) > 0
+    print(f"{n_utts} utterances, {n_syls} syllables, {args.threads or 'default'} intra-op thread(s)\n")
+
+    print(f"{'backend':<18} {'load s':>7} {'RSS +MB':>8} {'peak MB':>8}   " +
+          "   ".join(f"{mode + ' ms':>10} {'speedup':>7}" for mode in EMBEDDING_MODES))
+    for name, result in results.items():
+        cells = []
+        for mode in EMBEDDING_MODES:
+            t = np.mean(result[f"{mode}_times"])
+            cells.append(f"{t * 1000:>10.1f} {np.mean(base[f'{mode}_times']) / t:>6.2f}x")
+        print(f"{name:<18} {float(result['load_s']):>7.2f} {float(result['rss_mb']):>8.1f} {float(result['peak_mb']):>8.0f}   " + "   ".join(cells))
+
+    print(f"\nAgreement with eager/none per syllable"
+          + ("" if scored else " (no templates: embedding cosine only)"))
+    print(f"{'backend':<18} {'mode':<10} {'cos mean':>9} {'cos min':>9}"
+          + (f" {'|Δsim| mean':>12} {'|Δsim| max':>11} {'flips':>6}" if scored else ""))
+    for name, result in results.items():
+        if name == "eager/none":
+            continue
+        for mode in EMBEDDING_MODES:
+            row = agreement(base, result, mode)
+            line = f"{name:<18} {mode:<10} {row['cos_mean']:>9.5f} {row['cos_min']:>9.5f}"
+            if scored:
+                line += f" {row['shift_mean']:>12.5f} {row['shift_max']:>11.5f} {row['flips']:>3}/{n_syls}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# bench_hubert_batching.py
+#
+# Syllable embeddings per second at increasing client concurrency, with and
+# without the cross-request EmbeddingService, after checking that the
+# service returns the same embedding for every clip as embedding it alone.
+#   cd backend && python -m benchmarks.bench_hubert_batching [clients...]
+
+import sys
+import time
+import threading
+import numpy as np
+import librosa
+from HubertPipeline.features_hubert import SAMPLE_RATE, embed_batch, extract_embedding_from_array
+from HubertPipeline.embedding_service import EmbeddingService
+
+CLIENTS = [int(c) for c in sys.argv[1:]] or [1, 2, 4, 8, 16]
+REQUESTS_PER_CLIENT = 4
+SYLLABLES_PER_REQUEST = 3
+
+
+def make_request(rng):
+    # 150-400 ms syllable-sized clips of noisy tones
+    clips = []
+    for _ in range(SYLLABLES_PER_REQUEST):
+        n = int(rng.uniform(0.15, 0.4) * SAMPLE_RATE)
+        t = np.arange(n) / SAMPLE_RATE
+        clip = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 300) * t) + 0.01 * rng.standard_normal(n)
+        clips.append(clip.astype(np.float32))
+    return clips
+
+
+def run(clients, embed_request):
+    rng = np.random.default_rng(0)
+    requests = [[make_request(rng) for _ in range(REQUESTS_PER_CLIENT)] for _ in range(clients)]
+
+    def client(reqs):
+        for clips in reqs:
+            embed_request(clips)
+
+    threads = [threading.Thread(target=client, args=(r,)) for r in requests]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return clients * REQUESTS_PER_CLIENT * SYLLABLES_PER_REQUEST / elapsed
+
+
+def check_parity(rng, clients=8):
+    """
+    Concurrent requests through the service against clip mode: each request
+    submits already trimmed clips, as extract_syllable_embeddings does, and
+    every embedding must match extract_embedding_from_array on the raw clip
+    whatever else was padded into its forward pass.
+    """
+    requests = [make_request(rng) for _ in range(clients)]
+
+    service = EmbeddingService(embed_batch, max_batch_size=16, max_wait_ms=20)
+    results = [None] * clients
+
+    def client(i):
+        results[i] = service.embed([librosa.effects.trim(c)[0] for c in requests[i]])
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    diffs = [
+        np.abs(emb - extract_embedding_from_array(clip)).max()
+        for clips, embs in zip(requests, results)
+        for clip, emb in zip(clips, embs)
+    ]
+    stats = service.stats()
+    ok = max(diffs) < 1e-5
+    print(f"Parity vs clip mode: {sum(d < 1e-5 for d in diffs)}/{len(diffs)} embeddings identical "
+          f"(max |diff| {max(diffs):.1e}, mean batch {stats['mean_batch_size']:.2f})\n")
+    return ok
+
+
+def main():
+    rng = np.random.default_rng(1)
+    extract_embedding_from_array(make_request(rng)[0])  # warm-up
+    if not check_parity(rng):
+        sys.exit(1)
+
+    print(f"{'clients':>8} {'sequential emb/s':>17} {'batched emb/s':>14} {'mean batch':>11} {'wait p95 ms':>12}")
+    for clients in CLIENTS:
+        sequential = run(clients, lambda clips: [extract_embedding_from_array(c) for c in clips])
+
+        service = EmbeddingService(embed_batch, max_batch_size=16, max_wait_ms=10)
+        batched = run(clients, service.embed)
+        stats = service.stats()
+
+        print(f"{clients:>8} {sequential:>17.1f} {batched:>14.1f} "
+              f"{stats['mean_batch_size']:>11.2f} {stats['queue_wait_ms']['p95']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# bench_hubert_modes.py
+#
+# Latency and agreement of the HuBERT embedding modes (clip / batch /
+# utterance) over the reference recordings in Voices/ (synthetic tones
+# when there are none).
+#   cd backend && python -m benchmarks.bench_hubert_modes [Voices/]
+
+import sys
+import time
+import numpy as np
+from HubertPipeline.syllables import WORD_MAP
+from HubertPipeline.evaluate_speech import syllable_bounds
+from HubertPipeline.features_hubert import SAMPLE_RATE, EMBEDDING_MODES, extract_syllable_embeddings
+from benchmarks.bench_hubert_backends import load_utterances
+
+REFERENCE_DIR = sys.argv[1] if len(sys.argv) > 1 else "Voices/"
+
+
+def main():
+    utterances = [(y, len(WORD_MAP[word_id]["syllables"])) for word_id, y in load_utterances(REFERENCE_DIR)]
+
+    # Warm-up so the first mode measured doesn't pay for lazy initialisation
+    y, n = utterances[0]
+    for mode in EMBEDDING_MODES:
+        extract_syllable_embeddings(y, syllable_bounds(len(y), SAMPLE_RATE, n), mode)
+
+    timings = {mode: [] for mode in EMBEDDING_MODES}
+    embeddings = {mode: [] for mode in EMBEDDING_MODES}
+
+    for y, n in utterances:
+        bounds = syllable_bounds(len(y), SAMPLE_RATE, n)
+        for mode in EMBEDDING_MODES:
+            start = time.perf_counter()
+            embs = extract_syllable_embeddings(y, bounds, mode)
+            timings[mode].append(time.perf_counter() - start)
+            embeddings[mode].extend(embs)
+
+    print(f"{len(utterances)} utterances, {len(embeddings['clip'])} syllables\n")
+    print(f"{'mode':<10} {'mean ms':>9} {'p95 ms':>9} {'speedup':>8} {'cos vs clip (mean / min)':>26} {'max |diff|':>11}")
+
+    base = np.mean(timings["clip"])
+    clip_embs = np.stack(embeddings["clip"])
+    for mode in EMBEDDING_MODES:
+        t = np.array(timings[mode]) * 1000
+        embs = np.stack(embeddings[mode])
+        nonzero = (np.linalg.norm(clip_embs, axis=1) > 0) & (np.linalg.norm(embs, axis=1) > 0)
+        cos = np.sum(clip_embs[nonzero] * embs[nonzero], axis=1)
+        agreement = f"{cos.mean():.6f} / {cos.min():.6f}" if len(cos) else "n/a"
+        print(f"{mode:<10} {t.mean():>9.1f} {np.percentile(t, 95):>9.1f} "
+              f"{base / np.mean(timings[mode]):>7.2f}x {agreement:>26} {np.abs(clip_embs - embs).max():>11.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# bench_model_loading.py
+#
+# Startup cost of the API's models: load time and RSS growth of each
+# component on its own (one fresh interpreter per component, imports
+# included), then all of them loaded one after another and in parallel
+# through ModelRegistry, and how long `import main` takes before uvicorn
+# can accept connections. Components that can't load here (no weights, no
+# network) are reported as failed.
+#   cd backend && python -m benchmarks.bench_model_loading
+
+import sys
+import json
+import subprocess
+
+COMPONENTS = {
+    "working_templates": "WorkingPipeline.mel_dtw:reference_cache.ensure_built",
+    "hubert": "HubertPipeline.features_hubert:load_model",
+    "hubert_templates": "HubertPipeline.evaluate_speech:get_templates",
+    "tts_synthesizer": "TTS_Module:load_synthesizer",
+    "tts_denoiser": "TTS_Module:load_denoiser",
+    "tts": "TTS_Module:get_engine",
+}
+
+# Runs in a fresh interpreter; prints one JSON line
+CHILD = r"""
+import sys, json, time, functools, importlib
+from model_registry import ModelRegistry, rss_bytes
+
+def loader(spec):
+    def load():
+        module, _, attr = spec.partition(":")
+        return functools.reduce(getattr, attr.split("."), importlib.import_module(module))()
+    return load
+
+mode, specs = sys.argv[1], json.loads(sys.argv[2])
+rss = rss_bytes()
+start = time.perf_counter()
+if mode == "import-main":
+    import main
+    result = {}
+else:
+    registry = ModelRegistry()
+    for name, spec in specs.items():
+        registry.register(name, loader(spec))
+    registry.load_all(parallel=mode == "parallel")
+    result = registry.status()
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "rss_mb": (rss_bytes() - rss) / 2 ** 20 if rss is not None else None,
+    "models": result,
+}))
+"""
+
+
+def run(mode, specs):
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, json.dumps(specs)],
+        capture_output=True, text=True
+    )
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "no output")
+    return json.loads(lines[-1])
+
+
+def mb(value):
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def main():
+    print("Each component alone (fresh interpreter, imports included)")
+    print(f"{'component':<18} {'state':<7} {'load s':>7} {'RSS +MB':>8}")
+    loadable = {}
+    for name, spec in COMPONENTS.items():
+        status = run("serial", {name: spec})["models"][name]
+        print(f"{name:<18} {status['state']:<7} {status['load_time_s']:>7.2f} {mb(status['rss_delta_mb']):>8}"
+              + (f"  ({status['error'][:60]})" if "error" in status else ""))
+        if status["state"] == "ready":
+            loadable[name] = spec
+
+    if loadable:
+        print(f"\nAll loadable components ({', '.join(loadable)})")
+        print(f"{'registry':<18} {'wall s':>7} {'RSS +MB':>8}")
+        for mode in ("serial", "parallel"):
+            result = run(mode, loadable)
+            print(f"{mode:<18} {result['seconds']:>7.2f} {mb(result['rss_mb']):>8}")
+
+    result = run("import-main", {})
+    print(f"\nimport main (models load after startup): {result['seconds']:.2f}s, RSS +{mb(result['rss_mb'])} MB")
+
+
+if __name__ == "__main__":
+    main()
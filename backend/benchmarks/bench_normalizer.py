@@ -0,0 +1,116 @@
+# bench_normalizer.py
+#
+# Throughput (chars/sec) of TextNormalizer on a mixed Kannada/English corpus
+# with emails, URLs, prices, phone numbers, dates and percentages, plus a
+# parity check of convert_symbols_to_words against the original
+# key-by-key str.replace loop and URL pattern (kept below). Uses the identity translator,
+# so no network is involved.
+#   cd backend && python -m benchmarks.bench_normalizer [sentences]
+
+import sys
+import time
+import numpy as np
+from src.utils.text import (
+    TextNormalizer, currency_regex, email_regex, phone_regex,
+)
+from src.utils.translator import TranslationTable, get_translator
+
+SENTENCES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+LANG = "kn"
+
+FRAGMENTS = [
+    "ನಮಸ್ತೆ, ನಾನು ಕನ್ನಡ ಕಲಿಯುತ್ತಿದ್ದೇನೆ.",
+    "ಇವತ್ತು ಹವಾಮಾನ ತುಂಬಾ ಚೆನ್ನಾಗಿದೆ",
+    "Please write to support@nudiguru.in for help",
+    "ಹೆಚ್ಚಿನ ಮಾಹಿತಿಗೆ www.nudiguru.com/lessons?id=12 ನೋಡಿ",
+    "ಈ ಪುಸ್ತಕದ ಬೆಲೆ ₹ 1,250.50 ಮಾತ್ರ",
+    "ಕರೆ ಮಾಡಿ +91 98450-12345",
+    "ಪರೀಕ್ಷೆ 12/05/2024 ರಂದು ನಡೆಯುತ್ತದೆ",
+    "ತರಗತಿಯಲ್ಲಿ 85% ವಿದ್ಯಾರ್ಥಿಗಳು ಹಾಜರಿದ್ದರು",
+    "The lesson has 3 parts and takes 20 minutes",
+    "ನೀವು ಹೇಗಿದ್ದೀರಿ?",
+]
+
+# Edge cases for the parity check: matches starting mid-word, back-to-back
+# emails, "com" inside words, symbols that need no rewriting
+EDGE_CASES = [
+    "+www.c70.com..bm72-com5", "welcome to become.com", "x@y.z+x@y.z:a.b.cb7mhttp://x@y.z/",
+    "4_comx@y.z+x@y.za.comwww.", "₹5-.com com 8c=:-", "a-b.c.d e.f.g.h/i?j=k#l", "100%",
+]
+
+# url_regex before the (?<!\w) guard
+LEGACY_URL_PATTERN = r"((?:\w+://)?\w+\.\w+\.\w+/?[\w\.\?=#]*)|(\w*.com/?[\w\.\?=#]*)"
+
+
+def make_corpus(n, rng):
+    return [
+        " ".join(FRAGMENTS[i] for i in rng.choice(len(FRAGMENTS), size=rng.integers(1, 4)))
+        for _ in range(n)
+    ]
+
+
+def legacy_convert_symbols_to_words(normalizer, text, lang):
+    # What convert_symbols_to_words did before the compiled substitution
+    symbols = normalizer.symbols2lang2word.keys()
+    table = normalizer.symbols2lang2word
+    for item in normalizer.find_valid(email_regex.pattern, text) + normalizer.find_valid(LEGACY_URL_PATTERN, text):
+        item_norm = item
+        for symbol in symbols:
+            item_norm = item_norm.replace(symbol, f" {table[symbol][lang]} ")
+        text = text.replace(item, item_norm)
+    for item in normalizer.find_valid(currency_regex.pattern, text):
+        item_norm = item.replace("₹", "") + "₹"
+        for symbol in symbols:
+            item_norm = item_norm.replace(symbol, f" {table[symbol][lang]} ")
+        text = text.replace(item, item_norm)
+    for item in normalizer.find_valid(phone_regex.pattern, text):
+        item_norm = item.replace("-", " ")
+        for symbol in symbols:
+            item_norm = item_norm.replace(symbol, f" {table[symbol][lang]} ")
+        item_norm = normalizer.expand_phones(item_norm)
+        text = text.replace(item, item_norm)
+    return text.replace("%", table["%"][lang])
+
+
+def throughput(fn, corpus):
+    chars = sum(len(t) for t in corpus)
+    start = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return chars / (time.perf_counter() - start)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    corpus = make_corpus(SENTENCES, rng)
+    normalizer = TextNormalizer(
+        translator=get_translator("identity"), translation_table=TranslationTable()
+    )
+
+    mismatches = sum(
+        normalizer.convert_symbols_to_words(t, lang) != legacy_convert_symbols_to_words(normalizer, t, lang)
+        for lang in normalizer.symbols2lang2word["%"]
+        for t in corpus[:200] + EDGE_CASES
+    )
+    print(f"convert_symbols_to_words parity: {'identical' if not mismatches else f'{mismatches} MISMATCHES'}")
+
+    chars = sum(len(t) for t in corpus)
+    print(f"\n{len(corpus)} sentences, {chars} chars ({LANG})")
+    print(f"{'stage':<36} {'chars/sec':>12}")
+    rows = [
+        ("symbols, key-by-key (original)", lambda t: legacy_convert_symbols_to_words(normalizer, t, LANG)),
+        ("symbols, per-language table", lambda t: normalizer.convert_symbols_to_words(t, LANG)),
+        ("normalize_text, uncached", lambda t: normalizer.normalize_text_uncached(t, LANG)),
+        ("normalize_text, LRU warm", lambda t: normalizer.normalize_text(t, LANG)),
+    ]
+    for t in corpus:
+        normalizer.normalize_text(t, LANG)  # fill the LRU for the last row
+    for label, fn in rows:
+        print(f"{label:<36} {throughput(fn, corpus):>12,.0f}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# bench_prefork.py
+#
+# /evaluate throughput and memory of serve.py with 1..N preforked workers.
+# For each worker count: start serve.py on a free port, score a synthetic
+# recording from 2 x workers concurrent clients, then print requests/sec
+# (and scaling against one worker) and the per-process RSS / PSS / shared
+# memory table. Needs the syllable templates; the HuBERT model and TTS
+# checkpoints are used when present. Linux only (/proc).
+#   cd backend && python -m benchmarks.bench_prefork [worker counts...] [--requests N]
+
+import io
+import os
+import sys
+import time
+import socket
+import signal
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import requests
+from scipy.io.wavfile import write as scipy_wav_write
+from serve import memory_table
+from WorkingPipeline.syllables import WORD_MAP
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_RATE = 16000
+
+
+def make_recording(seconds=1.2):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    wav = 0.3 * np.sin(2 * np.pi * 180 * t) * np.clip(np.sin(2 * np.pi * 2.5 * t), 0, None)
+    buf = io.BytesIO()
+    scipy_wav_write(buf, SAMPLE_RATE, (wav * 32767).astype(np.int16))
+    return buf.getvalue()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, port, timeout=600):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(BACKEND_DIR, "serve.py"),
+         "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"serve.py exited with {proc.returncode}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/healthz", timeout=1)
+            return proc
+        except requests.ConnectionError:
+            time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError("serve.py did not start in time")
+
+
+def evaluate(url, audio, lesson_id):
+    response = requests.post(url, files={"audio": ("rec.wav", audio, "audio/wav")},
+                             data={"lesson_id": lesson_id}, timeout=300)
+    return response.status_code
+
+
+def throughput(port, workers, n_requests, audio, lesson_id):
+    url = f"http://127.0.0.1:{port}/evaluate"
+    clients = 2 * workers
+    with ThreadPoolExecutor(clients) as pool:
+        # One request per worker (and some) to get past first-call setup
+        list(pool.map(lambda _: evaluate(url, audio, lesson_id), range(clients)))
+        start = time.perf_counter()
+        codes = list(pool.map(lambda _: evaluate(url, audio, lesson_id), range(n_requests)))
+        elapsed = time.perf_counter() - start
+    failed = sum(code != 200 for code in codes)
+    return n_requests / elapsed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("workers", nargs="*", type=int)
+    parser.add_argument("--requests", type=int, default=40)
+    args = parser.parse_args()
+    cores = os.cpu_count() or 1
+    counts = args.workers or sorted({1, 2, cores // 2, cores} - {0})
+
+    audio = make_recording()
+    lesson_id = next(iter(WORD_MAP))
+    print(f"{cores} cores, {args.requests} /evaluate requests per run (lesson {lesson_id})\n")
+
+    base = None
+    rows = []
+    for workers in counts:
+        port = free_port()
+        proc = start_server(workers, port)
+        try:
+            rate, failed = throughput(port, workers, args.requests, audio, lesson_id)
+            table = memory_table(proc.pid)
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(timeout=60)
+        base = base or rate
+        rows.append((workers, rate, failed))
+        print(f"--- {workers} worker(s): {rate:.2f} req/s ({rate / base:.2f}x one worker), {failed} failed")
+        print(table + "\n")
+
+    print(f"{'workers':>7} {'req/s':>7} {'scaling':>8} {'ideal':>6}")
+    for workers, rate, failed in rows:
+        print(f"{workers:>7} {rate:>7.2f} {rate / rows[0][1]:>7.2f}x {workers / rows[0][0]:>5.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# bench_tempo.py
+#
+# PostProcessor.set_tempo: in-process WSOLA against the ffmpeg atempo
+# subprocess it replaces, at the tempos used for te/mr/gu speakers.
+# Quality: output length, pitch kept (median f0 against the input) and the
+# log-mel distance between the two outputs. Latency: ms per call.
+# Uses a synthetic voiced signal unless a WAV file is given. The ffmpeg
+# columns need ffmpeg-python and an ffmpeg binary on PATH.
+#   cd backend && python -m benchmarks.bench_tempo [speech.wav]
+
+import sys
+import time
+import shutil
+import numpy as np
+import librosa
+from src.postprocessor import PostProcessor
+
+SAMPLE_RATE = 16000
+TEMPOS = ["0.85", "1.15", "1.20"]
+DURATIONS = [1, 5, 20]
+
+
+def make_speech(seconds, rng):
+    # Harmonic "vowels" on a wandering f0 with a syllable-rate envelope,
+    # plus short noise bursts standing in for consonants
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    f0 = 160 + 40 * np.sin(2 * np.pi * 0.7 * t) + 10 * rng.standard_normal(n).cumsum() / np.sqrt(n)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    bursts = rng.standard_normal(n) * (np.sin(2 * np.pi * 4 * t + np.pi) > 0.95)
+    wav = 0.3 * voiced * envelope + 0.05 * bursts
+    return (wav / np.abs(wav).max() * 0.8).astype(np.float32)
+
+
+def median_f0(wav):
+    f0 = librosa.yin(wav, fmin=70, fmax=400, sr=SAMPLE_RATE)
+    return float(np.median(f0))
+
+
+def log_mel(wav):
+    mel = librosa.feature.melspectrogram(y=wav, sr=SAMPLE_RATE, n_mels=40)
+    return librosa.power_to_db(mel + 1e-10)
+
+
+def mel_distance(a, b):
+    a, b = log_mel(a), log_mel(b)
+    frames = min(a.shape[1], b.shape[1])
+    return float(np.mean(np.abs(a[:, :frames] - b[:, :frames])))
+
+
+def timed(fn, wav, tempo, repeats=3):
+    best, out = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn(wav, tempo)
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    post = PostProcessor(SAMPLE_RATE)
+    try:
+        import ffmpeg  # noqa: F401
+        have_ffmpeg = shutil.which("ffmpeg") is not None
+    except ImportError:
+        have_ffmpeg = False
+    if not have_ffmpeg:
+        print("⚠️ ffmpeg not available, reporting WSOLA only\n")
+
+    if len(sys.argv) > 1:
+        speech, _ = librosa.load(sys.argv[1], sr=SAMPLE_RATE)
+        label = sys.argv[1]
+    else:
+        speech = make_speech(5, rng)
+        label = "synthetic speech"
+
+    print(f"Quality on {label} ({len(speech) / SAMPLE_RATE:.1f}s, median f0 {median_f0(speech):.1f} Hz)")
+    print(f"{'tempo':>6} {'expected len':>13} {'wsola len':>10} {'ffmpeg len':>11} "
+          f"{'wsola f0':>9} {'ffmpeg f0':>10} {'log-mel diff dB':>16}")
+    for tempo in TEMPOS:
+        expected = round(len(speech) / float(tempo))
+        ours = post.set_tempo(speech, tempo)
+        row = f"{tempo:>6} {expected:>13} {len(ours):>10}"
+        if have_ffmpeg:
+            ref = post.set_tempo_ffmpeg(speech, tempo)
+            row += f" {len(ref):>11} {median_f0(ours):>9.1f} {median_f0(ref):>10.1f} {mel_distance(ours, ref):>16.2f}"
+        else:
+            row += f" {'-':>11} {median_f0(ours):>9.1f} {'-':>10} {'-':>16}"
+        print(row)
+
+    print(f"\nLatency (best of 3), tempo {TEMPOS[0]}")
+    print(f"{'audio s':>8} {'wsola ms':>9} {'ffmpeg ms':>10} {'speedup':>8}")
+    for seconds in DURATIONS:
+        wav = make_speech(seconds, rng)
+        _, t_ours = timed(post.set_tempo, wav, TEMPOS[0])
+        if have_ffmpeg:
+            _, t_ref = timed(post.set_tempo_ffmpeg, wav, TEMPOS[0])
+            print(f"{seconds:>8} {t_ours * 1000:>9.1f} {t_ref * 1000:>10.1f} {t_ref / t_ours:>7.1f}x")
+        else:
+            print(f"{seconds:>8} {t_ours * 1000:>9.1f} {'-':>10} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# bench_tts_batch.py
+#
+# Multi-sentence /TTS requests through TextToSpeechEngine.infer_from_request:
+# one sentence at a time (batch_size=1) against length-bucketed padded
+# FastPitch/HiFiGAN/denoiser batches. Needs the Kannada checkpoints under
+# kn/ (loaded through TTS_Module).
+#   cd backend && python -m benchmarks.bench_tts_batch [sentence counts...]
+
+import io
+import sys
+import time
+import base64
+from scipy.io.wavfile import read as scipy_wav_read
+from src.models.request import TTSRequest
+from TTS_Module import get_engine
+
+COUNTS = [int(c) for c in sys.argv[1:]] or [1, 4, 8, 16]
+BATCH_SIZE = 8
+SENTENCES = [
+    "ನಮಸ್ತೆ.",
+    "ನಾನು ಕನ್ನಡ ಕಲಿಯುತ್ತಿದ್ದೇನೆ.",
+    "ಇವತ್ತು ಹವಾಮಾನ ತುಂಬಾ ಚೆನ್ನಾಗಿದೆ.",
+    "ನೀವು ಹೇಗಿದ್ದೀರಿ?",
+    "ನನ್ನ ಹೆಸರು ರಾಮು, ನಾನು ಬೆಂಗಳೂರಿನಲ್ಲಿ ವಾಸಿಸುತ್ತೇನೆ.",
+    "ದಯವಿಟ್ಟು ನಿಧಾನವಾಗಿ ಮಾತನಾಡಿ.",
+    "ಈ ಪುಸ್ತಕ ತುಂಬಾ ಆಸಕ್ತಿದಾಯಕವಾಗಿದೆ ಮತ್ತು ನಾನು ಅದನ್ನು ಎರಡು ಬಾರಿ ಓದಿದ್ದೇನೆ.",
+    "ಧನ್ಯವಾದಗಳು.",
+]
+
+
+def make_request(n):
+    return TTSRequest(
+        input=[{"source": SENTENCES[i % len(SENTENCES)]} for i in range(n)],
+        config={"language": {"sourceLanguage": "kn"}, "gender": "female"},
+    )
+
+
+def decode(response):
+    return [
+        scipy_wav_read(io.BytesIO(base64.b64decode(audio.audioContent)))[1]
+        for audio in response.audio
+    ]
+
+
+def run(request, batch_size):
+    engine = get_engine()
+    engine.batch_size = batch_size
+    start = time.perf_counter()
+    response = engine.infer_from_request(request)
+    return decode(response), time.perf_counter() - start
+
+
+def main():
+    # Warm up both paths (first calls pay for allocator/JIT setup)
+    run(make_request(2), 1)
+    run(make_request(2), BATCH_SIZE)
+
+    print(f"{'sentences':>9} {'sequential s/s':>15} {'batched s/s':>12} {'speedup':>8} {'max len diff':>13}")
+    for n in COUNTS:
+        request = make_request(n)
+        seq, t_seq = run(request, 1)
+        bat, t_bat = run(request, BATCH_SIZE)
+        assert len(seq) == len(bat) == n
+        len_diff = max(abs(len(a) - len(b)) for a, b in zip(seq, bat))
+        print(f"{n:>9} {n / t_seq:>15.2f} {n / t_bat:>12.2f} {t_seq / t_bat:>7.1f}x {len_diff:>13}")
+
+
+if __name__ == "__main__":
+    main()
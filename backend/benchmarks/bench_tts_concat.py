@@ -0,0 +1,70 @@
+# bench_tts_concat.py
+#
+# Assembly of per-paragraph TTS audio for multi-paragraph Kannada input:
+# the old incremental np.concatenate (copies the whole buffer per chunk)
+# against join_chunks (one allocation). Chunks are synthetic audio sized
+# like real synthesis output (~80 ms per character at 16 kHz), so no TTS
+# model is needed.
+#   cd backend && python -m benchmarks.bench_tts_concat [paragraph counts...]
+
+import sys
+import time
+import tracemalloc
+import numpy as np
+from src.utils.audio import join_chunks
+
+SAMPLE_RATE = 16000
+SAMPLES_PER_CHAR = int(0.08 * SAMPLE_RATE)
+PARAGRAPH = "ನಮಸ್ತೆ, ನಾನು ಕನ್ನಡ ಕಲಿಯುತ್ತಿದ್ದೇನೆ. ಇವತ್ತು ಹವಾಮಾನ ತುಂಬಾ ಚೆನ್ನಾಗಿದೆ. ನೀವು ಹೇಗಿದ್ದೀರಿ?"
+COUNTS = [int(c) for c in sys.argv[1:]] or [10, 50, 100, 200, 400]
+
+
+def make_chunks(n, rng):
+    return [
+        (0.1 * rng.standard_normal(len(PARAGRAPH) * SAMPLES_PER_CHAR)).astype(np.float32)
+        for _ in range(n)
+    ]
+
+
+def incremental(chunks):
+    # What TextToSpeechEngine.concatenate_chunks did once per paragraph
+    wav = None
+    for chunk in chunks:
+        wav = chunk if wav is None else np.concatenate([wav, chunk])
+    return wav
+
+
+def measure(fn, chunks):
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = fn(chunks)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'paragraphs':>10} {'audio s':>8} {'incremental ms':>15} {'join ms':>8} "
+          f"{'speedup':>8} {'incr. peak MB':>14} {'join peak MB':>13}")
+
+    for n in COUNTS:
+        chunks = make_chunks(n, rng)
+        old, t_old, peak_old = measure(incremental, chunks)
+        new, t_new, peak_new = measure(lambda c: join_chunks(c, SAMPLE_RATE), chunks)
+        assert np.array_equal(old, new)
+
+        seconds = len(new) / SAMPLE_RATE
+        print(f"{n:>10} {seconds:>8.0f} {t_old * 1000:>15.1f} {t_new * 1000:>8.1f} "
+              f"{t_old / t_new:>7.1f}x {peak_old / 2**20:>14.1f} {peak_new / 2**20:>13.1f}")
+
+    # Crossfading / silence padding only add per-boundary work
+    chunks = make_chunks(COUNTS[-1], rng)
+    for label, kwargs in (("gap 120 ms", {"gap_ms": 120}), ("crossfade 20 ms", {"crossfade_ms": 20})):
+        _, elapsed, peak = measure(lambda c: join_chunks(c, SAMPLE_RATE, **kwargs), chunks)
+        print(f"{COUNTS[-1]} paragraphs, {label}: {elapsed * 1000:.1f} ms, peak {peak / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
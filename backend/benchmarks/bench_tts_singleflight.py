@@ -0,0 +1,86 @@
+# bench_tts_singleflight.py
+#
+# Burst load on the TTS cache: several worker processes, each with many
+# threads, request the same few texts at once. With single-flight every
+# key is synthesized exactly once. A stand-in synthesizer that sleeps
+# replaces the real TTS model.
+#   cd backend && python -m benchmarks.bench_tts_singleflight [processes] [threads] [keys]
+
+import os
+import sys
+import time
+import tempfile
+import threading
+import multiprocessing
+from collections import Counter
+import numpy as np
+from tts_cache import TTSCache
+
+PROCESSES = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+THREADS = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+KEYS = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+SYNTHESIS_SECONDS = 0.5
+
+
+def worker(root, log_path, barrier, results):
+    def synthesize(text, speaker_name):
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(text + "\n")
+        time.sleep(SYNTHESIS_SECONDS)
+        return np.zeros(16000, dtype=np.float32), 16000
+
+    cache = TTSCache(root, synthesize, version="bench")
+    texts = [f"ಪದ {i}" for i in range(KEYS)]
+    latencies = []
+
+    def request(i):
+        start = time.perf_counter()
+        cache.get(texts[i % KEYS], "female")
+        latencies.append(time.perf_counter() - start)
+
+    barrier.wait()
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    results.put((max(latencies), stats["syntheses"], stats["coalesced"], stats["shared_from_other_workers"]))
+
+
+def main():
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as root:
+        log_path = os.path.join(root, "syntheses.log")
+        barrier = ctx.Barrier(PROCESSES)
+        results = ctx.Queue()
+
+        procs = [ctx.Process(target=worker, args=(root, log_path, barrier, results)) for _ in range(PROCESSES)]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        rows = [results.get() for _ in procs]
+        with open(log_path, encoding="utf-8") as f:
+            per_key = Counter(line.strip() for line in f)
+
+    requests = PROCESSES * THREADS
+    print(f"{requests} requests ({PROCESSES} processes x {THREADS} threads) for {KEYS} keys "
+          f"in {elapsed:.2f}s, synthesis takes {SYNTHESIS_SECONDS}s\n")
+    print(f"{'process':>8} {'max latency s':>14} {'synthesized':>12} {'coalesced':>10} {'from others':>12}")
+    for i, (latency, synth, coalesced, shared) in enumerate(rows):
+        print(f"{i:>8} {latency:>14.2f} {synth:>12} {coalesced:>10} {shared:>12}")
+
+    print(f"\nsyntheses per key: {dict(per_key)}")
+    ok = len(per_key) == KEYS and all(n == 1 for n in per_key.values())
+    print("✅ one synthesis per key" if ok else "❌ duplicate syntheses")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
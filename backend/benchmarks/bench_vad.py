@@ -0,0 +1,168 @@
+# bench_vad.py
+#
+# Parity check + benchmark for the vectorized VoiceActivityDetection against
+# the original streaming implementation (kept below as the reference; it
+# grows its buffers with numpy.append, so it is quadratic in clip length).
+# Both run on a fresh instance per clip.
+#   cd backend && python -m benchmarks.bench_vad [clip seconds...]
+
+import sys
+import time
+import threading
+import numpy as np
+from src.postprocessor.vad import VoiceActivityDetection
+
+SAMPLE_RATE = 16000
+SC_THRESHOLD = 40  # what PostProcessor.trim_silence uses
+DURATIONS = [float(s) for s in sys.argv[1:]] or [1, 5, 15, 30, 60]
+
+
+class LegacyVoiceActivityDetection:
+
+    def __init__(self):
+        self.__step = 160
+        self.__buffer_size = 160
+        self.__buffer = np.array([],dtype=np.int16)
+        self.__out_buffer = np.array([],dtype=np.int16)
+        self.__n = 0
+        self.__VADthd = 0.
+        self.__VADn = 0.
+        self.__silence_counter = 0
+
+    # Voice Activity Detection
+    # Adaptive threshold
+    def vad(self, _frame, sc_threshold=20):
+        frame = np.array(_frame) ** 2.
+        result = True
+        threshold = 0.2
+        thd = np.min(frame) + np.ptp(frame) * threshold
+        self.__VADthd = (self.__VADn * self.__VADthd + thd) / float(self.__VADn + 1.)
+        self.__VADn += 1.
+
+        if np.mean(frame) <= self.__VADthd:
+            self.__silence_counter += 1
+        else:
+            self.__silence_counter = 0
+        if self.__silence_counter > sc_threshold:
+            result = False
+        return result
+
+    # Push new audio samples into the buffer.
+    def add_samples(self, data):
+        self.__buffer = np.append(self.__buffer, data)
+        result = len(self.__buffer) >= self.__buffer_size
+        # print('__buffer size %i'%self.__buffer.size)
+        return result
+
+    # Pull a portion of the buffer to process
+    # (pulled samples are deleted after being
+    # processed
+    def get_frame(self):
+        window = self.__buffer[:self.__buffer_size]
+        self.__buffer = self.__buffer[self.__step:]
+        # print('__buffer size %i'%self.__buffer.size)
+        return window
+
+    # Adds new audio samples to the internal
+    # buffer and process them
+    def process(self, data, sc_threshold):
+        self.__buffer = np.array([],dtype=np.int16)
+        self.__out_buffer = np.array([],dtype=np.int16)
+        if self.add_samples(data):
+            while len(self.__buffer) >= self.__buffer_size:
+                # Framing
+                window = self.get_frame()
+                if self.vad(window, sc_threshold):  # speech frame
+                    self.__out_buffer = np.append(self.__out_buffer, window)
+        return self.__out_buffer
+
+
+def make_clip(seconds, rng, dtype=np.float32):
+    # Syllable-rate bursts of tone separated by pauses of varying length
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * rng.uniform(0.3, 1.5) * t) > rng.uniform(-0.5, 0.5)).astype(np.float64)
+    wav = envelope * 0.4 * np.sin(2 * np.pi * 180 * t) + 0.003 * rng.standard_normal(n)
+    if np.issubdtype(dtype, np.integer):
+        return (wav * 20000).astype(dtype)
+    return wav.astype(dtype)
+
+
+def constant_clips():
+    # Every frame's energy ties its running threshold: constant and DC input,
+    # where the threshold's rounding alone decides what is kept
+    clips = []
+    for dtype, scale in ((np.float32, 1.0), (np.float64, 1.0), (np.int16, 20000)):
+        for value in np.linspace(-0.9, 0.9, 12):
+            for seconds in (0.5, 3):
+                clips.append(np.full(int(seconds * SAMPLE_RATE), value * scale, dtype=dtype))
+        t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+        clips.append((scale * (0.2 + 0.01 * np.sin(2 * np.pi * 180 * t))).astype(dtype))
+    return clips
+
+
+def check_parity(rng, trials=200):
+    vad = VoiceActivityDetection()
+    clips = [make_clip(rng.uniform(0.005, 8), rng, (np.float32, np.float64, np.int16)[i % 3]) for i in range(trials)]
+    clips += constant_clips()
+    mismatches = 0
+    for clip in clips:
+        expected = LegacyVoiceActivityDetection().process(clip, SC_THRESHOLD)
+        got = vad.process(clip, SC_THRESHOLD)
+        if got.dtype != expected.dtype or not np.array_equal(got, expected):
+            mismatches += 1
+    print(f"Parity vs the original implementation: {len(clips) - mismatches}/{len(clips)} clips identical "
+          f"({trials} speech-like, {len(clips) - trials} constant / DC)")
+    return mismatches == 0
+
+
+def check_threads(rng, threads=8):
+    # One shared instance, as in PostProcessor, used from several threads
+    vad = VoiceActivityDetection()
+    clips = [make_clip(rng.uniform(1, 5), rng) for _ in range(threads)]
+    expected = [vad.process(c, SC_THRESHOLD) for c in clips]
+    results = [None] * threads
+
+    def work(i):
+        for _ in range(20):
+            results[i] = vad.process(clips[i], SC_THRESHOLD)
+            if not np.array_equal(results[i], expected[i]):
+                return
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    ok = all(np.array_equal(r, e) for r, e in zip(results, expected))
+    print(f"Shared instance across {threads} threads: {'identical' if ok else 'DIFFERENT'} output")
+    return ok
+
+
+def main():
+    rng = np.random.default_rng(0)
+    ok = check_parity(rng)
+    ok = check_threads(rng) and ok
+
+    print(f"\n{'clip s':>7} {'original ms':>12} {'vectorized ms':>14} {'speedup':>8}")
+    vad = VoiceActivityDetection()
+    for seconds in DURATIONS:
+        clip = make_clip(seconds, rng)
+        start = time.perf_counter()
+        LegacyVoiceActivityDetection().process(clip, SC_THRESHOLD)
+        t_old = time.perf_counter() - start
+        t_new = min(_timed(vad.process, clip) for _ in range(5))
+        print(f"{seconds:>7.0f} {t_old * 1000:>12.1f} {t_new * 1000:>14.2f} {t_old / t_new:>7.0f}x")
+
+    if not ok:
+        sys.exit(1)
+
+
+def _timed(fn, clip):
+    start = time.perf_counter()
+    fn(clip, SC_THRESHOLD)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
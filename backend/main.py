@@ -1,20 +1,28 @@
 # backend/main.py
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse, FileResponse, JSONResponse
 import os
-import shutil
-import io
 import numpy as np
-from scipy.io.wavfile import write as scipy_wav_write
 import traceback
 from typing import Dict
 import uuid
+import struct
+import threading
+import asyncio
+import anyio
+from request_audio import RequestAudio
+from scoring_pool import Overloaded, pool_from_env, timed
+from orchestrator import ScoringOrchestrator, detailed_results, battle_score
+from reference_features import ReferenceMFCCCache
+from tts_cache import TTSCache
+from model_registry import ModelRegistry, memory_rollup
 
 # Import both pipelines
 try:
-    from WorkingPipeline.evaluate_speech import evaluate as evaluate_working
+    from WorkingPipeline.evaluate_speech import evaluate_waveform as evaluate_working
     from WorkingPipeline.syllables import WORD_MAP
+    from WorkingPipeline.mel_dtw import reference_cache
     WORKING_PIPELINE_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️ WorkingPipeline not available: {e}")
@@ -22,28 +30,26 @@ except ImportError as e:
     WORD_MAP = {}
 
 try:
-    from HubertPipeline.evaluate_speech import evaluate as evaluate_hubert
+    from HubertPipeline.evaluate_speech import evaluate_waveform as evaluate_hubert
+    from HubertPipeline.evaluate_speech import EMBEDDING_MODE as HUBERT_EMBEDDING_MODE
+    from HubertPipeline.evaluate_speech import embedding_service
+    from HubertPipeline.evaluate_speech import get_templates as load_hubert_templates
+    from HubertPipeline.features_hubert import load_model as load_hubert
     HUBERT_PIPELINE_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️ HubertPipeline not available: {e}")
     HUBERT_PIPELINE_AVAILABLE = False
 
-# ===========================
-# TTS Setup
-# ===========================
-TTS_AVAILABLE = False
-synthesizer = None
 # ===========================
 # TTS Setup - USING YOUR WORKING CODE
 # ===========================
 TTS_AVAILABLE = False
-tts_engine = None
 TTS_SAMPLE_RATE = 16000
 
 try:
-    from TTS_Module import generate_kannada_audio
+    from TTS_Module import generate_kannada_audio, load_synthesizer, load_denoiser, get_engine
     TTS_AVAILABLE = True
-    print("✅ TTS Engine Loaded Successfully")
+    print("✅ TTS Engine available (models load after startup)")
 except ImportError as e:
     print(f"⚠️ TTS not available: {e}")
     traceback.print_exc()
@@ -62,11 +68,84 @@ app.add_middleware(
     expose_headers=["Content-Disposition", "Content-Length", "Content-Type"]
 )
 
+# Blocking scoring work runs here, off the event loop
+scoring_pool = pool_from_env()
+
+# Models and templates load after startup, in parallel background threads
+# ("background"), or before the server accepts connections ("eager").
+# Endpoints that don't need them answer meanwhile; those that do wait for
+# the load in progress. /readyz reports per-model state and load time.
+MODEL_LOADING = os.environ.get("NUDIGURU_MODEL_LOADING", "background")
+if MODEL_LOADING not in ("background", "eager"):
+    raise ValueError(f"Unknown NUDIGURU_MODEL_LOADING '{MODEL_LOADING}', expected 'background' or 'eager'")
+
+models = ModelRegistry()
+if WORKING_PIPELINE_AVAILABLE:
+    models.register("working_templates", reference_cache.ensure_built)
+if HUBERT_PIPELINE_AVAILABLE:
+    models.register("hubert", load_hubert)
+    models.register("hubert_templates", load_hubert_templates)
+if TTS_AVAILABLE:
+    models.register("tts_synthesizer", load_synthesizer)
+    models.register("tts_denoiser", load_denoiser)
+    models.register("tts", get_engine)
+
+@app.on_event("startup")
+def prewarm_scoring_pool():
+    # Worker processes load templates and JIT kernels before the first request
+    if WORKING_PIPELINE_AVAILABLE:
+        scoring_pool.prewarm(
+            "WorkingPipeline.evaluate_speech",
+            "WorkingPipeline.mel_dtw:reference_cache.ensure_built"
+        )
+
+@app.on_event("startup")
+def load_models():
+    if MODEL_LOADING == "eager":
+        models.load_all()
+    else:
+        models.start()
+
+@app.on_event("shutdown")
+def shutdown_scoring_pool():
+    scoring_pool.shutdown()
+    models.shutdown()
+    tts_cache.flush()
+
 UPLOAD_DIR = "temp_uploads"
 TTS_CACHE_DIR = "tts_cache"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(TTS_CACHE_DIR, exist_ok=True)
 
+# Synthesized audio shared by /evaluate and the /tts endpoints; lesson
+# references are pinned so eviction only ever drops arbitrary texts
+REFERENCE_SPEAKER = "female"
+MAX_TTS_TEXT_LENGTH = 500
+tts_cache = TTSCache(
+    os.path.join(TTS_CACHE_DIR, "audio"),
+    synthesize=generate_kannada_audio if TTS_AVAILABLE else None,
+    max_bytes=int(float(os.environ.get("NUDIGURU_TTS_CACHE_MAX_MB", "512")) * 1024 * 1024)
+)
+for _lesson in WORD_MAP.values():
+    tts_cache.pin(_lesson["text"], REFERENCE_SPEAKER)
+
+# MFCCs of the expected audio, persisted next to the TTS cache
+reference_mfcc_cache = ReferenceMFCCCache(os.path.join(TTS_CACHE_DIR, "mfcc"))
+
+def warm_references():
+    if TTS_AVAILABLE and os.environ.get("NUDIGURU_PREWARM_TTS", "0") == "1":
+        tts_cache.prewarm(
+            [w["text"] for w in WORD_MAP.values()],
+            REFERENCE_SPEAKER,
+            workers=int(os.environ.get("NUDIGURU_PREWARM_WORKERS", "2"))
+        )
+    reference_mfcc_cache.warm([tts_cache.path(w["text"], REFERENCE_SPEAKER) for w in WORD_MAP.values()])
+
+@app.on_event("startup")
+def start_reference_warmup():
+    # In the background: requests arriving first simply synthesize/compute on demand
+    threading.Thread(target=warm_references, daemon=True).start()
+
 # ===========================
 # UTILITY FUNCTIONS
 # ===========================
@@ -85,6 +164,76 @@ def normalize_audio(wav_array):
     
     return wav_array
 
+def streaming_wav_header(sample_rate, channels=1, bits=16):
+    """PCM WAV header with unknown length (0xFFFFFFFF sizes), for chunked streaming"""
+    block_align = channels * bits // 8
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, bits)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+def to_pcm16(wav_array):
+    """Float audio in [-1, 1] as little-endian 16-bit PCM bytes"""
+    wav_array = np.clip(np.asarray(wav_array, dtype=np.float32), -1.0, 1.0)
+    return (wav_array * 32767).astype("<i2").tobytes()
+
+def run_hubert(user_audio, lesson_id):
+    """HuBERT scoring, reusing whole-utterance frames in utterance mode"""
+    frames = user_audio.hubert_frames if HUBERT_EMBEDDING_MODE == "utterance" else None
+    return evaluate_hubert(user_audio.waveform, user_audio.sr, lesson_id, frames=frames)
+
+async def scoring_slot():
+    """Admission control for the scoring endpoints (503 + Retry-After when saturated)"""
+    try:
+        async with scoring_pool.admit():
+            yield
+    except Overloaded as e:
+        print(f"🚦 {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+def compare_audio(user_audio, reference_path, threshold=17500):
+    """Compare the user's recording to a reference file using MFCC DTW distance"""
+    from WorkingPipeline.dtw_engine import dtw_distance
+
+    # MFCC features: the user's are memoized on the request, the
+    # reference's are cached across requests
+    mfcc1 = user_audio.mfcc
+    mfcc2 = reference_mfcc_cache.get(reference_path)
+
+    # Run DTW
+    dist = dtw_distance(mfcc1.T, mfcc2.T)
+
+    print(f"DTW Distance: {dist}")
+
+    # Decide similar or different
+    if dist < threshold:
+        print("✅ The two spoken words are SIMILAR")
+        return dist, True
+    elif dist < threshold + 3000:
+        print("⚠️ The two spoken words are SOMEWHAT SIMILAR")
+        return dist, True
+    else:
+        print("❌ The two spoken words are DIFFERENT")
+        return dist, False
+
+# Gate and pipelines of a request run on the scoring pool: gate alongside
+# mel-DTW, HuBERT once the gate passes ("parallel"), or gate first with
+# confidence bands ("tiered")
+orchestrator = ScoringOrchestrator(
+    scoring_pool,
+    gate=compare_audio,
+    working=evaluate_working if WORKING_PIPELINE_AVAILABLE else None,
+    hubert=run_hubert if HUBERT_PIPELINE_AVAILABLE else None,
+    mode=os.environ.get("NUDIGURU_SCORING_MODE", "parallel"),
+    pass_distance=float(os.environ.get("NUDIGURU_GATE_PASS_DISTANCE", "17500")),
+    reject_distance=float(os.environ.get("NUDIGURU_GATE_REJECT_DISTANCE", "20500"))
+)
+
 # ===========================
 # ENDPOINTS
 # ===========================
@@ -96,9 +245,41 @@ def root():
         "working_pipeline": WORKING_PIPELINE_AVAILABLE,
         "hubert_pipeline": HUBERT_PIPELINE_AVAILABLE,
         "tts": TTS_AVAILABLE,
+        "models_ready": models.ready(),
         "lessons": len(WORD_MAP)
     }
 
+@app.get("/healthz")
+def healthz():
+    """Liveness: the process is up and answering"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readyz():
+    """Readiness: 200 once every model has loaded, 503 until then (or if one failed)"""
+    ready = models.ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "loading": MODEL_LOADING, "models": models.status()}
+    )
+
+@app.get("/stats")
+def get_stats():
+    """Internal cache/pipeline counters"""
+    stats = {}
+    if WORKING_PIPELINE_AVAILABLE:
+        stats["reference_cache"] = reference_cache.stats()
+    if HUBERT_PIPELINE_AVAILABLE and embedding_service is not None:
+        stats["embedding_service"] = embedding_service.stats()
+    stats["scoring_pool"] = scoring_pool.stats()
+    stats["orchestrator"] = orchestrator.stats()
+    stats["reference_mfcc"] = reference_mfcc_cache.stats()
+    stats["models"] = models.status()
+    # This worker's memory; under serve.py, "shared" covers the models
+    # inherited from the parent
+    stats["memory"] = {"pid": os.getpid(), **(memory_rollup() or {})}
+    return stats
+
 @app.get("/lessons")
 def get_lessons():
     if not WORKING_PIPELINE_AVAILABLE:
@@ -121,7 +302,8 @@ def get_lessons():
 @app.post("/evaluate")
 async def evaluate_pronunciation(
     audio: UploadFile = File(...),
-    lesson_id: str = Form(...)
+    lesson_id: str = Form(...),
+    _slot: None = Depends(scoring_slot)
 ):
     print(f"🎯 Evaluating lesson: {lesson_id}")
     
@@ -131,189 +313,64 @@ async def evaluate_pronunciation(
     if not audio.filename.endswith('.wav'):
         raise HTTPException(status_code=400, detail="Only WAV files accepted")
     
-    temp_path = os.path.abspath(os.path.join(UPLOAD_DIR, f"{lesson_id}_{audio.filename}"))
     expected = WORD_MAP[lesson_id]["text"]
-    expected_audio_path = os.path.abspath(os.path.join(UPLOAD_DIR, f"{lesson_id}_expected.wav"))
+    timings = {}
 
     try:
-        # Save uploaded file
-        with open(temp_path, "wb") as f:
-            content = await audio.read()
-            f.write(content)
+        # Decode the upload once, in memory; every stage below shares it
+        content = await audio.read()
+        with timed(timings, "decode"):
+            user_audio = await scoring_pool.run_torch(RequestAudio.from_bytes, content)
         
         # ---------------------------------------
-        # LIBROSA DISTANCE CHECK (First Priority)
+        # Reference audio for the distance gate
         # ---------------------------------------
         try:
-            import librosa
-            import numpy as np
-            from dtw import dtw
-
-            def compare_audio(file1, file2, threshold=17500):
-                """Compare two audio files using DTW distance"""
-                # Load both audio files
-                y1, sr1 = librosa.load(file1, sr=16000)
-                y2, sr2 = librosa.load(file2, sr=16000)
-
-                # Extract MFCC features
-                mfcc1 = librosa.feature.mfcc(y=y1, sr=sr1, n_mfcc=13)
-                mfcc2 = librosa.feature.mfcc(y=y2, sr=sr2, n_mfcc=13)
-
-                # Run DTW
-                dist, cost, acc, path = dtw(mfcc1.T, mfcc2.T, dist=lambda x, y: np.linalg.norm(x - y))
-
-                print(f"DTW Distance: {dist}")
-
-                # Decide similar or different
-                if dist < threshold:
-                    print("✅ The two spoken words are SIMILAR")
-                    return dist, True
-                elif dist < threshold + 3000:
-                    print("⚠️ The two spoken words are SOMEWHAT SIMILAR")
-                    return dist, True
-                else:
-                    print("❌ The two spoken words are DIFFERENT")
-                    return dist, False
-
-            # Generate expected audio if missing
-            if not os.path.exists(expected_audio_path):
-                print(f"🔊 Expected audio missing, generating: {expected_audio_path}")
-                if TTS_AVAILABLE:
-                    try:
-                        from TTS_Module import generate_kannada_audio
-                        audio_array, sample_rate = generate_kannada_audio(
-                            text=expected,
-                            speaker_name="female"
-                        )
-                        from scipy.io.wavfile import write as scipy_wav_write
-                        scipy_wav_write(expected_audio_path, sample_rate, audio_array)
-                        print(f"✅ Generated expected audio: {expected_audio_path}")
-                    except Exception as gen_error:
-                        print(f"⚠️ Could not generate expected audio: {gen_error}")
-                else:
-                    # Check cache directory
-                    cache_path = os.path.join(TTS_CACHE_DIR, f"{lesson_id}.wav")
-                    if os.path.exists(cache_path):
-                        import shutil
-                        shutil.copy(cache_path, expected_audio_path)
-                        print(f"📋 Copied from cache: {cache_path} -> {expected_audio_path}")
-
-            # Perform distance check
-            if os.path.exists(expected_audio_path):
-                distance, is_similar = compare_audio(temp_path, expected_audio_path)
-                
-                # If distance > 17500, reject immediately
-                if not is_similar:
-                    print(f"🚫 Distance check failed: {distance} > 17500")
-                    return {
-                        "accuracy_score": 0,
-                        "syllables": [{"text": s, "accuracy": 0} for s in WORD_MAP[lesson_id]["syllables"]],
-                        "areas_to_improve": [
-                            f"Pronunciation doesn't match '{expected}'",
-                            "The words are too different",
-                            "Listen to reference and try again"
-                        ],
-                        "reference_audio_url": f"/tts/generate/{lesson_id}",
-                        "stt_rejected": True,
-                        "reason": "high_distance",
-                        "distance": distance
-                    }
-                
-                print(f"✅ Distance check passed: {distance} <= 4750")
-            else:
-                print(f"⚠️ Expected audio still not available, skipping distance check")
-                
-        except ImportError as e:
-            print(f"⚠️ librosa or dtw not available: {e}")
+            with timed(timings, "reference"):
+                expected_audio_path = await scoring_pool.run_torch(
+                    tts_cache.get, expected, REFERENCE_SPEAKER
+                )
         except Exception as e:
-            print(f"⚠️ Distance check error (continuing): {e}")
+            print(f"⚠️ Expected audio not available, skipping distance check: {e}")
+            expected_audio_path = None
 
         # ---------------------------------------
-        # Continue with existing pipeline logic
+        # Distance gate + both pipelines, concurrently
         # ---------------------------------------
-        results = {}
-
-        # Run Working Pipeline
-        if WORKING_PIPELINE_AVAILABLE:
-            try:
-                working_results = evaluate_working(temp_path, lesson_id)
-                similarities = [r["similarity"] for r in working_results]
-                working_accuracy = int(sum(similarities) / len(similarities) * 100)
-                
-                print(f"✅ Working Pipeline: {working_accuracy}%")
-                
-                results["working_pipeline"] = {
-                    "accuracy": min(working_accuracy * 5, 100),  # Cap at 100
-                    "syllables": [
-                        {
-                            "text": r["syllable"],
-                            "accuracy": int(r["similarity"] * 100),
-                            "distance": r.get("distance", 0)
-                        }
-                        for r in working_results
-                    ]
-                }
-            except Exception as e:
-                print(f"❌ Working Pipeline error: {e}")
-                results["working_pipeline"] = {"error": str(e)}
-        
-        # Run HuBERT Pipeline
-        if HUBERT_PIPELINE_AVAILABLE:
-            try:
-                hubert_results = evaluate_hubert(temp_path, lesson_id)
-                similarities = [r["similarity"] for r in hubert_results]
-                hubert_accuracy = int(sum(similarities) / len(similarities) * 100)
-                
-                print(f"✅ HuBERT Pipeline: {hubert_accuracy}%")
-                
-                results["hubert_pipeline"] = {
-                    "accuracy": hubert_accuracy,
-                    "syllables": [
-                        {
-                            "text": r["syllable"],
-                            "accuracy": int(r["similarity"] * 100),
-                            "correct": r.get("correct", False)
-                        }
-                        for r in hubert_results
-                    ]
+        outcome, timings = await orchestrator.evaluate(
+            user_audio, lesson_id, expected_audio_path, timings=timings
+        )
+
+        gate = outcome.get("gate")
+        if isinstance(gate, Exception):
+            print(f"⚠️ Distance check error (continuing): {gate}")
+        elif gate is not None:
+            distance, is_similar = gate
+
+            # If the gate rejected, no pipeline ran; answer immediately
+            if outcome["tier"] == "rejected":
+                print(f"🚫 Distance check failed: {distance}")
+                return {
+                    "accuracy_score": 0,
+                    "syllables": [{"text": s, "accuracy": 0} for s in WORD_MAP[lesson_id]["syllables"]],
+                    "areas_to_improve": [
+                        f"Pronunciation doesn't match '{expected}'",
+                        "The words are too different",
+                        "Listen to reference and try again"
+                    ],
+                    "reference_audio_url": f"/tts/generate/{lesson_id}",
+                    "stt_rejected": True,
+                    "reason": "high_distance",
+                    "distance": distance,
+                    "tier": outcome["tier"]
                 }
-            except Exception as e:
-                print(f"❌ HuBERT Pipeline error: {e}")
-                results["hubert_pipeline"] = {"error": str(e)}
-        
-        # Combine results
-        if "working_pipeline" in results and "hubert_pipeline" in results:
-            avg_accuracy = min(
-                (results["working_pipeline"]["accuracy"] + results["hubert_pipeline"]["accuracy"]) // 2,
-                100
-            )
-            
-            combined_syllables = []
-            for i, syl in enumerate(WORD_MAP[lesson_id]["syllables"]):
-                wp_acc = results["working_pipeline"]["syllables"][i]["accuracy"]
-                hp_acc = results["hubert_pipeline"]["syllables"][i]["accuracy"]
-                
-                combined_syllables.append({
-                    "text": syl,
-                    "accuracy": (wp_acc + hp_acc) // 2
-                })
-            
-            results["combined"] = {
-                "accuracy_score": avg_accuracy,
-                "syllables": combined_syllables
-            }
-        elif "working_pipeline" in results:
-            results["combined"] = {
-                "accuracy_score": results["working_pipeline"]["accuracy"],
-                "syllables": results["working_pipeline"]["syllables"]
-            }
-        elif "hubert_pipeline" in results:
-            results["combined"] = {
-                "accuracy_score": results["hubert_pipeline"]["accuracy"],
-                "syllables": results["hubert_pipeline"]["syllables"]
-            }
-        else:
+
+            print(f"✅ Distance check passed: {distance} (tier: {outcome['tier']})")
+
+        results = detailed_results(outcome, WORD_MAP[lesson_id]["syllables"])
+        if "combined" not in results:
             raise HTTPException(status_code=503, detail="No pipeline available")
+        results["timings"] = timings
         
         # Generate improvement tips
         weak_syllables = [
@@ -332,61 +389,36 @@ async def evaluate_pronunciation(
             "syllables": results["combined"]["syllables"],
             "areas_to_improve": tips,
             "reference_audio_url": f"/tts/generate/{lesson_id}",
+            "tier": outcome["tier"],
             "detailed_results": results
         }
     
     except Exception as e:
         print(f"❌ Error: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
-    
     finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        scoring_pool.record(f"evaluate {lesson_id}", timings)
 
-@app.get("/tts/generate/{word_id}")
-async def generate_tts_audio(word_id: str):
-    """Generate TTS audio using YOUR working TTS engine"""
-    if word_id not in WORD_MAP:
-        raise HTTPException(status_code=404, detail="Lesson not found")
-    
-    kannada_text = WORD_MAP[word_id]["text"]
-    cache_path = os.path.join(TTS_CACHE_DIR, f"{word_id}.wav")
-    
-    # Check cache first
-    if os.path.exists(cache_path):
-        print(f"✅ Serving cached TTS: {cache_path}")
-        return FileResponse(
-            cache_path,
-            media_type="audio/wav",
-            headers={
-                "Cache-Control": "public, max-age=3600",
-                "Accept-Ranges": "bytes"
-            }
-        )
-    
-    # Check TTS availability
-    if not TTS_AVAILABLE:
+async def serve_tts(text: str, speaker: str = REFERENCE_SPEAKER):
+    """FileResponse for text from the TTS cache, synthesized on first use"""
+    # Check TTS availability (cached audio can be served without it)
+    if not TTS_AVAILABLE and not os.path.exists(tts_cache.path(text, speaker)):
         print("❌ TTS not available")
         raise HTTPException(status_code=503, detail="TTS not available")
     
     try:
-        from TTS_Module import generate_kannada_audio
-        
-        print(f"🎤 Generating TTS for: '{kannada_text}' (lesson {word_id})")
-        
-        # Generate audio using YOUR working function
-        audio_array, sample_rate = generate_kannada_audio(
-            text=kannada_text,
-            speaker_name="female"  # or "male"
-        )
-        
-        # Save to cache
-        scipy_wav_write(cache_path, sample_rate, audio_array)
-        print(f"💾 Cached to: {cache_path}")
+        cache_path = await scoring_pool.run_torch(tts_cache.get, text, speaker)
+        try:
+            stat = os.stat(cache_path)
+        except FileNotFoundError:
+            # Evicted (by another worker) since the lookup: fetch it once more
+            cache_path = await scoring_pool.run_torch(tts_cache.get, text, speaker)
+            stat = os.stat(cache_path)
+        print(f"✅ Serving TTS: {cache_path}")
         
-        # Return file
         return FileResponse(
             cache_path,
+            stat_result=stat,
             media_type="audio/wav",
             headers={
                 "Cache-Control": "public, max-age=3600",
@@ -397,6 +429,89 @@ async def generate_tts_audio(word_id: str):
     except Exception as e:
         print(f"❌ TTS Error: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
+
+@app.get("/tts/generate/{word_id}")
+async def generate_tts_audio(word_id: str):
+    """Generate TTS audio using YOUR working TTS engine"""
+    if word_id not in WORD_MAP:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    
+    return await serve_tts(WORD_MAP[word_id]["text"])
+
+def check_tts_text(text: str):
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Text is empty")
+    if len(text) > MAX_TTS_TEXT_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Text longer than {MAX_TTS_TEXT_LENGTH} characters")
+
+@app.get("/tts/text")
+async def generate_tts_text(text: str, speaker: str = REFERENCE_SPEAKER):
+    """TTS audio for arbitrary Kannada text (cached like the lesson audio)"""
+    check_tts_text(text)
+    return await serve_tts(text, speaker)
+
+@app.get("/tts/stream")
+async def stream_tts_text(
+    text: str,
+    speaker: str = REFERENCE_SPEAKER,
+    _slot: None = Depends(scoring_slot)
+):
+    """
+    TTS audio for arbitrary text, streamed as 16-bit PCM WAV paragraph by
+    paragraph while it is synthesized. Cached audio is served whole.
+    """
+    check_tts_text(text)
+    
+    cache_path = tts_cache.path(text, speaker)
+    if os.path.exists(cache_path):
+        return await serve_tts(text, speaker)
+    
+    if not TTS_AVAILABLE:
+        print("❌ TTS not available")
+        raise HTTPException(status_code=503, detail="TTS not available")
+    
+    from TTS_Module import stream_kannada_audio, join_kannada_audio
+    
+    # One task on the scoring pool runs the synthesis through the cache, so
+    # concurrent requests for the same text share it and the finished audio
+    # is cached for later /tts/text and /tts/stream calls. It holds its pool
+    # thread throughout, as tts_cache.get does, and hands chunks over here.
+    loop = asyncio.get_running_loop()
+    chunks = asyncio.Queue()
+    stop = threading.Event()
+    
+    def synthesize():
+        stream = tts_cache.stream(text, speaker, stream_kannada_audio, TTS_SAMPLE_RATE, join=join_kannada_audio)
+        try:
+            for chunk in stream:
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+        finally:
+            # Closed early (client gone): nothing is cached
+            stream.close()
+            loop.call_soon_threadsafe(chunks.put_nowait, None)
+    
+    async def wav_chunks():
+        synthesis = asyncio.ensure_future(scoring_pool.run_torch(synthesize))
+        try:
+            yield streaming_wav_header(TTS_SAMPLE_RATE)
+            while (chunk := await chunks.get()) is not None:
+                yield to_pcm16(chunk)
+            await synthesis
+        finally:
+            # Client gone or done: stop at the next paragraph and wait for
+            # it (shielded from the disconnect's cancellation), so the
+            # synthesis never outlives the request's admission slot
+            stop.set()
+            with anyio.CancelScope(shield=True):
+                await asyncio.gather(synthesis, return_exceptions=True)
+    
+    return StreamingResponse(
+        wav_chunks(),
+        media_type="audio/wav",
+        headers={"Cache-Control": "no-store"}
+    )
     
 @app.get("/user/stats")
 def get_user_stats():
@@ -411,11 +526,13 @@ def get_user_stats():
 
 @app.get("/tts/status")
 def tts_status():
+    synthesizer = load_synthesizer() if models.ready("tts_synthesizer") else None
     status = {
         "available": TTS_AVAILABLE,
         "synthesizer_loaded": synthesizer is not None,
-        "cache_dir": TTS_CACHE_DIR,
-        "cached_files": len(os.listdir(TTS_CACHE_DIR)) if os.path.exists(TTS_CACHE_DIR) else 0
+        "cache_dir": tts_cache.root,
+        "cached_files": len(tts_cache),
+        "cache": tts_cache.stats()
     }
     
     if synthesizer and hasattr(synthesizer.tts_model, 'speaker_manager'):
@@ -469,7 +586,8 @@ async def get_battle_room(room_code: str):
 async def score_battle_audio(
     audio: UploadFile = File(...),
     room_code: str = Form(...),
-    player_id: str = Form(...)
+    player_id: str = Form(...),
+    _slot: None = Depends(scoring_slot)
 ):
     """Score a player's pronunciation in battle"""
     
@@ -480,48 +598,17 @@ async def score_battle_audio(
     lesson_id = room["lesson_id"]
     
     print(f"⚔️ Scoring battle for room {room_code}, player {player_id}")
-    
-    # Save audio temporarily
-    temp_path = os.path.join(UPLOAD_DIR, f"battle_{room_code}_{player_id}.wav")
+    timings = {}
     
     try:
-        with open(temp_path, "wb") as f:
-            shutil.copyfileobj(audio.file, f)
-        
-        # Use existing evaluation pipeline
-        results = {}
-        
-        # Working Pipeline
-        if WORKING_PIPELINE_AVAILABLE:
-            try:
-                working_results = evaluate_working(temp_path, lesson_id)
-                similarities = [r["similarity"] for r in working_results]
-                working_accuracy = int(sum(similarities) / len(similarities) * 100)
-                results["working"] = working_accuracy
-            except Exception as e:
-                print(f"❌ Working pipeline error: {e}")
-                results["working"] = 0
+        # Decode the upload once, in memory
+        content = await audio.read()
+        with timed(timings, "decode"):
+            user_audio = await scoring_pool.run_torch(RequestAudio.from_bytes, content)
         
-        # HuBERT Pipeline
-        if HUBERT_PIPELINE_AVAILABLE:
-            try:
-                hubert_results = evaluate_hubert(temp_path, lesson_id)
-                similarities = [r["similarity"] for r in hubert_results]
-                hubert_accuracy = int(sum(similarities) / len(similarities) * 100)
-                results["hubert"] = hubert_accuracy
-            except Exception as e:
-                print(f"❌ HuBERT pipeline error: {e}")
-                results["hubert"] = 0
-        
-        # Combined score
-        if "working" in results and "hubert" in results:
-            final_score = (results["working"] + results["hubert"]) // 2
-        elif "working" in results:
-            final_score = results["working"]
-        elif "hubert" in results:
-            final_score = results["hubert"]
-        else:
-            final_score = 0
+        # Both pipelines, concurrently
+        outcome, timings = await orchestrator.evaluate(user_audio, lesson_id, timings=timings)
+        final_score = battle_score(outcome)
         
         # Store in room
         room["players"][player_id] = {
@@ -554,6 +641,8 @@ async def score_battle_audio(
     
     except Exception as e:
         print(f"❌ Error: {traceback.format_exc()}")
+    finally:
+        scoring_pool.record(f"battle {room_code}/{player_id}", timings)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,182 @@
+# backend/model_registry.py
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+def rss_bytes():
+    """Resident set size of this process, or None where it can't be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+def memory_rollup(pid="self"):
+    """
+    Memory of a process in MB from /proc/<pid>/smaps_rollup (Linux 4.14+):
+    rss, pss (shared pages split between the processes sharing them),
+    shared (pages other processes also map, e.g. models inherited over
+    fork) and private. None where it can't be read.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[key] = int(value.split()[0]) / 1024
+    except (OSError, ValueError):
+        return None
+    return {
+        "rss_mb": round(fields.get("Rss", 0), 1),
+        "pss_mb": round(fields.get("Pss", 0), 1),
+        "shared_mb": round(fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0), 1),
+        "private_mb": round(fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0), 1),
+    }
+
+
+class _Model:
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.state = "pending"      # pending | loading | ready | failed
+        self.value = None
+        self.error = None
+        self.load_time = None
+        self.rss_delta = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Named models, each loaded once by its loader.
+
+    A model loads on its first get(), or ahead of time in the background
+    with start(), which runs every pending loader on a thread pool so that
+    slow loads (weights from disk, torch/transformers imports) overlap.
+    Callers that get() a model while it is loading wait for that load
+    rather than starting another. A failed load is retried by the next get().
+
+    Load time and the growth of process RSS during the load are recorded per
+    model. Loads that overlap share their RSS growth; load_all(parallel=False)
+    loads one at a time when the per-model numbers need to be exact.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        """loader() -> model; called at most once unless it raises"""
+        if name in self._models:
+            raise ValueError(f"Model '{name}' is already registered")
+        self._models[name] = _Model(name, loader)
+
+    def __contains__(self, name):
+        return name in self._models
+
+    def names(self):
+        return list(self._models)
+
+    # ----------------------------------------
+    # Loading
+    # ----------------------------------------
+    def get(self, name):
+        """The model, loading it (or waiting for a load in progress) if needed"""
+        model = self._models[name]
+        if model.state == "ready":
+            return model.value
+
+        with model.lock:
+            if model.state == "ready":
+                return model.value
+
+            model.state = "loading"
+            rss_before = rss_bytes()
+            start = time.perf_counter()
+            try:
+                value = model.loader()
+            except Exception as e:
+                model.state, model.error = "failed", e
+                raise
+            finally:
+                model.load_time = time.perf_counter() - start
+                rss_after = rss_bytes()
+                if rss_before is not None and rss_after is not None:
+                    model.rss_delta = rss_after - rss_before
+
+            model.value, model.error = value, None
+            model.state = "ready"
+            print(f"✅ {name} loaded in {model.load_time:.2f}s")
+            return value
+
+    def _load_quietly(self, name):
+        try:
+            self.get(name)
+        except Exception as e:
+            print(f"⚠️ {name} failed to load: {e}")
+
+    def start(self, names=None, workers=None):
+        """Load the given (default: all pending) models in background threads; returns their futures"""
+        names = [n for n in (names or self._models) if self._models[n].state == "pending"]
+        if not names:
+            return []
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers or len(self._models), thread_name_prefix="model-load"
+                )
+        return [self._executor.submit(self._load_quietly, name) for name in names]
+
+    def load_all(self, parallel=True, workers=None):
+        """Load every pending model before returning; failures are reported by status()"""
+        if parallel:
+            wait(self.start(workers=workers))
+        else:
+            for name, model in self._models.items():
+                if model.state == "pending":
+                    self._load_quietly(name)
+        # Loads started elsewhere (an earlier start(), a request) finish too
+        for model in self._models.values():
+            with model.lock:
+                pass
+
+    # ----------------------------------------
+    # Readiness
+    # ----------------------------------------
+    def ready(self, name=None):
+        """Whether the named model (default: every model) has loaded"""
+        if name is not None:
+            return name in self._models and self._models[name].state == "ready"
+        return all(m.state == "ready" for m in self._models.values())
+
+    def failed(self, name):
+        return name in self._models and self._models[name].state == "failed"
+
+    def status(self):
+        """Per-model state, load time and RSS growth during the load"""
+        status = {}
+        for name, m in self._models.items():
+            status[name] = {
+                "state": m.state,
+                "load_time_s": round(m.load_time, 3) if m.load_time is not None else None,
+                "rss_delta_mb": round(m.rss_delta / 2 ** 20, 1) if m.rss_delta is not None else None,
+            }
+            if m.error is not None:
+                status[name]["error"] = str(m.error)
+        return status
+
+    def shutdown(self, wait=False):
+        """Stop the loader threads (wait=True before forking, so none are left mid-flight)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,284 @@
+# backend/orchestrator.py
+import time
+import asyncio
+from collections import Counter
+
+
+SCORING_MODES = ("parallel", "tiered")
+
+
+class ScoringOrchestrator:
+    """
+    Runs the stages of one scoring request on the scoring pool.
+
+    The MFCC distance gate, the Working (mel-DTW) pipeline and the HuBERT
+    pipeline only depend on the decoded audio. In "parallel" mode the gate
+    and the cheap mel-DTW pipeline start together, and HuBERT starts as
+    soon as the gate passes (straight away when there is no gate), so a
+    passing request takes about gate + HuBERT. As before, a rejected
+    request never runs HuBERT: its mel-DTW work is dropped if still queued
+    in the pool, or waited for if already running (work on the pool can't
+    be stopped), so the request keeps its admission slot until it is done.
+
+    In "tiered" mode the gate runs first and its distance picks the tier:
+        rejected    distance >= reject_distance: no pipeline runs
+        pass        distance < pass_distance: only the mel-DTW pipeline runs
+        borderline  anything in between: both pipelines run
+        ungated     no gate result (no reference audio, gate error): both run
+
+    Stage callables (None when unavailable):
+        gate(user_audio, reference_path) -> (distance, is_similar)   thread pool
+        working(waveform, sr, lesson_id) -> per-syllable results     CPU pool
+        hubert(user_audio, lesson_id) -> per-syllable results        thread pool
+    """
+
+    def __init__(self, pool, gate=None, working=None, hubert=None,
+                 mode="parallel", pass_distance=17500, reject_distance=20500):
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{mode}', expected one of {SCORING_MODES}")
+
+        self.pool = pool
+        self.gate = gate
+        self.working = working
+        self.hubert = hubert
+        self.mode = mode
+        self.pass_distance = pass_distance
+        self.reject_distance = reject_distance
+
+        self.tiers = Counter()
+        self.skipped = Counter()
+
+    async def _stage(self, name, timings, run, fn, *args):
+        # Stage errors are returned, not raised, so one stage can't sink the others
+        start = time.perf_counter()
+        try:
+            value = await run(fn, *args)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ {name} stage error: {e}")
+            value = e
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+        return value
+
+    def _gate_stage(self, user_audio, reference_path, timings):
+        if self.gate is None or reference_path is None:
+            return None
+        return self._stage("gate", timings, self.pool.run_torch, self.gate, user_audio, reference_path)
+
+    def _pipeline_stages(self, user_audio, lesson_id, timings):
+        stages = {}
+        if self.working is not None:
+            stages["working"] = self._stage(
+                "working", timings, self.pool.run_cpu, self.working, user_audio.waveform, user_audio.sr, lesson_id
+            )
+        if self.hubert is not None:
+            stages["hubert"] = self._stage("hubert", timings, self.pool.run_torch, self.hubert, user_audio, lesson_id)
+        return stages
+
+    def tier(self, gate):
+        """
+        Tier of a request given its gate result (tiered mode). Only the
+        distance counts: the gate's own is_similar verdict uses a fixed
+        threshold, which would override a reject_distance set above it.
+        """
+        if not isinstance(gate, tuple):
+            return "ungated"
+        distance, _ = gate
+        if distance >= self.reject_distance:
+            return "rejected"
+        if distance < self.pass_distance:
+            return "pass"
+        return "borderline"
+
+    async def evaluate(self, user_audio, lesson_id, reference_path=None, timings=None):
+        """
+        Run the stages for one request; returns (outcome, timings).
+
+        outcome maps each stage that ran to its result (or the exception it
+        raised), plus "tier". The gate result is (distance, is_similar).
+        A "rejected" outcome has no pipeline results.
+        """
+        timings = {} if timings is None else timings
+        start = time.perf_counter()
+
+        if self.mode == "tiered":
+            outcome = await self._evaluate_tiered(user_audio, lesson_id, reference_path, timings)
+        else:
+            outcome = await self._evaluate_parallel(user_audio, lesson_id, reference_path, timings)
+
+        self.tiers[outcome["tier"]] += 1
+        for stage in ("working", "hubert"):
+            if getattr(self, stage) is not None and stage not in outcome:
+                self.skipped[stage] += 1
+
+        timings["stages_total"] = round((time.perf_counter() - start) * 1000, 2)
+        return outcome, timings
+
+    async def _evaluate_parallel(self, user_audio, lesson_id, reference_path, timings):
+        gate = self._gate_stage(user_audio, reference_path, timings)
+        stages = self._pipeline_stages(user_audio, lesson_id, timings)
+        hubert = stages.pop("hubert", None) if gate is not None else None
+        tasks = {name: asyncio.ensure_future(coro) for name, coro in stages.items()}
+
+        outcome = {"tier": "full"}
+        if gate is not None:
+            try:
+                outcome["gate"] = await gate
+            except asyncio.CancelledError:
+                if hubert is not None:
+                    hubert.close()
+                raise
+
+            if gate_rejected(outcome["gate"]):
+                if hubert is not None:
+                    hubert.close()
+                # Drops queued mel-DTW work; running work is waited for
+                # (see ScoringPool._result)
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+                outcome["tier"] = "rejected"
+                return outcome
+
+            if hubert is not None:
+                tasks["hubert"] = asyncio.ensure_future(hubert)
+
+        values = await asyncio.gather(*tasks.values())
+        outcome.update(zip(tasks, values))
+        return outcome
+
+    async def _evaluate_tiered(self, user_audio, lesson_id, reference_path, timings):
+        outcome = {}
+        gate = self._gate_stage(user_audio, reference_path, timings)
+        if gate is not None:
+            outcome["gate"] = await gate
+
+        outcome["tier"] = self.tier(outcome.get("gate"))
+        if outcome["tier"] == "rejected":
+            return outcome
+
+        stages = self._pipeline_stages(user_audio, lesson_id, timings)
+        if outcome["tier"] == "pass" and len(stages) > 1:
+            # Clear pass: the cheaper mel-DTW pipeline alone decides the score
+            stages.pop("hubert").close()
+
+        values = await asyncio.gather(*stages.values())
+        outcome.update(zip(stages, values))
+        return outcome
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "pass_distance": self.pass_distance,
+            "reject_distance": self.reject_distance,
+            "tiers": dict(self.tiers),
+            "skipped_stages": dict(self.skipped)
+        }
+
+
+def gate_rejected(gate):
+    """True when the distance gate ran and judged the words different"""
+    return isinstance(gate, tuple) and not gate[1]
+
+
+def mean_accuracy(results):
+    similarities = [r["similarity"] for r in results]
+    return int(sum(similarities) / len(similarities) * 100)
+
+
+# ----------------------------------------
+# Combining pipeline results
+# ----------------------------------------
+def detailed_results(outcome, syllables):
+    """The /evaluate `detailed_results` dict: per-pipeline results plus their combination"""
+    results = {}
+
+    working = outcome.get("working")
+    if isinstance(working, Exception):
+        results["working_pipeline"] = {"error": str(working)}
+    elif working is not None:
+        working_accuracy = mean_accuracy(working)
+        print(f"✅ Working Pipeline: {working_accuracy}%")
+        results["working_pipeline"] = {
+            "accuracy": min(working_accuracy * 5, 100),  # Cap at 100
+            "syllables": [
+                {
+                    "text": r["syllable"],
+                    "accuracy": int(r["similarity"] * 100),
+                    "distance": r.get("distance", 0)
+                }
+                for r in working
+            ]
+        }
+
+    hubert = outcome.get("hubert")
+    if isinstance(hubert, Exception):
+        results["hubert_pipeline"] = {"error": str(hubert)}
+    elif hubert is not None:
+        hubert_accuracy = mean_accuracy(hubert)
+        print(f"✅ HuBERT Pipeline: {hubert_accuracy}%")
+        results["hubert_pipeline"] = {
+            "accuracy": hubert_accuracy,
+            "syllables": [
+                {
+                    "text": r["syllable"],
+                    "accuracy": int(r["similarity"] * 100),
+                    "correct": r.get("correct", False)
+                }
+                for r in hubert
+            ]
+        }
+
+    combined = combine(results, syllables)
+    if combined is not None:
+        results["combined"] = combined
+    return results
+
+
+def combine(results, syllables):
+    """Average the two pipelines (or take the one that ran); None if neither did"""
+    if "working_pipeline" in results and "hubert_pipeline" in results:
+        avg_accuracy = min(
+            (results["working_pipeline"]["accuracy"] + results["hubert_pipeline"]["accuracy"]) // 2,
+            100
+        )
+
+        combined_syllables = []
+        for i, syl in enumerate(syllables):
+            wp_acc = results["working_pipeline"]["syllables"][i]["accuracy"]
+            hp_acc = results["hubert_pipeline"]["syllables"][i]["accuracy"]
+
+            combined_syllables.append({
+                "text": syl,
+                "accuracy": (wp_acc + hp_acc) // 2
+            })
+
+        return {
+            "accuracy_score": avg_accuracy,
+            "syllables": combined_syllables
+        }
+    elif "working_pipeline" in results:
+        return {
+            "accuracy_score": results["working_pipeline"]["accuracy"],
+            "syllables": results["working_pipeline"]["syllables"]
+        }
+    elif "hubert_pipeline" in results:
+        return {
+            "accuracy_score": results["hubert_pipeline"]["accuracy"],
+            "syllables": results["hubert_pipeline"]["syllables"]
+        }
+    return None
+
+
+def battle_score(outcome):
+    """Battle score: mean of the raw pipeline accuracies; a failed pipeline counts as 0"""
+    scores = []
+    for stage in ("working", "hubert"):
+        if stage in outcome:
+            result = outcome[stage]
+            scores.append(0 if isinstance(result, Exception) else mean_accuracy(result))
+
+    if len(scores) == 2:
+        return (scores[0] + scores[1]) // 2
+    return scores[0] if scores else 0
@@ -0,0 +1,106 @@
+# backend/reference_features.py
+import os
+import threading
+import numpy as np
+import librosa
+
+SAMPLE_RATE = 16000
+N_MFCC = 13
+
+
+def reference_mfcc(path, sr=SAMPLE_RATE, n_mfcc=N_MFCC):
+    """(n_mfcc, frames) MFCC matrix of a reference recording"""
+    y, sr = librosa.load(path, sr=sr)
+    return librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
+
+
+class ReferenceMFCCCache:
+    """
+    MFCC matrices of the expected (reference) audio, computed once per file.
+
+    Matrices are memoized in-process and persisted as .npz files under
+    cache_dir, each tagged with the mtime/size of the audio it came from;
+    a cached matrix is recomputed as soon as its audio file changes.
+    """
+
+    def __init__(self, cache_dir, sr=SAMPLE_RATE, n_mfcc=N_MFCC):
+        self.cache_dir = cache_dir
+        self.sr = sr
+        self.n_mfcc = n_mfcc
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._memo = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_loads = 0
+        self.computes = 0
+
+    def _cache_path(self, audio_path):
+        name = os.path.splitext(os.path.basename(audio_path))[0]
+        return os.path.join(self.cache_dir, f"{name}.mfcc.npz")
+
+    def _signature(self, audio_path):
+        st = os.stat(audio_path)
+        return np.array([st.st_mtime_ns, st.st_size, self.sr, self.n_mfcc], dtype=np.int64)
+
+    def _load(self, cache_path, signature):
+        try:
+            with np.load(cache_path) as data:
+                if np.array_equal(data["signature"], signature):
+                    return data["mfcc"]
+        except (OSError, KeyError, ValueError):
+            pass
+        return None
+
+    def _save(self, cache_path, signature, mfcc):
+        # Unique per process and thread: preforked workers warm the same
+        # references at startup
+        tmp = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, signature=signature, mfcc=mfcc)
+        os.replace(tmp, cache_path)
+
+    def get(self, audio_path):
+        """MFCC matrix of audio_path, from memory, disk, or computed and stored"""
+        audio_path = os.path.abspath(audio_path)
+        signature = self._signature(audio_path)
+
+        with self._lock:
+            lock = self._locks.setdefault(audio_path, threading.Lock())
+
+        with lock:
+            cached = self._memo.get(audio_path)
+            if cached is not None and np.array_equal(cached[0], signature):
+                self.hits += 1
+                return cached[1]
+
+            cache_path = self._cache_path(audio_path)
+            mfcc = self._load(cache_path, signature)
+            if mfcc is not None:
+                self.disk_loads += 1
+            else:
+                mfcc = reference_mfcc(audio_path, self.sr, self.n_mfcc)
+                self._save(cache_path, signature, mfcc)
+                self.computes += 1
+
+            self._memo[audio_path] = (signature, mfcc)
+            return mfcc
+
+    def warm(self, audio_paths):
+        """Fill the cache for every existing file in audio_paths"""
+        for path in audio_paths:
+            if os.path.exists(path):
+                try:
+                    self.get(path)
+                except Exception as e:
+                    print(f"⚠️ Could not precompute reference MFCCs for {path}: {e}")
+
+    def stats(self):
+        return {
+            "entries": len(self._memo),
+            "hits": self.hits,
+            "disk_loads": self.disk_loads,
+            "computes": self.computes
+        }
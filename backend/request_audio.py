@@ -0,0 +1,66 @@
+# backend/request_audio.py
+import io
+import threading
+import numpy as np
+import librosa
+
+SAMPLE_RATE = 16000
+
+
+class RequestAudio:
+    """
+    One uploaded recording, decoded and resampled to 16 kHz exactly once.
+
+    Derived products (trimmed signal, MFCCs, log-mel, HuBERT frames) are
+    computed lazily on first access and memoized, so every scoring stage of
+    a request shares them. Safe to use from several threads at once.
+    """
+
+    def __init__(self, waveform: np.ndarray, sr: int = SAMPLE_RATE):
+        self.waveform = np.asarray(waveform, dtype=np.float32)
+        self.sr = sr
+        self._memo = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """Decode upload bytes in memory (no temp file)"""
+        y, sr = librosa.load(io.BytesIO(data), sr=SAMPLE_RATE)
+        return cls(y, sr)
+
+    def _get(self, key, compute):
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
+
+    @property
+    def duration(self) -> float:
+        return len(self.waveform) / self.sr
+
+    @property
+    def trimmed(self) -> np.ndarray:
+        return self._get("trimmed", lambda: librosa.effects.trim(self.waveform)[0])
+
+    @property
+    def mfcc(self) -> np.ndarray:
+        """(13, frames) MFCC matrix used by the whole-utterance distance gate"""
+        return self._get(
+            "mfcc",
+            lambda: librosa.feature.mfcc(y=self.waveform, sr=self.sr, n_mfcc=13)
+        )
+
+    @property
+    def logmel(self) -> np.ndarray:
+        """(frames, 40) WorkingPipeline log-mel features of the whole utterance"""
+        from WorkingPipeline.features import extract_features_from_array
+        return self._get("logmel", lambda: extract_features_from_array(self.waveform, self.sr))
+
+    @property
+    def hubert_frames(self) -> np.ndarray:
+        """(frames, 768) HuBERT hidden states of the whole utterance, 20 ms per frame"""
+        from HubertPipeline.features_hubert import extract_frames
+        return self._get("hubert_frames", lambda: extract_frames(self.waveform, self.sr))
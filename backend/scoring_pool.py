@@ -0,0 +1,225 @@
+# backend/scoring_pool.py
+import os
+import time
+import asyncio
+import functools
+import importlib
+import threading
+import multiprocessing
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+
+def _import_modules(modules):
+    # "package.module" imports it; "package.module:obj.method" also calls it
+    for name in modules:
+        module_name, _, call = name.partition(":")
+        target = importlib.import_module(module_name)
+        if call:
+            functools.reduce(getattr, call.split("."), target)()
+
+
+class Overloaded(Exception):
+    """Raised by ScoringPool.admit() when the wait queue is full"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Scoring pool overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@contextmanager
+def timed(timings, stage):
+    """Record the wall time of a block in timings[stage] (milliseconds)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round((time.perf_counter() - start) * 1000, 2)
+
+
+class ScoringPool:
+    """
+    Runs blocking scoring work off the asyncio event loop.
+
+    CPU-bound DTW work goes to a process pool (or a thread pool when
+    cpu_executor="thread"); torch and librosa work goes to a thread pool,
+    since both release the GIL. Executors are created lazily, and again
+    after a fork, so a pool built at import time survives preforking.
+
+    admit() bounds how many requests score at once: up to max_in_flight run,
+    up to max_queue more wait, and anything beyond that is rejected with
+    Overloaded so the endpoint can answer 503 instead of piling up work.
+    """
+
+    def __init__(self, max_in_flight=4, max_queue=8, cpu_workers=None, torch_workers=2,
+                 cpu_executor="process", start_method="spawn", retry_after=2):
+        if cpu_executor not in ("process", "thread"):
+            raise ValueError(f"Unknown cpu_executor '{cpu_executor}', expected 'process' or 'thread'")
+
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.torch_workers = torch_workers
+        self.cpu_executor = cpu_executor
+        self.start_method = start_method
+        self.retry_after = retry_after
+
+        self._pid = None
+        self._cpu = None
+        self._torch = None
+        self._executor_lock = threading.Lock()
+
+        self._semaphore = None
+        self._loop = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._stage_times = {}
+
+    # ----------------------------------------
+    # Executors
+    # ----------------------------------------
+    def _ensure_executors(self):
+        if self._pid == os.getpid():
+            return
+        with self._executor_lock:
+            if self._pid == os.getpid():
+                return
+            if self.cpu_executor == "process":
+                self._cpu = ProcessPoolExecutor(
+                    max_workers=self.cpu_workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            else:
+                self._cpu = ThreadPoolExecutor(max_workers=self.cpu_workers, thread_name_prefix="scoring-cpu")
+            self._torch = ThreadPoolExecutor(max_workers=self.torch_workers, thread_name_prefix="scoring-torch")
+            self._pid = os.getpid()
+
+    def prewarm(self, *modules):
+        """
+        Start the CPU workers and import modules in them ahead of the first
+        request; "module:function" entries also call module.function()
+        """
+        self._ensure_executors()
+        for _ in range(self.cpu_workers):
+            self._cpu.submit(_import_modules, modules)
+
+    @staticmethod
+    async def _result(future):
+        """
+        Await an executor future. If the caller is cancelled, work still
+        queued is dropped, but work already running can't be interrupted:
+        wait for it before re-raising, so the cancelled caller (and the
+        admission slot it holds) stays busy until the executor really is free.
+        """
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                try:
+                    await asyncio.wrap_future(future)
+                except Exception:
+                    pass
+            raise
+
+    async def run_cpu(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) in the CPU pool; fn and its arguments must pickle"""
+        self._ensure_executors()
+        try:
+            return await self._result(self._cpu.submit(fn, *args, **kwargs))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool for the next request
+            with self._executor_lock:
+                self._pid = None
+            raise
+
+    async def run_torch(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) in the thread pool used for torch/librosa work"""
+        self._ensure_executors()
+        return await self._result(self._torch.submit(fn, *args, **kwargs))
+
+    def shutdown(self):
+        if self._pid != os.getpid():
+            return
+        self._cpu.shutdown(wait=False, cancel_futures=True)
+        self._torch.shutdown(wait=False, cancel_futures=True)
+        self._pid = None
+
+    # ----------------------------------------
+    # Admission control
+    # ----------------------------------------
+    @asynccontextmanager
+    async def admit(self):
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(self.retry_after)
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    # ----------------------------------------
+    # Timings
+    # ----------------------------------------
+    def record(self, label, timings):
+        """Log one request's stage timings and fold them into the running stats"""
+        for stage, ms in timings.items():
+            self._stage_times.setdefault(stage, deque(maxlen=1000)).append(ms)
+        summary = ", ".join(f"{stage} {ms:.0f}ms" for stage, ms in timings.items())
+        print(f"⏱️ {label}: {summary}")
+
+    def stats(self):
+        stages = {}
+        for stage, times in self._stage_times.items():
+            t = np.array(times)
+            stages[stage] = {
+                "count": len(t),
+                "mean_ms": round(float(t.mean()), 2),
+                "p95_ms": round(float(np.percentile(t, 95)), 2)
+            }
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "cpu_executor": self.cpu_executor,
+            "cpu_workers": self.cpu_workers,
+            "torch_workers": self.torch_workers,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "stages": stages
+        }
+
+
+def pool_from_env():
+    cpu_count = os.cpu_count() or 1
+    max_in_flight = int(os.environ.get("NUDIGURU_MAX_IN_FLIGHT", str(cpu_count)))
+    return ScoringPool(
+        max_in_flight=max_in_flight,
+        max_queue=int(os.environ.get("NUDIGURU_MAX_QUEUE", str(2 * max_in_flight))),
+        cpu_workers=int(os.environ.get("NUDIGURU_CPU_WORKERS", str(cpu_count))),
+        torch_workers=int(os.environ.get("NUDIGURU_TORCH_WORKERS", "2")),
+        cpu_executor=os.environ.get("NUDIGURU_CPU_EXECUTOR", "process"),
+        start_method=os.environ.get("NUDIGURU_MP_START", "spawn"),
+        retry_after=int(os.environ.get("NUDIGURU_RETRY_AFTER", "2"))
+    )
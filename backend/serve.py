@@ -0,0 +1,194 @@
+# backend/serve.py
+#
+# Preforked serving. The parent loads every model and template store once,
+# then forks workers that share them copy-on-write and accept connections
+# on one listening socket. Each worker pins its torch thread count, so N
+# workers on N cores don't oversubscribe. Linux/macOS only (os.fork).
+#   cd backend && python serve.py [--workers N] [--torch-threads T] [--host 0.0.0.0] [--port 8000]
+#   kill -USR1 <parent pid>    # print RSS / PSS / shared memory per process
+
+import os
+import gc
+import sys
+import time
+import signal
+import socket
+import argparse
+import traceback
+from model_registry import memory_rollup
+
+
+def child_pids(pid):
+    """Direct children of a process, from /proc"""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        pass
+
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # ppid is the second field after the parenthesised command
+                if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                    children.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
+
+
+def memory_table(parent_pid):
+    """Per-process memory lines for the parent and its workers, plus totals"""
+    pids = [parent_pid] + sorted(child_pids(parent_pid))
+    lines = [f"{'process':<16} {'RSS MB':>8} {'PSS MB':>8} {'shared MB':>10} {'private MB':>11}"]
+    total_rss = total_pss = 0.0
+    for pid in pids:
+        mem = memory_rollup(pid)
+        if mem is None:
+            continue
+        label = f"parent {pid}" if pid == parent_pid else f"worker {pid}"
+        lines.append(f"{label:<16} {mem['rss_mb']:>8.1f} {mem['pss_mb']:>8.1f} "
+                     f"{mem['shared_mb']:>10.1f} {mem['private_mb']:>11.1f}")
+        total_rss += mem["rss_mb"]
+        total_pss += mem["pss_mb"]
+    lines.append(f"{'total':<16} {total_rss:>8.1f} {total_pss:>8.1f}   "
+                 "(PSS total = memory actually used; RSS total counts shared pages once per process)")
+    return "\n".join(lines)
+
+
+def configure_environment(torch_threads):
+    """Per-worker defaults, set before main (and torch) are imported"""
+    # DTW runs in threads (numba releases the GIL) so it uses the templates
+    # inherited from the parent instead of re-loading them in spawned processes
+    os.environ.setdefault("NUDIGURU_CPU_EXECUTOR", "thread")
+    os.environ.setdefault("NUDIGURU_CPU_WORKERS", str(torch_threads))
+    os.environ.setdefault("NUDIGURU_TORCH_WORKERS", "1")
+    os.environ.setdefault("NUDIGURU_MAX_IN_FLIGHT", str(torch_threads))
+    # Models are loaded by the parent before forking
+    os.environ.setdefault("NUDIGURU_MODEL_LOADING", "eager")
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(var, str(torch_threads))
+
+
+def run_worker(app, sock, torch_threads):
+    import torch
+    import uvicorn
+
+    torch.set_num_threads(torch_threads)
+    server = uvicorn.Server(uvicorn.Config(app, lifespan="on", access_log=False))
+    server.run(sockets=[sock])
+
+
+class Supervisor:
+    """Forks the workers, replaces any that die, and stops them all on SIGINT/SIGTERM"""
+
+    def __init__(self, app, sock, workers, torch_threads, restart_delay=1.0):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.torch_threads = torch_threads
+        self.restart_delay = restart_delay
+        self.children = {}
+        self.stopping = False
+
+    def spawn(self):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGUSR1):
+                    signal.signal(sig, signal.SIG_DFL)
+                run_worker(self.app, self.sock, self.torch_threads)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def stop(self, signum, frame):
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def report(self, signum, frame):
+        print(memory_table(os.getpid()), flush=True)
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGUSR1, self.report)
+
+        for _ in range(self.workers):
+            self.spawn()
+        print(f"✅ {self.workers} workers serving (parent {os.getpid()}, "
+              f"{self.torch_threads} torch thread(s) each)", flush=True)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            print(f"⚠️ Worker {pid} exited ({os.waitstatus_to_exitcode(status)}), starting a new one", flush=True)
+            # Don't spin if workers die straight away (e.g. a broken import)
+            if time.monotonic() - started < self.restart_delay:
+                time.sleep(self.restart_delay)
+            if not self.stopping:
+                self.spawn()
+
+
+def main():
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py needs os.fork (Linux/macOS); on Windows run `uvicorn main:app`")
+
+    parser = argparse.ArgumentParser(description="Preforked NudiGuru API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--torch-threads", type=int, default=None,
+                        help="torch threads per worker (default: cores / workers, at least 1)")
+    args = parser.parse_args()
+    torch_threads = args.torch_threads or max(1, (os.cpu_count() or 1) // args.workers)
+    configure_environment(torch_threads)
+
+    start = time.perf_counter()
+    import main as api
+
+    # Everything the workers need, loaded once here and inherited by fork
+    api.models.load_all()
+    api.models.shutdown(wait=True)
+    api.warm_references()
+    for name, status in api.models.status().items():
+        if status["state"] != "ready":
+            print(f"⚠️ {name} not loaded ({status.get('error')}); workers will retry on first use")
+    print(f"✅ Models loaded in {time.perf_counter() - start:.1f}s", flush=True)
+
+    sock = socket.socket(socket.AF_INET6 if ":" in args.host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    # The loaded models live as long as the workers: move them out of the
+    # collector's reach, so collections in a worker don't write to (and so
+    # un-share) the pages holding them
+    gc.collect()
+    gc.freeze()
+
+    Supervisor(api.app, sock, args.workers, torch_threads).run()
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+from contextlib import contextmanager
+
+import numpy as np
+import torch
+
+# Silence the Coqui Synthesizer appends after every sentence it synthesizes
+SENTENCE_PAUSE_SAMPLES = 10000
+
+
+class BatchingUnsupported(Exception):
+    """The model cannot be run as a padded batch; synthesize one text at a time instead"""
+
+
+def length_buckets(lengths, max_batch_size: int = 8, max_length_ratio: float = 1.5):
+    """
+    Group item indices into batches of similar length.
+
+    Items are sorted by length and a batch is closed once it is full or the
+    next item is more than max_length_ratio times as long as the batch's
+    shortest item, which bounds the compute wasted on padding.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    buckets, current = [], []
+    for i in order:
+        if current and (
+            len(current) >= max_batch_size
+            or lengths[i] > max_length_ratio * max(lengths[current[0]], 1)
+        ):
+            buckets.append(current)
+            current = []
+        current.append(i)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def pad_batch(arrays, pad_value=0.0):
+    """Stack 1-D arrays into a (batch, max_len) array padded at the end, plus their lengths"""
+    lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+    out = np.full((len(arrays), max(lengths.max(initial=0), 1)), pad_value,
+                  dtype=np.result_type(*arrays))
+    for row, a in zip(out, arrays):
+        row[:len(a)] = a
+    return out, lengths
+
+
+def _speaker_ids(model, speaker_name, batch_size, device):
+    manager = getattr(model, "speaker_manager", None)
+    if manager is None or not speaker_name:
+        return None
+    if getattr(model, "use_d_vector_file", False) or getattr(model.args, "use_d_vector_file", False):
+        raise BatchingUnsupported("d-vector speakers")
+    name_to_id = getattr(manager, "name_to_id", None) or manager.ids
+    return torch.full((batch_size,), name_to_id[speaker_name], dtype=torch.long, device=device)
+
+
+def _trim_silence(synthesizer, wav):
+    audio = synthesizer.tts_config.audio
+    if "do_trim_silence" in audio and audio["do_trim_silence"]:
+        from TTS.tts.utils.synthesis import trim_silence
+        wav = trim_silence(wav, synthesizer.tts_model.ap)
+    return wav
+
+
+@contextmanager
+def _masked(modules, mask):
+    """
+    Hide padded frames from every Conv1d and self-attention in `modules`.
+
+    Coqui's FFTransformer masks attention in the encoder only and never
+    masks its convolutions, so without this the padding bleeds into the
+    real frames of shorter items. With it each item sees exactly what it
+    would see unpadded.
+    """
+    padding = ~mask.squeeze(1).bool()
+
+    def conv_hook(_, args):
+        return (args[0] * mask,) + args[1:]
+
+    def attention_hook(_, args, kwargs):
+        return args, {**kwargs, "key_padding_mask": padding}
+
+    handles = []
+    for module in modules:
+        if module is None:
+            continue
+        for layer in module.modules():
+            if isinstance(layer, torch.nn.Conv1d):
+                handles.append(layer.register_forward_pre_hook(conv_hook))
+            elif isinstance(layer, torch.nn.MultiheadAttention):
+                handles.append(layer.register_forward_pre_hook(attention_hook, with_kwargs=True))
+    try:
+        yield
+    finally:
+        for handle in handles:
+            handle.remove()
+
+
+@torch.inference_mode()
+def _synthesize_bucket(synthesizer, token_ids, speaker_name):
+    model = synthesizer.tts_model
+    device = next(model.parameters()).device
+
+    x, x_lengths = pad_batch(token_ids, pad_value=0)
+    x = torch.from_numpy(x).long().to(device)
+    x_lengths = torch.from_numpy(x_lengths).to(device)
+    g = model._set_speaker_input(
+        {"speaker_ids": _speaker_ids(model, speaker_name, len(token_ids), device), "d_vectors": None}
+    )
+
+    # ForwardTTS.inference assumes a single unpadded input, so the masked
+    # version is spelled out here: padding tokens get zero duration and
+    # therefore produce no mel frames.
+    x_mask = (torch.arange(x.shape[1], device=device)[None, :] < x_lengths[:, None])
+    x_mask = x_mask.unsqueeze(1).float()
+    encoder_side = [
+        model.encoder, model.duration_predictor,
+        getattr(model, "pitch_predictor", None), getattr(model, "pitch_emb", None),
+        getattr(model, "energy_predictor", None), getattr(model, "energy_emb", None),
+    ]
+    with _masked(encoder_side, x_mask):
+        o_en, x_mask, g, _ = model._forward_encoder(x, x_mask, g)
+        o_dr_log = model.duration_predictor(o_en, x_mask)
+        o_dr = model.format_durations(o_dr_log, x_mask).squeeze(1) * x_mask.squeeze(1)
+        y_lengths = o_dr.sum(1)
+        if model.args.use_pitch:
+            o_pitch_emb, _ = model._forward_pitch_predictor(o_en, x_mask)
+            o_en = o_en + o_pitch_emb
+        if getattr(model.args, "use_energy", False):
+            o_energy_emb, _ = model._forward_energy_predictor(o_en, x_mask)
+            o_en = o_en + o_energy_emb
+
+    y_mask = torch.arange(int(y_lengths.max()), device=device)[None, :] < y_lengths[:, None]
+    with _masked([model.decoder], y_mask.unsqueeze(1).float()):
+        o_de, _ = model._forward_decoder(o_en, o_dr, x_mask, y_lengths, g=None)
+
+    # Mel renormalisation from the TTS to the vocoder audio config, per item
+    mels = []
+    for mel, n in zip(o_de.cpu().numpy(), y_lengths.long().tolist()):
+        mel = model.ap.denormalize(mel[:n].T).T
+        mels.append(synthesizer.vocoder_ap.normalize(mel.T))
+
+    # HiFiGAN is fully convolutional: extend every mel with its own last
+    # frame (what the vocoder's replicate padding would show it), vocode once
+    # and cut each waveform back to its frame count plus that padding
+    frames = max(m.shape[1] for m in mels)
+    vocoder_input = np.stack([
+        np.pad(m, ((0, 0), (0, frames - m.shape[1])), mode="edge") for m in mels
+    ]).astype(np.float32)
+    waveforms = synthesizer.vocoder_model.inference(torch.from_numpy(vocoder_input).to(device))
+    waveforms = waveforms.reshape(len(mels), -1).cpu().numpy()
+
+    hop = synthesizer.vocoder_ap.hop_length
+    padding = waveforms.shape[1] - frames * hop
+    return [
+        _trim_silence(synthesizer, wav[:mel.shape[1] * hop + padding])
+        for wav, mel in zip(waveforms, mels)
+    ]
+
+
+def synthesize_batch(synthesizer, texts, speaker_name, max_batch_size: int = 8):
+    """
+    Synthesize many sentences with one FastPitch + HiFiGAN pass per
+    length bucket.
+
+    `synthesizer` is a Coqui TTS Synthesizer. Each result matches what
+    synthesizer.tts(text) returns for a single sentence: the waveform at the
+    TTS sample rate followed by the sentence pause. Raises
+    BatchingUnsupported for models this cannot batch (non-FastPitch models,
+    Griffin-Lim, d-vector speakers, sample-rate mismatched vocoders).
+    """
+    model = synthesizer.tts_model
+    if synthesizer.vocoder_model is None or not hasattr(model, "duration_predictor"):
+        raise BatchingUnsupported(type(model).__name__)
+    if synthesizer.vocoder_config["audio"]["sample_rate"] != model.ap.sample_rate:
+        raise BatchingUnsupported("vocoder sample rate differs from the TTS model")
+
+    token_ids = [np.asarray(model.tokenizer.text_to_ids(t), dtype=np.int64) for t in texts]
+    results = [None] * len(texts)
+    for bucket in length_buckets([len(t) for t in token_ids], max_batch_size):
+        wavs = _synthesize_bucket(synthesizer, [token_ids[i] for i in bucket], speaker_name)
+        for i, wav in zip(bucket, wavs):
+            results[i] = np.concatenate([wav, np.zeros(SENTENCE_PAUSE_SAMPLES, dtype=wav.dtype)])
+    return results
@@ -2,7 +2,7 @@ import base64
 import io
 import re
 import traceback
-from typing import Union
+from typing import Iterator, Union
 
 import numpy as np
 import pysbd
@@ -16,6 +16,8 @@ from .models.response import AudioConfig, AudioFile, TTSFailureResponse, TTSResp
 from .postprocessor import PostProcessor
 from .utils.paragraph_handler import ParagraphHandler
 from .utils.text import TextNormalizer
+from .utils.audio import join_chunks
+from .batching import BatchingUnsupported, synthesize_batch
 
 
 class TextToSpeechEngine:
@@ -24,6 +26,9 @@ class TextToSpeechEngine:
         models: dict,
         allow_transliteration: bool = False,     # DISABLED - Windows safe
         enable_denoiser: bool = True,
+        chunk_gap_ms: float = 0.0,
+        chunk_crossfade_ms: float = 0.0,
+        batch_size: int = 1,
     ):
         self.models = models
 
@@ -51,12 +56,26 @@ class TextToSpeechEngine:
 
         self.post_processor = PostProcessor(self.target_sr)
 
+        # Joining of per-paragraph audio (silence gap or crossfade)
+        self.chunk_gap_ms = chunk_gap_ms
+        self.chunk_crossfade_ms = chunk_crossfade_ms
+
+        # Sentences per padded FastPitch/HiFiGAN/denoiser batch in
+        # infer_from_request (1 = one sentence at a time)
+        self.batch_size = batch_size
+
         # -------------------------
         # REMOVE enchant fallback
         # -------------------------
         self.enchant_dicts = {}
         self.enchant_tokenizer = None
 
+    def join_chunks(self, wav_chunks) -> np.ndarray:
+        """Assemble per-paragraph audio in one pass (concatenate_chunks per chunk is quadratic)"""
+        return join_chunks(
+            wav_chunks, self.target_sr, self.chunk_gap_ms, self.chunk_crossfade_ms
+        )
+
     def concatenate_chunks(self, wav: np.ndarray, wav_chunk: np.ndarray):
         if type(wav_chunk) != np.ndarray:
             wav_chunk = np.array(wav_chunk)
@@ -79,18 +98,19 @@ class TextToSpeechEngine:
                 status_text="Sorry, `male` speaker not supported for this language!"
             )
 
+        texts = [sentence.source for sentence in request.input]
+        if len(texts) > 1 and self.batch_size > 1:
+            raw_audios = self.infer_batch(texts, lang, gender)
+        else:
+            raw_audios = [self.infer_from_text(text, lang, gender) for text in texts]
+
         output_list = []
 
-        for sentence in request.input:
-            raw_audio = self.infer_from_text(
-                sentence.source,
-                lang,
-                gender,
-            )
+        for raw_audio in raw_audios:
             byte_io = io.BytesIO()
             scipy_wav_write(byte_io, self.target_sr, raw_audio)
 
-            encoded_bytes = base64.b64encode(byte_io.read())
+            encoded_bytes = base64.b64encode(byte_io.getvalue())
             encoded_string = encoded_bytes.decode()
             speech_response = AudioFile(audioContent=encoded_string)
 
@@ -107,6 +127,86 @@ class TextToSpeechEngine:
         transliterate_roman_to_native: bool = False,
     ) -> np.ndarray:
 
+        wav_chunks = list(self.infer_from_text_stream(
+            input_text, lang, speaker_name, transliterate_roman_to_native
+        ))
+        return self.join_chunks(wav_chunks)
+
+    def infer_from_text_stream(
+        self,
+        input_text: str,
+        lang: str,
+        speaker_name: str,
+        transliterate_roman_to_native: bool = False,
+    ) -> Iterator[np.ndarray]:
+        """Yield the postprocessed audio of each paragraph as soon as it is synthesized"""
+
+        lang, primary_lang, paragraphs = self.split_paragraphs(input_text, lang)
+
+        for paragraph in paragraphs:
+            wav_chunk = self.models[lang].tts(
+                paragraph, speaker_name=speaker_name, style_wav=""
+            )
+            yield self.postprocess_audio(wav_chunk, primary_lang, speaker_name)
+
+    def infer_batch(self, texts, lang: str, speaker_name: str) -> list:
+        """
+        Synthesize several texts together: every sentence of every paragraph
+        goes through FastPitch/HiFiGAN in length-bucketed padded batches and
+        the paragraphs through the denoiser as one batch, then the audio is
+        split back per text. Falls back to per-paragraph synthesis for models
+        that cannot be batched.
+        """
+        paragraphs = []  # (text index, model lang, primary lang, paragraph)
+        for i, text in enumerate(texts):
+            model_lang, primary_lang, paras = self.split_paragraphs(text, lang)
+            paragraphs += [(i, model_lang, primary_lang, p) for p in paras]
+
+        wav_chunks = [None] * len(paragraphs)
+        by_model = {}
+        for j, (_, model_lang, _, paragraph) in enumerate(paragraphs):
+            by_model.setdefault(model_lang, []).append(j)
+
+        for model_lang, indices in by_model.items():
+            synthesizer = self.models[model_lang]
+            # Same sentence split the Synthesizer applies inside tts()
+            sentences = [synthesizer.split_into_sentences(paragraphs[j][3]) for j in indices]
+            flat = [s for sents in sentences for s in sents]
+            try:
+                wavs = synthesize_batch(synthesizer, flat, speaker_name, self.batch_size)
+            except (BatchingUnsupported, AttributeError, KeyError) as e:
+                print(f"⚠️ Batched TTS unavailable ({e}), synthesizing sequentially")
+                wavs = None
+
+            pos = 0
+            for j, sents in zip(indices, sentences):
+                if wavs is None:
+                    wav_chunks[j] = self.models[model_lang].tts(
+                        paragraphs[j][3], speaker_name=speaker_name, style_wav=""
+                    )
+                elif sents:
+                    wav_chunks[j] = join_chunks(wavs[pos:pos + len(sents)], self.orig_sr)
+                else:
+                    wav_chunks[j] = np.zeros(0, dtype=np.float32)
+                pos += len(sents)
+
+        if self.enable_denoiser:
+            wav_chunks = [
+                chunk
+                for start in range(0, len(wav_chunks), self.batch_size)
+                for chunk in self.denoiser.denoise_batch(wav_chunks[start:start + self.batch_size])
+            ]
+
+        per_text = [[] for _ in texts]
+        for (i, _, primary_lang, _), wav_chunk in zip(paragraphs, wav_chunks):
+            per_text[i].append(
+                self.post_processor.process(wav_chunk, primary_lang, speaker_name)
+            )
+        return [self.join_chunks(chunks) for chunks in per_text]
+
+    def split_paragraphs(self, input_text: str, lang: str):
+        """Normalize the text and split it into the paragraphs synthesized one call each"""
+
         # Hinglish fallback safety
         split_lang = lang
         if lang == "en" and lang not in self.models and "en+hi" in self.models:
@@ -120,23 +220,15 @@ class TextToSpeechEngine:
         # NO transliteration
         xlit_paragraph = input_text
 
-        wav = None
-        paragraphs = self.paragraph_handler.split_text(xlit_paragraph, split_lang)
-
-        for paragraph in paragraphs:
+        paragraphs = []
+        for paragraph in self.paragraph_handler.split_text(xlit_paragraph, split_lang):
             paras = []
             for sent in self.sent_seg.segment(paragraph):
                 if sent.strip() and not re.match(r"^[_\W]+$", sent.strip()):
                     paras.append(sent.strip())
-            paragraph = " ".join(paras)
-
-            wav_chunk = self.models[lang].tts(
-                paragraph, speaker_name=speaker_name, style_wav=""
-            )
-            wav_chunk = self.postprocess_audio(wav_chunk, primary_lang, speaker_name)
-            wav = self.concatenate_chunks(wav, wav_chunk)
+            paragraphs.append(" ".join(paras))
 
-        return wav
+        return lang, primary_lang, paragraphs
 
     def parse_langs_normalise_text(
         self, input_text: str, lang: str
@@ -1,16 +1,29 @@
+import threading
 import torch
 import librosa
 import numpy as np
 
+MODEL_NAME = "JorisCos/DCCRNet_Libri1Mix_enhsingle_16k"
+
+_models = {}
+_models_lock = threading.Lock()
+
+def load_model(device=None):
+    """DCCRNet for `device`, loaded once and shared by every Denoiser"""
+    device = torch.device(device or ('cuda' if torch.cuda.is_available() else 'cpu'))
+    with _models_lock:
+        if device not in _models:
+            from asteroid.models import BaseModel as AsteroidBaseModel
+            _models[device] = AsteroidBaseModel.from_pretrained(MODEL_NAME).to(device)
+        return _models[device]
+
 class Denoiser:
 
     def __init__(self, orig_sr:int, target_sr:int):
         self.orig_sr = orig_sr
         self.target_sr = target_sr
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-
-        from asteroid.models import BaseModel as AsteroidBaseModel
-        self.model = AsteroidBaseModel.from_pretrained("JorisCos/DCCRNet_Libri1Mix_enhsingle_16k").to(self.device)
+        self.model = load_model(self.device)
     
     def denoise(self, wav):
         if type(wav) != np.ndarray:
@@ -22,3 +35,26 @@ class Denoiser:
         wav = torch.Tensor(wav.reshape(1, 1, wav.shape[0])).float().to(self.device)
         wav = self.model.separate(wav)[0][0] #(batch, channels, time) -> (time)
         return wav.cpu().detach().numpy()
+
+    def denoise_batch(self, wavs):
+        """Denoise several clips with one DCCRNet pass; padding is cut off again per clip"""
+        wavs = [np.mean(w, axis=1) if np.ndim(w) > 1 else np.asarray(w) for w in wavs]
+        lengths = [len(w) for w in wavs]
+        padded = np.zeros((len(wavs), max(lengths)), dtype=np.float32)
+        for row, w in zip(padded, wavs):
+            row[:len(w)] = w
+
+        padded = librosa.resample(padded, orig_sr=self.orig_sr, target_sr=self.target_sr, axis=-1)
+        batch = torch.from_numpy(np.ascontiguousarray(padded)).float().unsqueeze(1).to(self.device)
+        with torch.no_grad():
+            out = self.model.forward_wav(batch)[:, 0].cpu().numpy() #(batch, channels, time) -> (batch, time)
+
+        # separate() rescales its output to the input loudness over the whole
+        # tensor; do the same per clip so clips in a batch don't share a gain
+        clean = []
+        for noisy, wav, n in zip(padded, out, lengths):
+            n = int(np.ceil(n * self.target_sr / self.orig_sr))
+            wav = wav[:n]
+            level = np.abs(wav).sum()
+            clean.append(wav * (np.abs(noisy[:n]).sum() / level) if level > 0 else wav)
+        return clean
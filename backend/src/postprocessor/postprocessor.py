@@ -1,20 +1,31 @@
 import os
-import ffmpeg
 import librosa
 import numpy as np
 import soundfile as sf
 import tempfile
 
 from .vad import VoiceActivityDetection
+from .tempo import wsola
 
 
 class PostProcessor:
 
-    def __init__(self, target_sr:int):
+    def __init__(self, target_sr:int, tempo_backend:str ='wsola'):
         self.target_sr = target_sr
         self.vad = VoiceActivityDetection()
+        self.tempo_backend = tempo_backend  # 'wsola' (in-process) or 'ffmpeg'
 
     def set_tempo(self, wav:np.ndarray, atempo:str ='1'):
+        if self.tempo_backend == 'wsola':
+            try:
+                return wsola(wav, float(atempo), self.target_sr)
+            except Exception as e:
+                print(f"⚠️ In-process tempo change failed ({e}), falling back to ffmpeg")
+        return self.set_tempo_ffmpeg(wav, atempo)
+
+    def set_tempo_ffmpeg(self, wav:np.ndarray, atempo:str ='1'):
+        import ffmpeg
+
         with tempfile.TemporaryDirectory() as tmpdirname:
             inpath = os.path.join(tmpdirname, 'input.wav')
             outpath = inpath.replace('input.wav', 'output.wav')
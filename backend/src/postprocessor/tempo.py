@@ -0,0 +1,64 @@
+import numpy as np
+
+
+def _hann(n):
+    # Periodic Hann: copies at 50% overlap sum to exactly one
+    return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n) / n)
+
+
+def wsola(wav, tempo: float, sr: int, frame_ms: float = 40.0, tolerance_ms: float = 10.0):
+    """
+    Change the tempo of `wav` without changing its pitch (WSOLA).
+
+    tempo > 1 speeds up (ffmpeg atempo semantics), so the output is about
+    len(wav) / tempo samples long. Each output frame is taken from within
+    tolerance_ms of its nominal input position, at the offset whose
+    waveform best continues the previous frame, and overlap-added with a
+    Hann window.
+    """
+    wav = np.asarray(wav, dtype=np.float32)
+    if wav.ndim > 1:
+        wav = wav.mean(axis=1)
+    if tempo <= 0:
+        raise ValueError(f"tempo must be positive, got {tempo}")
+    if tempo == 1 or len(wav) == 0:
+        return wav.copy()
+
+    n = int(sr * frame_ms / 1000) // 2 * 2
+    hop = n // 2
+    delta = int(sr * tolerance_ms / 1000)
+    window = _hann(n).astype(np.float32)
+
+    out_len = int(round(len(wav) / tempo))
+    n_frames = out_len // hop + 1
+    # Room for the search window around the first and last frames
+    padded = np.pad(wav, (delta, n + delta + int(n_frames * hop * tempo) - len(wav) + hop))
+
+    # Candidate frames start at starts[k] + j for j in [0, 2 * delta]; their
+    # energies don't depend on the search, so normalise them all up front
+    starts = (np.arange(n_frames) * hop * tempo).astype(np.int64)
+    power = np.concatenate([[0.0], np.cumsum(padded.astype(np.float64) ** 2)])
+    candidates = starts[:, None] + np.arange(2 * delta + 1)
+    inv_energy = 1 / (np.sqrt(np.maximum(power[candidates + n] - power[candidates], 0)) + 1e-8)
+
+    positions = np.empty(n_frames, dtype=np.int64)  # input position of each output frame
+    prev = positions[0] = delta
+    for k in range(1, n_frames):
+        # The natural continuation of the previous frame is one hop further
+        # along the input; take the candidate around this frame's nominal
+        # position that looks most like it
+        template = padded[prev + hop:prev + hop + n]
+        corr = np.correlate(padded[starts[k]:starts[k] + n + 2 * delta], template, mode="valid")
+        prev = positions[k] = starts[k] + int(np.argmax(corr * inv_energy[k]))
+
+    # Overlap-add: with a 50% hop the first half of frame k and the second
+    # half of frame k - 1 land on the same output block
+    frames = padded[positions[:, None] + np.arange(n)] * window
+    out = np.zeros((n_frames + 1, hop), dtype=np.float32)
+    out[:-1] += frames[:, :hop]
+    out[1:] += frames[:, hop:]
+    out = out.ravel()
+
+    # The first half-frame only got one fading-in window
+    out[:hop] = padded[delta:delta + hop]
+    return out[:out_len]
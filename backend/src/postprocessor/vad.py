@@ -27,61 +27,74 @@ Adapted from https://github.com/mauriciovander/silence-removal/blob/master/vad.p
 '''
 import numpy
 
+FRAME_SIZE = 160          # samples per frame (10 ms at 16 kHz), frames don't overlap
+THRESHOLD_RATIO = 0.2     # frame threshold = min + ratio * (max - min) of its energy
+
+
+def _threshold_dtypes(energy_dtype):
+    """
+    dtypes the original's per-frame scalar arithmetic ran in, for frame
+    energies of energy_dtype: (ptp * ratio, min + that, running mean).
+    Taken from the same expressions on numpy scalars, so they follow the
+    installed numpy's promotion rules (numpy 1 promotes a float32 scalar
+    times a Python float to float64, numpy 2 keeps float32).
+    """
+    e = energy_dtype.type(0)
+    scaled = e * THRESHOLD_RATIO
+    thd = e + scaled
+    mean = (1. * thd + thd) / 2.
+    return scaled.dtype, thd.dtype, mean.dtype
+
+
 class VoiceActivityDetection:
+    """
+    Silence trimming with an adaptive energy threshold.
 
-    def __init__(self):
-        self.__step = 160
-        self.__buffer_size = 160 
-        self.__buffer = numpy.array([],dtype=numpy.int16)
-        self.__out_buffer = numpy.array([],dtype=numpy.int16)
-        self.__n = 0
-        self.__VADthd = 0.
-        self.__VADn = 0.
-        self.__silence_counter = 0
+    Stateless: every call to process() starts afresh, so one instance can be
+    shared between threads. Output matches the original streaming
+    implementation run on a fresh instance.
+    """
 
     # Voice Activity Detection
     # Adaptive threshold
-    def vad(self, _frame, sc_threshold=20):
-        frame = numpy.array(_frame) ** 2.
-        result = True
-        threshold = 0.2
-        thd = numpy.min(frame) + numpy.ptp(frame) * threshold
-        self.__VADthd = (self.__VADn * self.__VADthd + thd) / float(self.__VADn + 1.)
-        self.__VADn += 1.
-
-        if numpy.mean(frame) <= self.__VADthd:
-            self.__silence_counter += 1
+    def speech_mask(self, data, sc_threshold=20):
+        """Boolean per FRAME_SIZE-sample frame of `data`: True for frames kept as speech"""
+        data = numpy.asarray(data).ravel()
+        n_frames = len(data) // FRAME_SIZE
+        frames = data[:n_frames * FRAME_SIZE].reshape(n_frames, FRAME_SIZE)
+
+        energy = numpy.asarray(frames, dtype=numpy.result_type(numpy.int16, data.dtype)) ** 2.
+        low = energy.min(axis=1)
+        scaled_dtype, thd_dtype, mean_dtype = _threshold_dtypes(energy.dtype)
+        thd = low.astype(thd_dtype) + ((energy.max(axis=1) - low).astype(scaled_dtype)
+                                       * scaled_dtype.type(THRESHOLD_RATIO)).astype(thd_dtype)
+        # Running mean of the per-frame thresholds up to each frame, with the
+        # original's recurrence: a cumulative sum rounds differently, which
+        # flips frames whose energy ties the threshold (constant input)
+        if mean_dtype == numpy.float64:
+            # Python floats are float64, and much cheaper than numpy scalars
+            thd, zero, step = thd.tolist(), 0., float
         else:
-            self.__silence_counter = 0
-        if self.__silence_counter > sc_threshold:
-            result = False
-        return result
-
-    # Push new audio samples into the buffer.
-    def add_samples(self, data):
-        self.__buffer = numpy.append(self.__buffer, data)
-        result = len(self.__buffer) >= self.__buffer_size
-        # print('__buffer size %i'%self.__buffer.size)
-        return result
-
-    # Pull a portion of the buffer to process
-    # (pulled samples are deleted after being
-    # processed
-    def get_frame(self):
-        window = self.__buffer[:self.__buffer_size]
-        self.__buffer = self.__buffer[self.__step:]
-        # print('__buffer size %i'%self.__buffer.size)
-        return window
-
-    # Adds new audio samples to the internal
-    # buffer and process them
+            thd, zero, step = thd.astype(mean_dtype), mean_dtype.type(0), mean_dtype.type
+        running_thd = numpy.empty(n_frames, dtype=mean_dtype)
+        mean_thd = zero
+        for n, frame_thd in enumerate(thd):
+            mean_thd = (step(n) * mean_thd + frame_thd) / step(n + 1.)
+            running_thd[n] = mean_thd
+        silent = energy.mean(axis=1) <= running_thd
+
+        # Length of the run of silent frames ending at each frame
+        index = numpy.arange(n_frames)
+        last_voiced = numpy.maximum.accumulate(numpy.where(silent, -1, index))
+        silence_run = index - last_voiced
+        return silence_run <= sc_threshold
+
     def process(self, data, sc_threshold):
-        self.__buffer = numpy.array([],dtype=numpy.int16)
-        self.__out_buffer = numpy.array([],dtype=numpy.int16)
-        if self.add_samples(data):
-            while len(self.__buffer) >= self.__buffer_size:
-                # Framing
-                window = self.get_frame()
-                if self.vad(window, sc_threshold):  # speech frame
-                	self.__out_buffer = numpy.append(self.__out_buffer, window)
-        return self.__out_buffer
+        """Drop frames that lie more than sc_threshold frames into a silence; a trailing partial frame is dropped too"""
+        data = numpy.asarray(data).ravel()
+        keep = self.speech_mask(data, sc_threshold)
+        if not keep.any():
+            return numpy.array([], dtype=numpy.int16)
+
+        frames = data[:len(keep) * FRAME_SIZE].reshape(len(keep), FRAME_SIZE)
+        return frames[keep].astype(numpy.result_type(numpy.int16, data.dtype), copy=False).ravel()
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+def join_chunks(chunks, sample_rate, gap_ms=0.0, crossfade_ms=0.0):
+    """
+    Join synthesized chunks into one waveform with a single allocation.
+
+    gap_ms inserts that much silence between consecutive chunks;
+    otherwise crossfade_ms overlaps them with a linear crossfade (clipped
+    to the shorter of the two chunks). With neither, this is a plain
+    concatenation. Returns None when there are no chunks.
+    """
+    chunks = [np.asarray(c) for c in chunks]
+    if not chunks:
+        return None
+
+    gap = int(sample_rate * gap_ms / 1000)
+    fade = 0 if gap > 0 else int(sample_rate * crossfade_ms / 1000)
+
+    # Overlap between chunk i-1 and chunk i
+    overlaps = [0] + [min(fade, len(a), len(b)) for a, b in zip(chunks, chunks[1:])]
+    total = sum(len(c) for c in chunks) + gap * (len(chunks) - 1) - sum(overlaps)
+
+    out = np.zeros(total, dtype=np.result_type(*chunks))
+    pos = 0
+    for i, chunk in enumerate(chunks):
+        if i > 0:
+            pos += gap
+        ov = overlaps[i]
+        if ov:
+            pos -= ov
+            ramp = np.linspace(0.0, 1.0, ov, endpoint=False)
+            out[pos:pos + ov] = out[pos:pos + ov] * (1 - ramp) + chunk[:ov] * ramp
+        out[pos + ov:pos + len(chunk)] = chunk[ov:]
+        pos += len(chunk)
+
+    return out
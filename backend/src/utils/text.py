@@ -4,10 +4,17 @@ PWD = os.path.dirname(__file__)
 import json
 import re
 import traceback
+from functools import lru_cache
 
 import regex
 from indic_numtowords import num2words, supported_langs
-from .translator import GoogleTranslator
+from .translator import TranslationTable, get_translator
+
+# Translated numbers/dates persist here (next to the TTS audio cache) unless
+# NUDIGURU_TRANSLATION_TABLE points elsewhere
+DEFAULT_TRANSLATION_TABLE = os.path.normpath(
+    os.path.join(PWD, "..", "..", "tts_cache", "translations.json")
+)
 
 indic_acronym_matcher = regex.compile(r"([\p{L}\p{M}]+\.\s*){2,}")
 
@@ -41,11 +48,11 @@ def get_all_numbers_from_string(text):
     return num_str_regex.findall(text)
 
 
-multiple_stops_regex = r"\.\.+"
+multiple_stops_regex = re.compile(r"\.\.+")
 
 
 def replace_multiple_stops(text):
-    return re.sub(multiple_stops_regex, ".", text)
+    return multiple_stops_regex.sub(".", text)
 
 
 date_generic_match_regex = re.compile("(?:[^0-9]\d*[./-]\d*[./-]\d*)")
@@ -67,23 +74,51 @@ def get_decimal_substitution(decimal):
     return decimal_sub
 
 
-email_regex = r"[\w.+-]+@[\w-]+\.[\w.-]+"
-url_regex = r"((?:\w+://)?\w+\.\w+\.\w+/?[\w\.\?=#]*)|(\w*.com/?[\w\.\?=#]*)"
-currency_regex = r"\₹\ ?[+-]?[0-9]{1,3}(?:,?[0-9])*(?:\.[0-9]{1,2})?"
-phone_regex = r"\+?\d[ \d-]{6,12}\d"
+email_regex = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+# (?<!\w): a dotted host can't start inside a run of word characters that a
+# match from the start of that run would have covered; it saves the engine
+# re-trying \w+ from every position of every word
+url_regex = re.compile(r"((?<!\w)(?:\w+://)?\w+\.\w+\.\w+/?[\w\.\?=#]*)|(\w*.com/?[\w\.\?=#]*)")
+currency_regex = re.compile(r"\₹\ ?[+-]?[0-9]{1,3}(?:,?[0-9])*(?:\.[0-9]{1,2})?")
+phone_regex = re.compile(r"\+?\d[ \d-]{6,12}\d")
 
 
 class TextNormalizer:
-    def __init__(self):
-        self.translator = GoogleTranslator()
+    def __init__(self, translator=None, translation_table=None, cache_size=1024):
+        # Lazy: nothing touches the network until a translation is needed
+        self.translator = translator or get_translator()
+        if translation_table is None:
+            translation_table = TranslationTable(
+                os.getenv("NUDIGURU_TRANSLATION_TABLE", DEFAULT_TRANSLATION_TABLE)
+            )
+        self.translation_table = translation_table
         self.symbols2lang2word = json.load(
             open(os.path.join(PWD, "symbols.json"), encoding="utf-8")
         )
         self.alphabet2phone = json.load(
             open(os.path.join(PWD, "alphabet2phone.json"), encoding="utf-8")
         )
+        # Per-language compiled symbol substitution, built on first use
+        self._symbol_subs = {}
+        # LRU over whole (text, lang) results; lesson texts repeat constantly
+        self._normalized = lru_cache(maxsize=cache_size)(self.normalize_text_uncached)
 
     def normalize_text(self, text, lang):
+        return self._normalized(text, lang)
+
+    def cache_info(self):
+        return self._normalized.cache_info()
+
+    def translate(self, kind, key, text, lang):
+        """Translate English `text` into lang, through the persistent (kind, key, lang) table"""
+        name = getattr(self.translator, "name", type(self.translator).__name__)
+        translated = self.translation_table.get(name, kind, lang, key)
+        if translated is None:
+            translated = self.translator(text=text, from_lang="en", to_lang=lang)
+            self.translation_table.put(name, kind, lang, key, translated)
+        return translated
+
+    def normalize_text_uncached(self, text, lang):
         text = text.replace("।", ".").replace("|", ".").replace("꯫", ".").strip()
         text = self.expand_shortforms(text, lang)
         text = self.normalize_decimals(text, lang)
@@ -136,10 +171,9 @@ class TextNormalizer:
             try:
                 num_words = [num2words(num, lang="en") for num in numbers]
                 translated_num_words = [
-                    self.translator(text=num_word, from_lang="en", to_lang=lang)
-                    for num_word in num_words
+                    self.translate("number", str(num), num_word, lang)
+                    for num, num_word in zip(numbers, num_words)
                 ]
-                # TODO: Cache the results?
                 num_words = translated_num_words
             except:
                 traceback.print_exc()
@@ -157,8 +191,8 @@ class TextNormalizer:
             if lang in ["brx", "en"]:  # no translate
                 translated_str = normalized_str
             else:
-                translated_str = self.translator(
-                    text=normalized_str, from_lang="en", to_lang=lang
+                translated_str = self.translate(
+                    "date", normalized_str, normalized_str, lang
                 )
             text = text.replace(date_str, translated_str)
         return text
@@ -167,7 +201,7 @@ class TextNormalizer:
         return " ".join(list(item))
 
     def find_valid(self, regex_str, text):
-        items = re.findall(regex_str, text)
+        items = regex_str.findall(text) if isinstance(regex_str, re.Pattern) else re.findall(regex_str, text)
         return_items = []
         for item in items:
             if isinstance(item, tuple):
@@ -179,36 +213,47 @@ class TextNormalizer:
                 return_items.append(item)
         return return_items
 
+    def symbol_substitution(self, lang):
+        """
+        Rewrite every symbols.json key in an item for `lang`: one str.translate
+        pass for the single-character symbols, str.replace for the rest.
+        Built once per language. No key contains another and no replacement
+        contains a key, so this equals replacing key by key.
+        """
+        sub = self._symbol_subs.get(lang)
+        if sub is None:
+            words = {
+                symbol: f" {lang2word[lang]} "
+                for symbol, lang2word in self.symbols2lang2word.items()
+            }
+            single = str.maketrans({s: w for s, w in words.items() if len(s) == 1})
+            multi = [(s, w) for s, w in words.items() if len(s) > 1]
+
+            def sub(item):
+                for symbol, word in multi:
+                    item = item.replace(symbol, word)
+                return item.translate(single)
+
+            self._symbol_subs[lang] = sub
+        return sub
+
     def convert_symbols_to_words(self, text, lang):
-        symbols = self.symbols2lang2word.keys()
-        emails = self.find_valid(email_regex, text)
+        substitute = self.symbol_substitution(lang)
+        emails = self.find_valid(email_regex, text) if "@" in text else []
         # urls = re.findall(r'(?:\w+://)?\w+\.\w+\.\w+/?[\w\.\?=#]*', text)
         urls = self.find_valid(url_regex, text)
         # print('URLS', urls)
         for item in emails + urls:
-            item_norm = item
-            for symbol in symbols:
-                item_norm = item_norm.replace(
-                    symbol, f" {self.symbols2lang2word[symbol][lang]} "
-                )
-            text = text.replace(item, item_norm)
+            text = text.replace(item, substitute(item))
 
-        currencies = self.find_valid(currency_regex, text)
+        currencies = self.find_valid(currency_regex, text) if "₹" in text else []
         for item in currencies:
             item_norm = item.replace("₹", "") + "₹"  # Pronounce after numerals
-            for symbol in symbols:
-                item_norm = item_norm.replace(
-                    symbol, f" {self.symbols2lang2word[symbol][lang]} "
-                )
-            text = text.replace(item, item_norm)
+            text = text.replace(item, substitute(item_norm))
 
         phones = self.find_valid(phone_regex, text)
         for item in phones:
-            item_norm = item.replace("-", " ")
-            for symbol in symbols:
-                item_norm = item_norm.replace(
-                    symbol, f" {self.symbols2lang2word[symbol][lang]} "
-                )
+            item_norm = substitute(item.replace("-", " "))
             item_norm = self.expand_phones(item_norm)
             text = text.replace(item, item_norm)
 
@@ -1,27 +1,127 @@
+import os
+import json
+import tempfile
+import threading
+
+
 class GoogleTranslator:
-  def __init__(self):
-    from translators.server import google, _google
-    self._translate = google
+  name = "google"
 
-    google("Testing...")
-    self.supported_languages = set(_google.language_map['en'])
+  def __init__(self):
+    # The translators package and its first request (which fills in the
+    # language map) are deferred to the first translation, so building a
+    # TextNormalizer never waits on the network
+    self._translate = None
+    self.supported_languages = set()
     self.custom_lang_map = {
         "mni": "mni-Mtei",
         "raj": "hi",
     }
+    self._lock = threading.Lock()
+
+  def _load(self):
+    with self._lock:
+      if self._translate is None:
+        from translators.server import google, _google
+
+        google("Testing...")
+        self.supported_languages = set(_google.language_map['en'])
+        self._translate = google
 
   def translate(self, text, from_lang, to_lang):
+    if self._translate is None:
+      self._load()
+
     if from_lang in self.custom_lang_map:
       from_lang = self.custom_lang_map[from_lang]
     elif from_lang not in self.supported_languages:
       return text
-    
+
     if to_lang in self.custom_lang_map:
       to_lang = self.custom_lang_map[to_lang]
     elif to_lang not in self.supported_languages:
       return text
-    
+
     return self._translate(text, from_language=from_lang, to_language=to_lang)
-  
+
   def __call__(self, **kwargs):
     return self.translate(**kwargs)
+
+
+class IdentityTranslator:
+  """Local stand-in: leaves text untranslated (no network, no dependencies)"""
+  name = "identity"
+
+  def translate(self, text, from_lang, to_lang):
+    return text
+
+  def __call__(self, **kwargs):
+    return self.translate(**kwargs)
+
+
+TRANSLATORS = {
+    "google": GoogleTranslator,
+    "identity": IdentityTranslator,
+}
+
+
+def get_translator(name=None):
+  """Translator selected by name or NUDIGURU_TRANSLATOR (default: google)"""
+  name = name or os.getenv("NUDIGURU_TRANSLATOR", "google")
+  if name not in TRANSLATORS:
+    raise ValueError(f"Unknown translator '{name}', expected one of {sorted(TRANSLATORS)}")
+  return TRANSLATORS[name]()
+
+
+class TranslationTable:
+  """
+  Persistent lookup of translated numbers and dates, keyed by translator,
+  kind ("number" / "date"), target language and source string.
+
+  Stored as JSON; every new entry is merged with the file on disk and
+  written atomically, so processes sharing the file don't drop each
+  other's entries. path=None keeps the table in memory only.
+  """
+
+  def __init__(self, path=None):
+    self.path = path
+    self._lock = threading.Lock()
+    self._entries = self._read() if path else {}
+
+  def _read(self):
+    try:
+      with open(self.path, encoding="utf-8") as f:
+        return json.load(f)
+    except (OSError, ValueError):
+      return {}
+
+  def get(self, translator, kind, lang, key):
+    return self._entries.get(translator, {}).get(kind, {}).get(lang, {}).get(key)
+
+  def put(self, translator, kind, lang, key, value):
+    with self._lock:
+      self._entries.setdefault(translator, {}).setdefault(kind, {}).setdefault(lang, {})[key] = value
+      if self.path:
+        self._save()
+
+  def _save(self):
+    merged = self._read()
+    for translator, kinds in self._entries.items():
+      for kind, langs in kinds.items():
+        for lang, values in langs.items():
+          merged.setdefault(translator, {}).setdefault(kind, {}).setdefault(lang, {}).update(values)
+    self._entries = merged
+
+    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+      json.dump(merged, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, self.path)
+
+  def __len__(self):
+    return sum(
+        len(values)
+        for kinds in self._entries.values()
+        for langs in kinds.values()
+        for values in langs.values()
+    )
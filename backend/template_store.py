@@ -0,0 +1,183 @@
+# template_store.py
+
+import os
+import json
+import numpy as np
+
+# ----------------------------------------
+# On-disk layout
+# ----------------------------------------
+# <base>.npy        one flat, contiguous float32 array holding every template
+# <base>.index.json offset index keyed by (word_id, syllable, speaker)
+#
+# All references of one (word_id, syllable) are written back to back, so
+# templates with equal shapes can also be viewed as a single stacked array.
+
+STORE_VERSION = 1
+
+
+def store_paths(base_path):
+    """Return (data_path, index_path) for a store base path"""
+    return base_path + ".npy", base_path + ".index.json"
+
+
+def store_exists(base_path):
+    return all(os.path.exists(p) for p in store_paths(base_path))
+
+
+class TemplateStore:
+    """Read-only syllable templates backed by one memory-mapped float32 array"""
+
+    def __init__(self, data, entries):
+        self.data = data
+        self.entries = entries
+        self._refs = {}
+        self._speakers = {}
+        self._offsets = {}
+        self._stacked = {}
+
+        for e in entries:
+            key = (e["word_id"], e["syllable"])
+            size = int(np.prod(e["shape"]))
+            view = data[e["offset"]:e["offset"] + size].reshape(e["shape"])
+            self._refs.setdefault(key, []).append(view)
+            self._speakers.setdefault(key, []).append(e["speaker"])
+            self._offsets.setdefault(key, []).append(e["offset"])
+
+        # Zero-copy (n_refs, ...) views for syllables whose refs share a shape
+        for key, refs in self._refs.items():
+            shape = refs[0].shape
+            start = self._offsets[key][0]
+            contiguous = self._offsets[key] == [start + i * refs[0].size for i in range(len(refs))]
+            if contiguous and all(r.shape == shape for r in refs):
+                self._stacked[key] = data[start:start + len(refs) * refs[0].size].reshape(
+                    (len(refs),) + shape
+                )
+
+    # ----------------------------------------
+    # Loading / saving
+    # ----------------------------------------
+    @classmethod
+    def open(cls, base_path):
+        """Memory-map a store written by save(); pages are shared across processes"""
+        data_path, index_path = store_paths(base_path)
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+
+        if index.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported template store version: {index.get('version')}")
+
+        data = np.load(data_path, mmap_mode="r")
+        return cls(data, index["entries"])
+
+    @classmethod
+    def from_templates(cls, templates):
+        """
+        Build an in-memory store from {word_id: {syl: [ref, ...]}}.
+        A ref is either an array-like or a (speaker, array-like) pair.
+        """
+        arrays, entries = [], []
+        offset = 0
+
+        for word_id, syls in templates.items():
+            for syl, refs in syls.items():
+                for i, ref in enumerate(refs):
+                    if isinstance(ref, tuple):
+                        speaker, ref = ref
+                    else:
+                        speaker = f"ref{i}"
+
+                    arr = np.ascontiguousarray(ref, dtype=np.float32)
+                    entries.append({
+                        "word_id": word_id,
+                        "syllable": syl,
+                        "speaker": speaker,
+                        "offset": offset,
+                        "shape": list(arr.shape)
+                    })
+                    arrays.append(arr.ravel())
+                    offset += arr.size
+
+        data = np.concatenate(arrays) if arrays else np.zeros((0,), dtype=np.float32)
+        return cls(data, entries)
+
+    @classmethod
+    def from_json(cls, json_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            return cls.from_templates(json.load(f))
+
+    def save(self, base_path):
+        data_path, index_path = store_paths(base_path)
+
+        # Write to temp files first so running servers never map a half-written store
+        tmp_data = data_path + ".tmp.npy"
+        tmp_index = index_path + ".tmp"
+        np.save(tmp_data, np.ascontiguousarray(self.data, dtype=np.float32))
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump({"version": STORE_VERSION, "dtype": "float32", "entries": self.entries}, f)
+
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_index, index_path)
+
+    def to_json(self, json_path):
+        """Export in the legacy {word_id: {syl: [ref, ...]}} JSON layout"""
+        templates = {}
+        for (word_id, syl), refs in self._refs.items():
+            templates.setdefault(word_id, {})[syl] = [r.tolist() for r in refs]
+
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(templates, f, indent=2)
+
+    # ----------------------------------------
+    # Lookups (all zero-copy)
+    # ----------------------------------------
+    def refs(self, word_id, syl):
+        """List of float32 views, one per reference speaker"""
+        return self._refs.get((word_id, syl), [])
+
+    def speakers(self, word_id, syl):
+        return self._speakers.get((word_id, syl), [])
+
+    def stacked(self, word_id, syl):
+        """(n_refs, ...) view, or None if the refs have different shapes"""
+        return self._stacked.get((word_id, syl))
+
+    def keys(self):
+        return self._refs.keys()
+
+    def __contains__(self, key):
+        return key in self._refs
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+
+def load_templates(base_path, json_path):
+    """Open the binary store, falling back to importing the legacy JSON"""
+    if store_exists(base_path):
+        return TemplateStore.open(base_path)
+    return TemplateStore.from_json(json_path)
+
+
+# ----------------------------------------
+# CLI: convert between JSON and the binary store (shared by both pipelines)
+#   python template_store.py import HubertPipeline/syllable_templates.json
+#   python template_store.py export WorkingPipeline/syllable_templates.json
+# ----------------------------------------
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3 or sys.argv[1] not in ("import", "export"):
+        print("Usage: python template_store.py [import|export] <templates.json>")
+        sys.exit(1)
+
+    action, json_path = sys.argv[1], sys.argv[2]
+    base_path = os.path.splitext(json_path)[0]
+
+    if action == "import":
+        TemplateStore.from_json(json_path).save(base_path)
+        print(f"DONE → {' + '.join(store_paths(base_path))}")
+    else:
+        TemplateStore.open(base_path).to_json(json_path)
+        print(f"DONE → {json_path}")
@@ -0,0 +1,527 @@
+# backend/tts_cache.py
+#
+# Content-addressed, size-bounded cache of synthesized TTS audio.
+#   cd backend && python tts_cache.py prewarm [--workers N] [--speaker female]
+#   cd backend && python tts_cache.py stats
+#   cd backend && python tts_cache.py evict [--max-mb N]
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import unicodedata
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+from scipy.io.wavfile import read as scipy_wav_read, write as scipy_wav_write
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ROOT = os.path.join(BASE_DIR, "tts_cache", "audio")
+
+# Files whose contents define the TTS model version
+TTS_MODEL_FILES = (
+    "kn/fastpitch/best_model.pth",
+    "kn/fastpitch/config.json",
+    "kn/hifigan/best_model.pth",
+    "kn/hifigan/config.json",
+)
+
+# Postprocessing of TextToSpeechEngine's defaults (denoised, 16 kHz)
+DEFAULT_SETTINGS = {"denoiser": True, "sample_rate": 16000}
+
+INDEX_NAME = "index.json"
+
+
+def model_version(files=TTS_MODEL_FILES, base_dir=BASE_DIR):
+    """
+    Short fingerprint of the installed TTS model.
+
+    NUDIGURU_TTS_MODEL_VERSION overrides it. Otherwise each file
+    contributes its size and the first and last 64 KB of its contents,
+    which is cheap even for the large checkpoints and survives copying.
+    """
+    override = os.environ.get("NUDIGURU_TTS_MODEL_VERSION")
+    if override:
+        return override
+
+    h = hashlib.sha1()
+    found = False
+    for rel in files:
+        path = os.path.join(base_dir, rel)
+        if not os.path.exists(path):
+            continue
+        found = True
+        size = os.path.getsize(path)
+        h.update(f"{rel}:{size}".encode())
+        with open(path, "rb") as f:
+            h.update(f.read(65536))
+            if size > 65536:
+                f.seek(max(65536, size - 65536))
+                h.update(f.read())
+    return h.hexdigest()[:12] if found else "unversioned"
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock shared by every process on this machine (blocks until acquired)"""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            # msvcrt gives up after ~10 s, so keep retrying like flock would block
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def normalize_text(text):
+    """NFC form with runs of whitespace collapsed, so equivalent inputs share a key"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TTSCache:
+    """
+    Synthesized audio keyed by a hash of (normalized text, language,
+    speaker, model version, postprocessing settings).
+
+    A JSON index next to the WAVs records size, creation/last-access time
+    and hit count of every entry. Once the cache grows past max_bytes the
+    least recently used entries are deleted, except pinned ones (the
+    lesson references). WAVs and the index are written to a temporary
+    file and renamed, so readers never see partial files.
+
+    Misses are single-flight: concurrent requests for the same key wait
+    for one synthesis, within a process and, through a per-key file lock,
+    across worker processes sharing the cache directory.
+
+    synthesize(text, speaker_name=...) returns (audio, sample_rate);
+    without it the cache is read-only.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, synthesize=None, version=None, settings=None,
+                 lang="kn", max_bytes=512 * 1024 * 1024, index_interval=5.0):
+        self.root = root
+        self.synthesize = synthesize
+        self.version = version or model_version()
+        self.settings = dict(DEFAULT_SETTINGS if settings is None else settings)
+        self.lang = lang
+        self.max_bytes = max_bytes
+        self.index_interval = index_interval
+        self.lock_dir = os.path.join(root, "locks")
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._pinned = set()
+        self._dirty = False
+        self._last_save = 0.0
+        self.index = self._load_index()
+
+        self.hits = 0
+        self.misses = 0
+        self.syntheses = 0
+        self.synthesis_time = 0.0
+        self.evictions = 0
+        self.coalesced = 0
+        self.shared = 0
+
+    # ----------------------------------------
+    # Keys and paths
+    # ----------------------------------------
+    def key(self, text, speaker, lang=None):
+        fields = {
+            "text": normalize_text(text),
+            "lang": lang or self.lang,
+            "speaker": speaker,
+            "model": self.version,
+            "settings": self.settings
+        }
+        payload = json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:24]
+
+    def path_for_key(self, key):
+        return os.path.join(self.root, f"{key}.wav")
+
+    def path(self, text, speaker, lang=None):
+        return self.path_for_key(self.key(text, speaker, lang))
+
+    # ----------------------------------------
+    # Index
+    # ----------------------------------------
+    def _index_path(self):
+        return os.path.join(self.root, INDEX_NAME)
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _load_index(self):
+        # Entries whose WAV is gone are dropped; WAVs missing from the index
+        # (e.g. written by another worker) are adopted
+        index = {k: e for k, e in self._read_index().items() if os.path.exists(self.path_for_key(k))}
+        for name in os.listdir(self.root):
+            key, ext = os.path.splitext(name)
+            if ext == ".wav" and key not in index:
+                index[key] = self._stat_entry(key)
+        return index
+
+    def _stat_entry(self, key, **fields):
+        st = os.stat(self.path_for_key(key))
+        entry = {"bytes": st.st_size, "created": st.st_mtime, "last_access": st.st_mtime, "hits": 0}
+        entry.update(fields)
+        return entry
+
+    def _save_index(self, force=False):
+        # Called with self._lock held. Other workers' entries on disk are
+        # merged in so concurrent processes don't erase each other's work.
+        now = time.monotonic()
+        if not self._dirty or (not force and now - self._last_save < self.index_interval):
+            return
+
+        for key, entry in self._read_index().items():
+            if key not in self.index and os.path.exists(self.path_for_key(key)):
+                self.index[key] = entry
+
+        tmp = f"{self._index_path()}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.index}, f, ensure_ascii=False)
+        os.replace(tmp, self._index_path())
+        self._dirty = False
+        self._last_save = now
+
+    def flush(self):
+        with self._lock:
+            self._save_index(force=True)
+
+    # ----------------------------------------
+    # Lookup and synthesis
+    # ----------------------------------------
+    def pin(self, text, speaker, lang=None):
+        """Exclude an entry from eviction (whether or not it exists yet)"""
+        self._pinned.add(self.key(text, speaker, lang))
+
+    def lookup(self, text, speaker, lang=None):
+        """Path of the cached audio, or None; counts a hit or a miss"""
+        key = self.key(text, speaker, lang)
+        path = self.path_for_key(key)
+
+        with self._lock:
+            if not os.path.exists(path):
+                self.index.pop(key, None)
+                self.misses += 1
+                return None
+
+            entry = self.index.get(key)
+            if entry is None:
+                entry = self.index[key] = self._stat_entry(key)
+            entry["last_access"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            self.hits += 1
+            self._dirty = True
+            self._save_index()
+        return path
+
+    def get(self, text, speaker, lang=None):
+        """Path of the audio for text, synthesizing and caching it on a miss"""
+        path = self.lookup(text, speaker, lang)
+        if path is not None:
+            return path
+
+        if self.synthesize is None:
+            raise FileNotFoundError(f"No cached audio for '{text}' ({speaker}) and TTS is not available")
+
+        key = self.key(text, speaker, lang)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            path = self._fill(key, text, speaker, lang)
+            future.set_result(path)
+            return path
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _fill(self, key, text, speaker, lang):
+        # One synthesis per key across processes: whoever gets the file lock
+        # second finds the WAV already written
+        path = self.path_for_key(key)
+        with file_lock(os.path.join(self.lock_dir, f"{key}.lock")):
+            if os.path.exists(path):
+                with self._lock:
+                    self.shared += 1
+                    self.index[key] = self._stat_entry(
+                        key, text=normalize_text(text), lang=lang or self.lang, speaker=speaker
+                    )
+                    self._dirty = True
+                return path
+
+            start = time.perf_counter()
+            audio, sample_rate = self.synthesize(normalize_text(text), speaker_name=speaker)
+            elapsed = time.perf_counter() - start
+            self._write(key, sample_rate, audio)
+        print(f"💾 Cached TTS ({elapsed:.2f}s): {path}")
+
+        with self._lock:
+            self.syntheses += 1
+            self.synthesis_time += elapsed
+            self.index[key] = self._stat_entry(
+                key, text=normalize_text(text), lang=lang or self.lang, speaker=speaker
+            )
+            self._dirty = True
+            self._evict_locked()
+            self._save_index(force=True)
+        return path
+
+    def stream(self, text, speaker, synthesize_stream, sample_rate, join=np.concatenate, lang=None):
+        """
+        Yield the audio for text chunk by chunk as synthesize_stream(text,
+        speaker_name=...) produces it, and cache join(chunks) once the stream
+        completes. Shares get()'s single-flight: if the key is cached, or
+        another request here or in another worker is already synthesizing
+        it, the finished audio is yielded as one chunk instead. A stream
+        that is closed early caches nothing.
+        """
+        path = self.lookup(text, speaker, lang)
+        if path is None:
+            key = self.key(text, speaker, lang)
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._inflight[key] = Future()
+                else:
+                    self.coalesced += 1
+
+            if leader:
+                yield from self._fill_stream(key, future, text, speaker, synthesize_stream, sample_rate, join, lang)
+                return
+            try:
+                path = future.result()
+            except Exception:
+                # The leader failed or its client went away: synthesize here
+                path = self.get(text, speaker, lang)
+
+        yield self._read(path)
+
+    def _fill_stream(self, key, future, text, speaker, synthesize_stream, sample_rate, join, lang):
+        path = self.path_for_key(key)
+        try:
+            with file_lock(os.path.join(self.lock_dir, f"{key}.lock")):
+                if os.path.exists(path):
+                    with self._lock:
+                        self.shared += 1
+                        self.index[key] = self._stat_entry(
+                            key, text=normalize_text(text), lang=lang or self.lang, speaker=speaker
+                        )
+                        self._dirty = True
+                    future.set_result(path)
+                    yield self._read(path)
+                    return
+
+                chunks = []
+                start = time.perf_counter()
+                for chunk in synthesize_stream(normalize_text(text), speaker_name=speaker):
+                    chunks.append(chunk)
+                    yield chunk
+                elapsed = time.perf_counter() - start
+                self._write(key, sample_rate, np.asarray(join(chunks), dtype=np.float32))
+            print(f"💾 Cached streamed TTS ({elapsed:.2f}s): {path}")
+
+            with self._lock:
+                self.syntheses += 1
+                self.synthesis_time += elapsed
+                self.index[key] = self._stat_entry(
+                    key, text=normalize_text(text), lang=lang or self.lang, speaker=speaker
+                )
+                self._dirty = True
+                self._evict_locked()
+                self._save_index(force=True)
+            future.set_result(path)
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e if isinstance(e, Exception) else RuntimeError("TTS stream closed early"))
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    @staticmethod
+    def _read(path):
+        _, audio = scipy_wav_read(path)
+        if audio.dtype == np.int16:
+            return audio.astype(np.float32) / 32768
+        return np.asarray(audio, dtype=np.float32)
+
+    def _write(self, key, sample_rate, audio):
+        path = self.path_for_key(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        scipy_wav_write(tmp, sample_rate, np.asarray(audio))
+        os.replace(tmp, path)
+
+    # ----------------------------------------
+    # Eviction
+    # ----------------------------------------
+    def _evict_locked(self):
+        total = sum(e["bytes"] for e in self.index.values())
+        if total <= self.max_bytes:
+            return []
+
+        removed = []
+        candidates = sorted(
+            (k for k in self.index if k not in self._pinned),
+            key=lambda k: self.index[k]["last_access"]
+        )
+        for key in candidates:
+            if total <= self.max_bytes:
+                break
+            # Only the WAV goes. The key's (empty) lock file stays: another
+            # process may hold or wait on it, and a re-created file would
+            # be a different inode, i.e. a different lock
+            try:
+                os.remove(self.path_for_key(key))
+            except FileNotFoundError:
+                pass
+            total -= self.index.pop(key)["bytes"]
+            removed.append(key)
+
+        if removed:
+            self.evictions += len(removed)
+            self._dirty = True
+            print(f"🧹 Evicted {len(removed)} TTS cache entries")
+        return removed
+
+    def evict(self):
+        """Trim the cache to max_bytes now; returns the evicted keys"""
+        with self._lock:
+            removed = self._evict_locked()
+            self._save_index(force=True)
+        return removed
+
+    # ----------------------------------------
+    # Bulk synthesis and metrics
+    # ----------------------------------------
+    def prewarm(self, texts, speaker, workers=2):
+        """Synthesize every missing text in parallel; returns {text: error} for failures"""
+        missing = [t for t in dict.fromkeys(texts) if not os.path.exists(self.path(t, speaker))]
+        if not missing:
+            return {}
+
+        print(f"🔥 Pre-warming {len(missing)} TTS entries with {workers} workers")
+        errors = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self.get, text, speaker): text for text in missing}
+            for future, text in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"⚠️ Could not synthesize '{text}': {e}")
+                    errors[text] = str(e)
+        return errors
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def nbytes(self):
+        return sum(e["bytes"] for e in self.index.values())
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cache_dir": self.root,
+                "model_version": self.version,
+                "entries": len(self.index),
+                "pinned": sum(1 for k in self.index if k in self._pinned),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+                "syntheses": self.syntheses,
+                "mean_synthesis_s": round(self.synthesis_time / self.syntheses, 3) if self.syntheses else 0,
+                "evictions": self.evictions,
+                "coalesced": self.coalesced,
+                "shared_from_other_workers": self.shared
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS audio cache")
+    parser.add_argument("--root", default=DEFAULT_ROOT)
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("prewarm", help="Synthesize audio for every lesson in WORD_MAP")
+    warm.add_argument("--workers", type=int, default=2)
+    warm.add_argument("--speaker", default="female")
+    sub.add_parser("stats", help="Print cache size and contents")
+    evict = sub.add_parser("evict", help="Trim the cache to a size limit")
+    evict.add_argument("--max-mb", type=float, default=512)
+    args = parser.parse_args()
+
+    if args.command == "prewarm":
+        sys.path.insert(0, BASE_DIR)
+        from TTS_Module import generate_kannada_audio
+        from WorkingPipeline.syllables import WORD_MAP
+
+        cache = TTSCache(args.root, generate_kannada_audio)
+        errors = cache.prewarm([w["text"] for w in WORD_MAP.values()], args.speaker, args.workers)
+        print(f"✅ {len(cache)} entries in {args.root} (model {cache.version})")
+        if errors:
+            sys.exit(1)
+
+    elif args.command == "stats":
+        cache = TTSCache(args.root)
+        print(json.dumps(cache.stats(), indent=2))
+        for key, entry in sorted(cache.index.items(), key=lambda kv: -kv[1]["last_access"]):
+            print(f"{key}  {entry['bytes']:>9}  hits={entry.get('hits', 0):<5} {entry.get('text', '')}")
+
+    elif args.command == "evict":
+        sys.path.insert(0, BASE_DIR)
+        from WorkingPipeline.syllables import WORD_MAP
+
+        cache = TTSCache(args.root, max_bytes=int(args.max_mb * 1024 * 1024))
+        for w in WORD_MAP.values():
+            cache.pin(w["text"], "female")
+        removed = cache.evict()
+        print(f"✅ Evicted {len(removed)} entries, {cache.nbytes} bytes remain")
+
+
+if __name__ == "__main__":
+    main()